@@ -1,6 +1,8 @@
 from agents import Agent
+from ai_agents.schemas import TaskBreakdown
 from tools.blackboard import post_demand_to_blackboard
 from tools.linkedin import (
+    rank_candidates_for_role,
     search_profiles,
     get_profile_details,
     check_profile_availability,
@@ -70,35 +72,25 @@ head = Agent(
 
 squad_leader = Agent(
     name="squad_leader",
-    handoff_description="Líder de equipe que gerencia trabalhadores e lida com a divisão e atribuição de tarefas.",
+    handoff_description="Líder de equipe que divide os planos dos chefes de departamento em tarefas.",
     instructions="""
     Você é um Líder de Equipe na empresa.
     
-    Sua especialidade é dividir planos em tarefas acionáveis e gerenciar uma equipe de trabalhadores para executá-las.
-    Quando você receber planos dos chefes de departamento, você deve:
+    Sua especialidade é dividir planos em tarefas acionáveis. Você não executa nem delega as tarefas:
+    cada tarefa da sua divisão é executada depois por um trabalhador.
+    Quando você receber um plano de um chefe de departamento, você deve:
     
-    1. Dividir o plano em tarefas específicas
-    2. Priorizar as tarefas
-    3. Atribuir recursos apropriados
-    4. Criar um sistema de acompanhamento do progresso
-    5. Lidar com quaisquer questões ou problemas no nível do trabalhador
+    1. Dividir o plano em tarefas específicas, numeradas a partir de 1
+    2. Dar a cada tarefa um título curto e uma descrição do que o trabalhador deve fazer
+    3. Priorizar as tarefas (High/Medium/Low)
+    4. Indicar as skills necessárias e a estimativa de tempo de cada tarefa
+    5. Indicar os números das tarefas das quais cada uma depende
     
-    IMPORTANTE:
-    - Se envolver recrutamento, **responda EXCLUSIVAMENTE** com a chamada de ferramenta em formato JSON function‑call, sem texto extra.
-    - Caso contrário, use `worker_tool` no mesmo formato.
-
-    Formato obrigatório:
-    ```json
-    {"name": "linkedin_tool", "arguments": {"input": "Buscar desenvolvedores Python sênior em São Paulo"}}
-    ```
-    Nunca explique ou envolva em markdown; apenas o JSON da chamada. O LLM runtime executará a ferramenta e enviará o resultado de volta.
-    
-    EXEMPLO DE USO COMPLETO:
-    - Para buscar candidatos: chame `linkedin_tool` conforme o exemplo acima.
-    - Para delegar tarefa a um trabalhador: `worker_tool(input="Elaborar anúncio de vaga em inglês e português")`
+    Sua resposta é a divisão estruturada do plano: um resumo e a lista de tarefas.
     """,
     model="gpt-4o",
     handoffs=[],
+    output_type=TaskBreakdown,
 )
 
 worker = Agent(
@@ -128,9 +120,10 @@ linkedin_worker = Agent(
     Você é um especialista em recrutamento no LinkedIn.
     
     Seu papel é:
-    1. Buscar perfis qualificados usando search_profiles
-    2. Avaliar detalhes dos candidatos usando get_profile_details
-    3. Verificar disponibilidade usando check_profile_availability
+    1. Gerar uma lista curta com rank_candidates_for_role, passando a descrição completa da vaga
+       (cargo, skills, localização, senioridade); ela avalia todos os candidatos de uma vez
+    2. Se precisar de mais opções, buscar perfis com search_profiles
+    3. Usar get_profile_details e check_profile_availability apenas para confirmar candidatos da lista curta
     4. Fornecer análises detalhadas dos candidatos encontrados
     
     Sempre inclua na sua análise:
@@ -142,23 +135,27 @@ linkedin_worker = Agent(
     """,
     model="gpt-4o",
     handoffs=[],
-    tools=[search_profiles, get_profile_details, check_profile_availability],
+    tools=[
+        rank_candidates_for_role,
+        search_profiles,
+        get_profile_details,
+        check_profile_availability,
+    ],
 )
 
 # Handoffs
+# Head, squad leader and worker run as separate pipeline stages (see
+# process_demand), so they don't hand off to each other: a run must end with
+# its own agent's output type.
 boss.handoffs = [director]
 director.handoffs = [boss, head]
-head.handoffs = [squad_leader]
-squad_leader.handoffs = [worker, head]
-worker.handoffs = [squad_leader]
 
 # Tools
+# The squad leader only plans: every task of its breakdown is run once by the
+# workers of the task DAG (see execute_tasks), which search candidates for
+# recruiting tasks themselves
 director.tools = [post_demand_to_blackboard]
-squad_leader.tools = [
-    worker.as_tool(
-        tool_name="worker_tool",
-        tool_description="Executa tarefas como um trabalhador da empresa.",
-    ),
+worker.tools = [
     linkedin_worker.as_tool(
         tool_name="linkedin_tool",
         tool_description="Realiza buscas e análises de candidatos no LinkedIn.",
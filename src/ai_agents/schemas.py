@@ -0,0 +1,38 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class PlannedTask(BaseModel):
+    """A single actionable task of a squad leader breakdown."""
+
+    number: int = Field(description="Task number, starting at 1")
+    title: str = Field(description="Short title of the task")
+    description: str = Field(description="What the worker has to do")
+    priority: Literal["High", "Medium", "Low"]
+    skills: list[str] = Field(description="Skills required for the task")
+    estimate: str = Field(description="Estimated time to complete, e.g. '2 days'")
+    dependencies: list[int] = Field(
+        description="Numbers of the tasks that must finish before this one"
+    )
+
+    def to_text(self):
+        dependencies = ", ".join(f"Task {dep}" for dep in self.dependencies)
+        return (
+            f"Task {self.number}: {self.title}\n"
+            f"Description: {self.description}\n"
+            f"Priority: {self.priority}\n"
+            f"Required skills: {', '.join(self.skills) or 'None'}\n"
+            f"Estimated time: {self.estimate}\n"
+            f"Dependencies: {dependencies or 'None'}"
+        )
+
+
+class TaskBreakdown(BaseModel):
+    """Structured output of the squad leader: the tasks a plan breaks into."""
+
+    summary: str = Field(description="One paragraph overview of the breakdown")
+    tasks: list[PlannedTask]
+
+    def to_text(self):
+        return "\n\n".join([self.summary, *(task.to_text() for task in self.tasks)])
@@ -0,0 +1,93 @@
+import os
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+
+from routes import blackboard, demands, documents, health
+from config.settings import settings
+from main import blackboard as message_board
+from main import (
+    converter_pool,
+    document_batches,
+    job_manager,
+    lease_manager,
+    monitor_blackboard_for_demands,
+    resume_submitted_demands,
+)
+from tools.linkedin import candidate_source
+
+# Use central logger configuration
+import logging
+from core.logger import setup_logging
+
+# Load environment variables
+load_dotenv()
+
+# Set OpenAI API key
+os.environ["OPENAI_API_KEY"] = settings.openai_api_key
+
+# Background task for monitoring blackboard
+monitor_task = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown events for the FastAPI application.
+    This will start the blackboard monitor when the app starts
+    and clean it up when the app shuts down.
+    """
+    # Start up
+    global monitor_task
+    logging.info("[SERVER_STARTUP] Starting blackboard monitor...")
+    monitor_task = asyncio.create_task(monitor_blackboard_for_demands())
+    await resume_submitted_demands()
+
+    if settings.ocr_warm_on_startup:
+        # Load the OCR models now rather than on the first uploaded document
+        logging.info("[SERVER_STARTUP] Warming up OCR converter pool...")
+        try:
+            await converter_pool.start()
+        except Exception as e:
+            logging.error(f"[SERVER_STARTUP] Could not warm up OCR converters: {e}")
+
+    yield
+
+    logging.info("[SERVER_SHUTDOWN] Stopping background demand jobs...")
+    await job_manager.shutdown()
+    await document_batches.shutdown()
+    converter_pool.shutdown()
+    await candidate_source.close()
+
+    # Shutdown
+    if monitor_task:
+        logging.info("[SERVER_SHUTDOWN] Stopping blackboard monitor...")
+        monitor_task.cancel()
+        try:
+            await monitor_task
+        except asyncio.CancelledError:
+            logging.info("[SERVER_SHUTDOWN] Blackboard monitor stopped successfully")
+
+    # Hand our demands back so other processes can take them over right away
+    await asyncio.to_thread(lease_manager.release_all)
+    # Commit any queued posts before the process exits
+    await asyncio.to_thread(message_board.close)
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="Multi-Agent Blackboard System API",
+    description="API for interacting with the multi-agent blackboard system",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Include routers
+app.include_router(demands.router)
+app.include_router(blackboard.router)
+app.include_router(documents.router)
+app.include_router(health.router)
+
+# Configure root logger once
+setup_logging()
@@ -2,134 +2,485 @@ import asyncio
 import logging
 import uuid
 import threading
-import json
+import time
 from datetime import datetime
 from pathlib import Path
 
+from core.context import demand_context
+from storage import GroupCommitWriter, JsonlStorage
+
 # Define the path for the blackboard data file
 BLACKBOARD_DATA_FILE = Path("blackboard_data.json")
 
 
+class Subscription:
+    """Async iterator over new blackboard messages matching a filter.
+
+    Messages are delivered through the subscriber's event loop, so posts made
+    with `post_sync` from worker threads are picked up as well.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, blackboard, types=None, senders=None, task_ids=None):
+        self._blackboard = blackboard
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self.types = set(types) if types else None
+        self.senders = set(senders) if senders else None
+        self.task_ids = set(task_ids) if task_ids else None
+        self.closed = False
+
+    def matches(self, message):
+        if self.types is not None and message["type"] not in self.types:
+            return False
+        if self.senders is not None and message["sender"] not in self.senders:
+            return False
+        return True
+
+    def _deliver(self, item):
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except RuntimeError:
+            # The subscriber's loop is gone; nothing left to notify
+            self.closed = True
+
+    async def get(self, timeout=None):
+        """Wait for the next message; raises TimeoutError after `timeout` seconds."""
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        item = await asyncio.wait_for(self._queue.get(), timeout)
+        if item is self._CLOSED:
+            raise StopAsyncIteration
+        return item
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._blackboard._unsubscribe(self)
+            self._deliver(self._CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
 class Blackboard:
-    def __init__(self):
-        self.messages = []
-        self.lock = asyncio.Lock()
-        self._thread_lock = threading.Lock()  # For synchronous access
+    """Shared message board of the agents.
+
+    All writes go through a single writer thread (see `GroupCommitWriter`)
+    that owns the storage engine: `post` awaits it without blocking the event
+    loop and `post_sync` waits on it from any other thread, and posts that
+    arrive together are persisted with one disk write. Readers take the
+    state lock, which the writer only holds while applying writes in memory.
+
+    Messages expired by the retention policies are moved to `archive` (a
+    `MessageArchive`), where `get_archived` can still find them.
+    """
+
+    def __init__(self, storage=None, max_batch=256, archive=None):
+        if storage is None:
+            storage = JsonlStorage(BLACKBOARD_DATA_FILE, content_threshold=0)
+        self.storage = storage
+        self.archive = archive
+        self._state_lock = threading.RLock()
+        # Subscribers keyed by task id (None for those watching every task)
+        self._subscribers = {}
+        self._subscribers_lock = threading.Lock()
         self._load_messages()
+        self._writer = GroupCommitWriter(
+            self.storage,
+            self._state_lock,
+            max_batch=max_batch,
+            on_commit=self._on_commit,
+        )
+        self._follower = None
         logging.info("[BLACKBOARD_INIT] Blackboard initialized")
 
-    def _load_messages(self):
-        """Load messages from the JSON file."""
-        if BLACKBOARD_DATA_FILE.exists():
-            try:
-                with open(BLACKBOARD_DATA_FILE, "r") as f:
-                    self.messages = json.load(f)
-                logging.info(
-                    f"[BLACKBOARD_LOAD] Loaded {len(self.messages)} messages from file"
-                )
-            except Exception as e:
-                logging.error(f"[BLACKBOARD_LOAD_ERROR] Error loading messages: {e}")
-                self.messages = []
+    @property
+    def messages(self):
+        return self.storage.all()
 
-    def _save_messages(self):
-        """Save messages to the JSON file."""
+    def _load_messages(self):
+        """Load messages from the storage engine."""
         try:
-            with open(BLACKBOARD_DATA_FILE, "w") as f:
-                json.dump(self.messages, f)
+            self.storage.load()
             logging.info(
-                f"[BLACKBOARD_SAVE] Saved {len(self.messages)} messages to file"
+                f"[BLACKBOARD_LOAD] Loaded {len(self.storage)} messages from storage"
             )
         except Exception as e:
-            logging.error(f"[BLACKBOARD_SAVE_ERROR] Error saving messages: {e}")
+            logging.error(f"[BLACKBOARD_LOAD_ERROR] Error loading messages: {e}")
+
+    def _on_commit(self, results):
+        """Notify subscribers of a committed batch (runs on the writer thread).
+
+        New messages and type changes are delivered; other field updates
+        (e.g. a demand's pipeline state) and deletions are not.
+        """
+        for operation, message in results:
+            if operation[0] == "delete" or message is None:
+                continue
+            if operation[0] == "append" or "type" in operation[2]:
+                self._notify(message)
+
+    def subscribe(self, types=None, senders=None, task_ids=None):
+        """Subscribe to messages posted from now on.
 
-    async def post(self, sender, content, type_="discussion"):
-        """Post a message to the blackboard asynchronously."""
-        message_id = str(uuid.uuid4())[:8]
-        timestamp = datetime.now().isoformat()
+        Returns a `Subscription` to use with `async for` (ideally inside
+        `async with` so it is removed when the consumer stops). Type changes
+        made through `set_type` are delivered as well. Subscriptions limited to
+        `task_ids` are only looked at for messages of those tasks, so many
+        idle per-task watchers cost nothing on unrelated posts.
+        """
+        subscription = Subscription(
+            self, types=types, senders=senders, task_ids=task_ids
+        )
+        with self._subscribers_lock:
+            for key in subscription.task_ids or [None]:
+                self._subscribers.setdefault(key, set()).add(subscription)
+        logging.info(
+            f"[BLACKBOARD_SUBSCRIBE] New subscription (types={types}, senders={senders}, task_ids={task_ids})"
+        )
+        return subscription
 
+    def _unsubscribe(self, subscription):
+        with self._subscribers_lock:
+            for key in subscription.task_ids or [None]:
+                watchers = self._subscribers.get(key)
+                if watchers is not None:
+                    watchers.discard(subscription)
+                    if not watchers:
+                        del self._subscribers[key]
+
+    def _notify(self, message):
+        with self._subscribers_lock:
+            candidates = list(self._subscribers.get(None, ()))
+            if message.get("task_id") is not None:
+                candidates.extend(self._subscribers.get(message["task_id"], ()))
+        subscribers = [sub for sub in candidates if sub.matches(message)]
+        for subscription in subscribers:
+            subscription._deliver(message)
+
+    @staticmethod
+    def _build_message(sender, content, type_, fields):
+        """Create a message, tagging it with the task of the current demand."""
         message = {
-            "id": message_id,
+            "id": str(uuid.uuid4())[:8],
             "sender": sender,
             "content": content,
             "type": type_,
-            "timestamp": timestamp,
+            "timestamp": datetime.now().isoformat(),
+            "task_id": demand_context.get().get("task_id"),
         }
+        message.update(fields)
+        return message
 
-        async with self.lock:
-            self.messages.append(message)
-            self._save_messages()
-            logging.info(
-                f"[BLACKBOARD_POST] [MessageID: {message_id}] New message posted from {sender}, type: {type_}"
-            )
-            logging.debug(
-                f"[BLACKBOARD_POST_CONTENT] [MessageID: {message_id}] Content: {content}"
+    async def post(self, sender, content, type_="discussion", **fields):
+        """Post a message to the blackboard asynchronously.
+
+        Extra keyword arguments are stored as additional message fields.
+        """
+        message = self._build_message(sender, content, type_, fields)
+        message_id = message["id"]
+
+        try:
+            await asyncio.wrap_future(self._writer.submit(("append", message)))
+        except Exception as e:
+            logging.error(
+                f"[BLACKBOARD_SAVE_ERROR] [MessageID: {message_id}] Error saving message: {e}"
             )
+        logging.info(
+            f"[BLACKBOARD_POST] [MessageID: {message_id}] New message posted from {sender}, type: {type_}"
+        )
+        logging.debug(
+            f"[BLACKBOARD_POST_CONTENT] [MessageID: {message_id}] Content: {content}"
+        )
 
         return message_id
 
-    def post_sync(self, sender, content, type_="discussion"):
-        """Post a message to the blackboard synchronously (for use in function tools)."""
-        message_id = str(uuid.uuid4())[:8]
-        timestamp = datetime.now().isoformat()
+    def post_sync(self, sender, content, type_="discussion", **fields):
+        """Post a message to the blackboard synchronously.
 
-        message = {
-            "id": message_id,
-            "sender": sender,
-            "content": content,
-            "type": type_,
-            "timestamp": timestamp,
-        }
+        Blocks until the message is persisted, so it is meant for worker
+        threads; coroutines should use `post`.
+        """
+        message = self._build_message(sender, content, type_, fields)
+        message_id = message["id"]
 
-        with self._thread_lock:
-            self.messages.append(message)
-            self._save_messages()
-            logging.info(
-                f"[BLACKBOARD_POST_SYNC] [MessageID: {message_id}] New message posted from {sender}, type: {type_}"
+        try:
+            self._writer.submit(("append", message)).result()
+        except Exception as e:
+            logging.error(
+                f"[BLACKBOARD_SAVE_ERROR] [MessageID: {message_id}] Error saving message: {e}"
+            )
+        logging.info(
+            f"[BLACKBOARD_POST_SYNC] [MessageID: {message_id}] New message posted from {sender}, type: {type_}"
+        )
+        logging.debug(
+            f"[BLACKBOARD_POST_SYNC_CONTENT] [MessageID: {message_id}] Content: {content}..."
+        )
+
+        return message_id
+
+    async def update(self, message_id, **changes):
+        """Change fields of an existing message and persist the change.
+
+        Returns the updated message, or None if it does not exist.
+        """
+        message = await asyncio.wrap_future(
+            self._writer.submit(("update", message_id, changes))
+        )
+        if message is None:
+            logging.warning(
+                f"[BLACKBOARD_UPDATE] [MessageID: {message_id}] Message not found"
             )
+        else:
             logging.debug(
-                f"[BLACKBOARD_POST_SYNC_CONTENT] [MessageID: {message_id}] Content: {content}..."
+                f"[BLACKBOARD_UPDATE] [MessageID: {message_id}] Updated fields {sorted(changes)}"
             )
+        return message
 
-        return message_id
+    async def set_type(self, message_id, type_):
+        """Change the type of an existing message and persist the change."""
+        message = await self.update(message_id, type=type_)
+        if message is not None:
+            logging.info(
+                f"[BLACKBOARD_SET_TYPE] [MessageID: {message_id}] Type changed to '{type_}'"
+            )
+        return message
+
+    async def delete(self, message_ids):
+        """Remove messages from the board; returns the ones that existed."""
+        removed = await asyncio.wrap_future(
+            self._writer.submit(("delete", list(message_ids)))
+        )
+        logging.info(f"[BLACKBOARD_DELETE] Removed {len(removed)} messages")
+        return removed
+
+    async def archive_messages(self, messages):
+        """Move messages to the archive, then remove them from the board.
+
+        They are archived first so a crash in between leaves a copy in both
+        places rather than in neither. Returns the number of messages moved.
+        """
+        if self.archive is None:
+            raise RuntimeError("Blackboard has no archive configured")
+        if not messages:
+            return 0
+
+        copies = {message["id"]: dict(message) for message in messages}
+        await asyncio.to_thread(self.archive.append, list(copies.values()))
+        removed = await self.delete(copies)
+
+        # Messages updated after they were copied are archived again as they
+        # were when removed; the latest version wins in archive queries
+        changed = [message for message in removed if message != copies[message["id"]]]
+        if changed:
+            await asyncio.to_thread(self.archive.append, changed)
+        return len(removed)
+
+    async def get_archived(self, filters=None, since=None, until=None, limit=None):
+        """Query archived messages (see `MessageArchive.query`)."""
+        if self.archive is None:
+            return []
+        results = await asyncio.to_thread(
+            self.archive.query, filters=filters, since=since, until=until, limit=limit
+        )
+        logging.info(
+            f"[BLACKBOARD_GET_ARCHIVED] Retrieved {len(results)} archived messages"
+        )
+        return results
+
+    def writer_stats(self):
+        """Group commit counters of the writer thread."""
+        return self._writer.stats()
+
+    def follow(self, interval=0.2, retention=3600.0):
+        """Deliver writes made by other processes to this board's subscribers.
+
+        Needs a storage engine shared between processes (`SqliteStorage` with
+        an origin). A background thread polls the engine's change log every
+        `interval` seconds and prunes records older than `retention`.
+        """
+        if self._follower is not None:
+            return
+        self._follower_stop = threading.Event()
+        self._follower = threading.Thread(
+            target=self._follow,
+            args=(interval, retention),
+            name="blackboard-follower",
+            daemon=True,
+        )
+        self._follower.start()
+        logging.info(
+            f"[BLACKBOARD_FOLLOW] Following writes of other processes every {interval}s"
+        )
+
+    def _follow(self, interval, retention):
+        seq = self.storage.last_change()
+        last_prune = time.monotonic()
+        while not self._follower_stop.wait(interval):
+            try:
+                # Page through everything recorded since the last poll
+                while True:
+                    last, changes = self.storage.changes_since(seq)
+                    self._on_commit(changes)
+                    if last == seq:
+                        break
+                    seq = last
+                if time.monotonic() - last_prune > retention / 10:
+                    self.storage.prune_changes(retention)
+                    last_prune = time.monotonic()
+            except Exception as e:
+                logging.error(f"[BLACKBOARD_FOLLOW_ERROR] Error reading changes: {e}")
+
+    def close(self):
+        """Commit queued writes, stop the writer and release the storage engine."""
+        if self._follower is not None:
+            self._follower_stop.set()
+            self._follower.join()
+            self._follower = None
+        self._writer.close()
+        self.storage.close()
 
     async def get_discussions(self):
         """Get all discussion-type messages."""
-        async with self.lock:
-            discussions = [msg for msg in self.messages if msg["type"] == "discussion"]
-            logging.info(
-                f"[BLACKBOARD_GET] Retrieved {len(discussions)} discussion messages"
-            )
-            return discussions
+        with self._state_lock:
+            discussions = self.storage.find("type", "discussion")
+        logging.info(
+            f"[BLACKBOARD_GET] Retrieved {len(discussions)} discussion messages"
+        )
+        return discussions
 
     async def get_actions(self):
         """Get all action-type messages."""
-        async with self.lock:
-            actions = [msg for msg in self.messages if msg["type"] == "action"]
-            logging.info(f"[BLACKBOARD_GET] Retrieved {len(actions)} action messages")
-            return actions
+        with self._state_lock:
+            actions = self.storage.find("type", "action")
+        logging.info(f"[BLACKBOARD_GET] Retrieved {len(actions)} action messages")
+        return actions
 
     async def get_all(self):
         """Get all messages from the blackboard."""
-        async with self.lock:
-            logging.info(
-                f"[BLACKBOARD_GET_ALL] Retrieved {len(self.messages)} total messages"
+        with self._state_lock:
+            messages = list(self.messages)
+        logging.info(f"[BLACKBOARD_GET_ALL] Retrieved {len(messages)} total messages")
+        return messages
+
+    async def get_page(self, cursor=None, limit=50, filters=None):
+        """Get one page of messages in posting order.
+
+        `cursor` is the `next_cursor` of the previous page (None for the first
+        page) and `filters` maps message fields to required values. Returns
+        `{"messages": [...], "next_cursor": str or None}`; raises ValueError
+        for an unknown cursor.
+
+        A cursor is `<message id>:<sequence number>`, so a page can still be
+        followed after retention deleted its last message. A bare message id
+        is accepted too.
+        """
+        with self._state_lock:
+            # One extra row tells whether another page follows
+            rows = self.storage.query(
+                filters=filters, after=self._cursor_position(cursor), limit=limit + 1
             )
-            return list(self.messages)
+            messages = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                last_id = messages[-1]["id"]
+                next_cursor = f"{last_id}:{self.storage.seq(last_id)}"
+        logging.info(
+            f"[BLACKBOARD_GET_PAGE] Retrieved {len(messages)} messages after cursor {cursor}"
+        )
+        return {"messages": messages, "next_cursor": next_cursor}
+
+    def _cursor_position(self, cursor):
+        """Storage `after` value of a page cursor (see `get_page`).
+
+        The message id is used while the message exists (in-memory engines
+        renumber messages on every start); the sequence number otherwise.
+        """
+        if cursor is None:
+            return None
+        message_id, separator, seq = cursor.rpartition(":")
+        if not separator or not seq.isdigit():
+            return cursor
+        if self.storage.seq(message_id) is not None:
+            return message_id
+        return int(seq)
+
+    async def iter_messages(self, since_id=None, filters=None, page_size=100):
+        """Iterate over messages posted after `since_id`, one page at a time."""
+        cursor = since_id
+        while True:
+            with self._state_lock:
+                page = self.storage.query(
+                    filters=filters, after=cursor, limit=page_size
+                )
+                if page:
+                    # By number, in case the message is deleted meanwhile
+                    cursor = self.storage.seq(page[-1]["id"])
+            for message in page:
+                yield message
+            if len(page) < page_size:
+                return
+
+    async def get_by_id(self, message_id):
+        """Get a single message by its id, or None if it does not exist."""
+        with self._state_lock:
+            return self.storage.get(message_id)
 
     async def get_by_type(self, type_):
         """Get messages of a specific type."""
-        async with self.lock:
-            results = [msg for msg in self.messages if msg["type"] == type_]
-            logging.info(
-                f"[BLACKBOARD_GET_TYPE] Retrieved {len(results)} messages of type '{type_}'"
-            )
-            return results
+        with self._state_lock:
+            results = self.storage.find("type", type_)
+        logging.info(
+            f"[BLACKBOARD_GET_TYPE] Retrieved {len(results)} messages of type '{type_}'"
+        )
+        return results
 
     async def get_by_sender(self, sender):
         """Get messages from a specific sender."""
-        async with self.lock:
-            results = [msg for msg in self.messages if msg["sender"] == sender]
-            logging.info(
-                f"[BLACKBOARD_GET_SENDER] Retrieved {len(results)} messages from sender '{sender}'"
+        with self._state_lock:
+            results = self.storage.find("sender", sender)
+        logging.info(
+            f"[BLACKBOARD_GET_SENDER] Retrieved {len(results)} messages from sender '{sender}'"
+        )
+        return results
+
+    async def get_by_task(self, task_id):
+        """Get every message correlated with a task."""
+        with self._state_lock:
+            results = self.storage.find("task_id", task_id)
+        logging.info(
+            f"[BLACKBOARD_GET_TASK] Retrieved {len(results)} messages for task '{task_id}'"
+        )
+        return results
+
+    async def get_tasks(self, task_id):
+        """Get the typed tasks of the latest breakdown posted for a demand."""
+        with self._state_lock:
+            breakdowns = self.storage.query(
+                filters={"task_id": task_id, "type": "task_breakdown"}
             )
-            return results
+        tasks = breakdowns[-1].get("tasks", []) if breakdowns else []
+        logging.info(
+            f"[BLACKBOARD_GET_TASKS] Retrieved {len(tasks)} planned tasks for task '{task_id}'"
+        )
+        return tasks
+
+    async def get_range(self, since=None, until=None):
+        """Get messages posted between two ISO timestamps (both inclusive)."""
+        with self._state_lock:
+            results = self.storage.range(since, until)
+        logging.info(
+            f"[BLACKBOARD_GET_RANGE] Retrieved {len(results)} messages between {since} and {until}"
+        )
+        return results
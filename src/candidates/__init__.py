@@ -0,0 +1,27 @@
+"""Candidate profile search for the recruiting (LinkedIn) tools."""
+
+from candidates.index import (
+    CandidateIndex,
+    parse_availability,
+    parse_experience,
+    parse_skills,
+)
+from candidates.ranking import rank_candidates
+from candidates.source import (
+    CandidateSource,
+    HttpCandidateSource,
+    LocalCandidateSource,
+    TokenBucket,
+)
+
+__all__ = [
+    "CandidateIndex",
+    "CandidateSource",
+    "HttpCandidateSource",
+    "LocalCandidateSource",
+    "TokenBucket",
+    "rank_candidates",
+    "parse_availability",
+    "parse_experience",
+    "parse_skills",
+]
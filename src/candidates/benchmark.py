@@ -0,0 +1,126 @@
+"""Benchmark the candidate index on a synthetic profile set.
+
+Usage (from the src directory):
+    python -m candidates.benchmark --profiles 1000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from candidates.index import CandidateIndex
+from candidates.ranking import rank_candidates
+
+FIRST_NAMES = ["Ana", "Pedro", "Mariana", "Lucas", "Julia", "Rafael", "Beatriz"]
+LAST_NAMES = ["Silva", "Santos", "Costa", "Oliveira", "Mendes", "Souza", "Lima"]
+SENIORITIES = ["Junior", "Mid-level", "Senior", "Staff", "Lead"]
+ROLES = ["Python Developer", "Backend Engineer", "Data Engineer", "Tech Lead"]
+SKILLS = [
+    "Python",
+    "Django",
+    "FastAPI",
+    "Flask",
+    "AWS",
+    "GCP",
+    "Azure",
+    "Docker",
+    "Kubernetes",
+    "PostgreSQL",
+    "Redis",
+    "Spark",
+    "Airflow",
+    "React",
+    "GraphQL",
+]
+LOCATIONS = [
+    "São Paulo, Brazil",
+    "Rio de Janeiro, Brazil",
+    "Curitiba, Brazil",
+    "Lisbon, Portugal",
+    "Porto, Portugal",
+    "Remote",
+]
+
+
+def synthetic_profiles(count, seed=42):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            "title": f"{rng.choice(SENIORITIES)} {rng.choice(ROLES)}",
+            "experience": f"{rng.randint(0, 25)} years",
+            "skills": rng.sample(SKILLS, rng.randint(2, 6)),
+            "current_company": f"Company {rng.randint(1, 5000)}",
+            "location": rng.choice(LOCATIONS),
+            "education": "Computer Science",
+        }
+
+
+def _timed(label, function, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    profiles = list(synthetic_profiles(args.profiles))
+    index = _timed(
+        f"build ({args.profiles} profiles)", lambda: CandidateIndex.build(profiles)
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        _timed("save", lambda: index.save(directory))
+        index = _timed("load (mmap)", lambda: CandidateIndex.load(directory))
+
+        name = profiles[args.profiles // 2]["name"]
+        _timed("get by name", lambda: index.get(name), args.repeat)
+        _timed(
+            "linear scan by name (old tool)",
+            lambda: next(p for p in profiles if p["name"] == name),
+        )
+        _timed(
+            "search role + skills + location",
+            lambda: index.search(
+                role="Senior Python Developer",
+                skills=["FastAPI", "AWS"],
+                location="São Paulo",
+                min_experience=5,
+            ),
+            args.repeat,
+        )
+        _timed(
+            "search page 10 (offset 90)",
+            lambda: index.search(role="Data Engineer", offset=90, limit=10),
+            args.repeat,
+        )
+        _timed(
+            "search experience only",
+            lambda: index.search(min_experience=20),
+            args.repeat,
+        )
+        _timed(
+            "rank all candidates for a role (top 10)",
+            lambda: rank_candidates(
+                index,
+                "Senior Python developer with FastAPI, AWS and Docker in São Paulo",
+                min_experience=5,
+            ),
+            args.repeat,
+        )
+        _timed(
+            "linear scan by experience (old tool)",
+            lambda: [p for p in profiles if int(p["experience"].split()[0]) >= 20],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Build a memory-mappable candidate index from a CSV or JSONL export.
+
+Usage (from the src directory):
+    python -m candidates.build --source candidates.csv --target candidate_index
+"""
+
+import argparse
+import logging
+import time
+
+from candidates.index import CandidateIndex
+
+
+def build(source, target):
+    """Index every profile of `source` and save the index to `target`."""
+    start = time.perf_counter()
+    index = CandidateIndex.open(source)
+    index.save(target)
+    logging.info(
+        f"[CANDIDATE_INDEX_BUILD] Indexed {len(index)} profiles from {source} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return len(index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", required=True, help="CSV or JSONL export")
+    parser.add_argument("--target", default="candidate_index")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    build(args.source, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+# Text columns kept for every profile; skills are stored joined by SKILL_SEPARATOR
+TEXT_COLUMNS = ("name", "title", "skills", "current_company", "location", "education")
+SKILL_SEPARATOR = "; "
+
+# Score contributed by each criterion when fully matched
+WEIGHTS = {"title": 2.0, "skill": 3.0, "location": 1.0}
+
+FORMAT_VERSION = 1
+
+WORD_PATTERN = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def normalize_text(text):
+    return " ".join(unicodedata.normalize("NFKC", str(text)).casefold().split())
+
+
+def _name_hash(name):
+    digest = hashlib.blake2b(normalize_text(name).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def parse_experience(value):
+    """Years of experience from values like 8, "8", "8 years" or "2,5 anos"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group().replace(",", ".")) if match else 0.0
+
+
+# Open-to-work signal of a profile, from 0 (not looking) to 1; 0.5 if unknown
+AVAILABILITY_LEVELS = {
+    "open to work": 1.0,
+    "open to opportunities": 0.7,
+    "not looking": 0.0,
+}
+UNKNOWN_AVAILABILITY = 0.5
+
+
+# Availability score -> status text, as the profiles spell it
+AVAILABILITY_STATUSES = {
+    1.0: "Open to work",
+    0.7: "Open to opportunities",
+    0.0: "Not looking",
+}
+
+
+def parse_availability(value):
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    return AVAILABILITY_LEVELS.get(normalize_text(value or ""), UNKNOWN_AVAILABILITY)
+
+
+def availability_status(score):
+    """Status text of an availability score; "Unknown" if it wasn't given."""
+    return AVAILABILITY_STATUSES.get(round(float(score), 1), "Unknown")
+
+
+def parse_skills(value):
+    if isinstance(value, (list, tuple)):
+        return [str(skill).strip() for skill in value if str(skill).strip()]
+    return [skill.strip() for skill in re.split(r"[;,|]", value or "") if skill.strip()]
+
+
+def location_parts(location):
+    """Normalized comma-separated parts of a location ("são paulo", "sp")."""
+    parts = (part.strip() for part in normalize_text(location).split(","))
+    return [part for part in parts if part]
+
+
+def _tokens(profile_skills, title, location):
+    tokens = {f"skill:{normalize_text(skill)}" for skill in profile_skills}
+    tokens.update(
+        f"title:{word}" for word in WORD_PATTERN.findall(normalize_text(title))
+    )
+    # Both the whole location parts ("são paulo") and their words ("paulo")
+    for part in location_parts(location):
+        tokens.add(f"location:{part}")
+        tokens.update(f"location:{word}" for word in WORD_PATTERN.findall(part))
+    return tokens
+
+
+class _TextColumn:
+    """Strings packed into one UTF-8 blob plus an offsets array."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [value.encode() for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __getitem__(self, position):
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.blob[start:end].tobytes().decode()
+
+
+class CandidateIndex:
+    """Columnar, indexed candidate profiles for the LinkedIn tools.
+
+    Experience and availability are pre-parsed into float32 columns, text columns are packed
+    into UTF-8 blobs and skills/title/location words go into an inverted
+    index (CSR postings). Names are looked up through a sorted array of
+    64-bit hashes. Every array can be saved as .npy files and memory-mapped
+    back, so opening a saved index costs about the same for 1k or 1M profiles.
+    """
+
+    def __init__(
+        self,
+        experience,
+        columns,
+        vocabulary,
+        postings_offsets,
+        postings_ids,
+        name_hashes,
+        name_order,
+        availability=None,
+    ):
+        self.experience = experience
+        if availability is None:
+            availability = np.full(len(experience), UNKNOWN_AVAILABILITY, np.float32)
+        self.availability = availability
+        self.columns = columns
+        self.vocabulary = vocabulary
+        self._token_ids = {token: i for i, token in enumerate(vocabulary)}
+        self.postings_offsets = postings_offsets
+        self.postings_ids = postings_ids
+        self.name_hashes = name_hashes
+        self.name_order = name_order
+
+    def __len__(self):
+        return len(self.experience)
+
+    @classmethod
+    def build(cls, profiles):
+        """Build an index from profile dicts (same shape as the mock profiles)."""
+        experience = []
+        availability = []
+        values = {column: [] for column in TEXT_COLUMNS}
+        postings = defaultdict(list)
+
+        for position, profile in enumerate(profiles):
+            skills = parse_skills(profile.get("skills"))
+            experience.append(parse_experience(profile.get("experience")))
+            availability.append(
+                parse_availability(
+                    profile.get("availability", profile.get("open_to_work"))
+                )
+            )
+            for column in TEXT_COLUMNS:
+                value = profile.get(column) or ""
+                values[column].append(
+                    SKILL_SEPARATOR.join(skills) if column == "skills" else str(value)
+                )
+            for token in _tokens(
+                skills, profile.get("title") or "", profile.get("location") or ""
+            ):
+                postings[token].append(position)
+
+        vocabulary = sorted(postings)
+        postings_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(
+            [len(postings[token]) for token in vocabulary], out=postings_offsets[1:]
+        )
+        postings_ids = np.fromiter(
+            (position for token in vocabulary for position in postings[token]),
+            dtype=np.int32,
+            count=int(postings_offsets[-1]),
+        )
+
+        hashes = np.fromiter(
+            (_name_hash(name) for name in values["name"]),
+            dtype=np.uint64,
+            count=len(values["name"]),
+        )
+        name_order = np.argsort(hashes, kind="stable").astype(np.int32)
+
+        return cls(
+            np.asarray(experience, dtype=np.float32),
+            {
+                column: _TextColumn.from_strings(values[column])
+                for column in TEXT_COLUMNS
+            },
+            vocabulary,
+            postings_offsets,
+            postings_ids,
+            hashes[name_order],
+            name_order,
+            np.asarray(availability, dtype=np.float32),
+        )
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls.build(csv.DictReader(f))
+
+    @classmethod
+    def from_jsonl(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.build(json.loads(line) for line in f if line.strip())
+
+    @classmethod
+    def open(cls, path):
+        """Open a saved index directory, or build one from a .csv/.jsonl file."""
+        if os.path.isdir(path):
+            return cls.load(path)
+        if path.endswith(".csv"):
+            return cls.from_csv(path)
+        return cls.from_jsonl(path)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        arrays = {
+            "experience": self.experience,
+            "availability": self.availability,
+            "postings_offsets": self.postings_offsets,
+            "postings_ids": self.postings_ids,
+            "name_hashes": self.name_hashes,
+            "name_order": self.name_order,
+        }
+        for column, values in self.columns.items():
+            arrays[f"{column}_blob"] = values.blob
+            arrays[f"{column}_offsets"] = values.offsets
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "count": len(self),
+                    "vocabulary": self.vocabulary,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        logging.info(
+            f"[CANDIDATE_INDEX_SAVED] {len(self)} profiles saved to {directory}"
+        )
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map a saved index; pages are read from disk on first use."""
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported candidate index version {meta['version']}")
+
+        def array(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        # Indexes saved before availability was tracked treat it as unknown
+        availability = None
+        if os.path.exists(os.path.join(directory, "availability.npy")):
+            availability = array("availability")
+
+        index = cls(
+            array("experience"),
+            {
+                column: _TextColumn(array(f"{column}_blob"), array(f"{column}_offsets"))
+                for column in TEXT_COLUMNS
+            },
+            meta["vocabulary"],
+            array("postings_offsets"),
+            array("postings_ids"),
+            array("name_hashes"),
+            array("name_order"),
+            availability,
+        )
+        logging.info(f"[CANDIDATE_INDEX_LOADED] {len(index)} profiles from {directory}")
+        return index
+
+    def postings(self, token):
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            return self.postings_ids[:0]
+        start, end = (
+            self.postings_offsets[token_id],
+            self.postings_offsets[token_id + 1],
+        )
+        return self.postings_ids[start:end]
+
+    def profile(self, position):
+        """Materialize one profile as a dict shaped like the mock profiles."""
+        profile = {column: self.columns[column][position] for column in TEXT_COLUMNS}
+        profile["skills"] = [s for s in profile["skills"].split(SKILL_SEPARATOR) if s]
+        profile["experience"] = f"{float(self.experience[position]):g} years"
+        profile["availability"] = availability_status(self.availability[position])
+        return profile
+
+    def position(self, name):
+        """Row of the profile with this name (case-insensitive); None if absent."""
+        key = np.uint64(_name_hash(name))
+        start = np.searchsorted(self.name_hashes, key, side="left")
+        end = np.searchsorted(self.name_hashes, key, side="right")
+        for position in self.name_order[start:end]:
+            # Guard against hash collisions
+            if normalize_text(self.columns["name"][position]) == normalize_text(name):
+                return int(position)
+        return None
+
+    def get(self, name):
+        """Look up a profile by name (case-insensitive); None if absent."""
+        position = self.position(name)
+        return self.profile(position) if position is not None else None
+
+    def search(
+        self,
+        role=None,
+        skills=None,
+        location=None,
+        min_experience=0,
+        max_experience=None,
+        offset=0,
+        limit=10,
+    ):
+        """Ranked multi-criteria search.
+
+        Title words of `role`, `skills` and `location` each add to a profile's
+        score in proportion to how much of the criterion it matches (see
+        WEIGHTS); profiles matching none of the given criteria are left out.
+        Ties are broken by experience. Returns the total number of matches
+        and one page of profiles, each with its `score`.
+        """
+        criteria = []
+        if role:
+            words = WORD_PATTERN.findall(normalize_text(role))
+            criteria += [(f"title:{w}", WEIGHTS["title"] / len(words)) for w in words]
+        if skills:
+            skills = parse_skills(skills)
+            criteria += [
+                (f"skill:{normalize_text(s)}", WEIGHTS["skill"] / len(skills))
+                for s in skills
+            ]
+        if location:
+            # Each part ("são paulo", "sp") as indexed, sharing the weight
+            parts = location_parts(location)
+            criteria += [
+                (f"location:{part}", WEIGHTS["location"] / len(parts)) for part in parts
+            ]
+
+        mask = self.experience >= min_experience
+        if max_experience is not None:
+            mask &= self.experience <= max_experience
+
+        if criteria:
+            scores = np.zeros(len(self), dtype=np.float32)
+            for token, weight in criteria:
+                scores[self.postings(token)] += weight
+            mask &= scores > 0
+        else:
+            scores = None
+
+        matches = np.flatnonzero(mask)
+        # One sort key: score first, experience (always < 1000 years) second
+        keys = np.asarray(self.experience[matches], dtype=np.float64)
+        if scores is not None:
+            keys += scores[matches].astype(np.float64) * 1000
+
+        wanted = min(offset + limit, len(matches))
+        if wanted < len(matches):
+            top = np.argpartition(-keys, wanted - 1)[:wanted] if wanted else matches[:0]
+        else:
+            top = np.arange(len(matches))
+        top = top[np.argsort(-keys[top], kind="stable")][offset:wanted]
+
+        results = []
+        for position in matches[top]:
+            profile = self.profile(position)
+            profile["score"] = (
+                round(float(scores[position]), 3) if scores is not None else 0.0
+            )
+            results.append(profile)
+        return {"total": int(len(matches)), "offset": offset, "results": results}
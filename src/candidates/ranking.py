@@ -0,0 +1,105 @@
+import re
+
+import numpy as np
+
+from candidates.index import WORD_PATTERN, normalize_text
+
+# Weight of each feature in the final score; features are all in [0, 1]
+FEATURE_WEIGHTS = {
+    "skills": 0.4,
+    "title": 0.2,
+    "experience": 0.2,
+    "location": 0.1,
+    "availability": 0.1,
+}
+
+# Experience that earns the full experience score when no minimum is given
+REFERENCE_EXPERIENCE = 10.0
+
+
+# Shorter title words and places ("de", "sp") match too much of any
+# description; skills are kept whatever their length ("go", "r", "ai")
+MIN_TERM_LENGTH = 3
+
+
+def _mentioned(field, term, words, text):
+    """Whether an index term (a skill, title word or place) appears in the text."""
+    if term.isalnum():
+        if field != "skill" and len(term) < MIN_TERM_LENGTH:
+            return False
+        return term in words
+    # Multi-word terms ("são paulo") and terms with symbols ("node.js", "ci/cd")
+    return re.search(rf"(?<!\w){re.escape(term)}(?!\w)", text) is not None
+
+
+def extract_criteria(index, description):
+    """Find which indexed skills, title words and places a description mentions."""
+    text = normalize_text(description)
+    words = set(WORD_PATTERN.findall(text))
+
+    criteria = {"skill": [], "title": [], "location": []}
+    for token in index.vocabulary:
+        field, term = token.split(":", 1)
+        if _mentioned(field, term, words, text):
+            criteria[field].append(token)
+    return criteria
+
+
+def rank_candidates(index, description, min_experience=0, top_k=10):
+    """Score every candidate of `index` against a role description at once.
+
+    Each feature is computed for all candidates as a NumPy vector: the share of
+    the mentioned skills and title words a candidate has, whether they are in
+    a mentioned place, experience relative to `min_experience` and their
+    availability. Returns the criteria found and the `top_k` candidates with
+    their score breakdown.
+    """
+    criteria = extract_criteria(index, description)
+    count = len(index)
+
+    features = {}
+    for field, feature in (("skill", "skills"), ("title", "title")):
+        hits = np.zeros(count, dtype=np.float32)
+        for token in criteria[field]:
+            hits[index.postings(token)] += 1
+        features[feature] = hits / max(len(criteria[field]), 1)
+
+    location = np.zeros(count, dtype=np.float32)
+    for token in criteria["location"]:
+        location[index.postings(token)] = 1
+    features["location"] = location
+
+    experience = np.asarray(index.experience, dtype=np.float32)
+    features["experience"] = np.minimum(
+        experience / (min_experience or REFERENCE_EXPERIENCE), 1.0
+    )
+    features["availability"] = np.asarray(index.availability, dtype=np.float32)
+
+    scores = sum(FEATURE_WEIGHTS[name] * values for name, values in features.items())
+    if min_experience:
+        # Candidates below the minimum only make the list if nobody else does
+        scores = np.where(experience >= min_experience, scores, scores - 1.0)
+
+    top_k = min(top_k, count)
+    top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k else []
+    top = sorted(top, key=lambda position: -scores[position])
+
+    candidates = []
+    for position in top:
+        profile = index.profile(position)
+        profile["score"] = round(float(scores[position]), 3)
+        profile["breakdown"] = {
+            name: round(float(values[position]), 3) for name, values in features.items()
+        }
+        candidates.append(profile)
+
+    return {
+        "criteria": {
+            "skills": [token.split(":", 1)[1] for token in criteria["skill"]],
+            "title_words": [token.split(":", 1)[1] for token in criteria["title"]],
+            "locations": [token.split(":", 1)[1] for token in criteria["location"]],
+            "min_experience": min_experience,
+        },
+        "evaluated": count,
+        "candidates": candidates,
+    }
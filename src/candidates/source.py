@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+import httpx
+
+from candidates.index import availability_status
+
+
+class CandidateSource:
+    """Interface for where the recruiting tools get candidate data from."""
+
+    async def search(
+        self,
+        role=None,
+        experience_years=0,
+        skills=None,
+        location=None,
+        page=1,
+        page_size=10,
+    ):
+        """Return `{"total", "page", "page_size", "profiles"}` for a query."""
+        raise NotImplementedError
+
+    async def get_profile(self, name):
+        """Return a profile by name, or None if it does not exist."""
+        raise NotImplementedError
+
+    async def get_availability(self, name):
+        """Return `{"name", "status"}` for a profile, or None if unknown."""
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+    async def close(self):
+        return None
+
+
+class LocalCandidateSource(CandidateSource):
+    """Candidate data served from an in-process CandidateIndex."""
+
+    def __init__(self, index):
+        self.index = index
+
+    async def search(
+        self,
+        role=None,
+        experience_years=0,
+        skills=None,
+        location=None,
+        page=1,
+        page_size=10,
+    ):
+        result = self.index.search(
+            role=role,
+            skills=skills,
+            location=location,
+            min_experience=experience_years,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
+        return {
+            "total": result["total"],
+            "page": page,
+            "page_size": page_size,
+            "profiles": result["results"],
+        }
+
+    async def get_profile(self, name):
+        return self.index.get(name)
+
+    async def get_availability(self, name):
+        position = self.index.position(name)
+        if position is None:
+            return None
+        return {
+            "name": self.index.columns["name"][position],
+            "status": availability_status(self.index.availability[position]),
+        }
+
+    def stats(self):
+        return {"source": "local", "profiles": len(self.index)}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HttpCandidateSource(CandidateSource):
+    """Candidate data from an HTTP candidate API.
+
+    Requests share one pooled `httpx.AsyncClient` and are throttled by a token
+    bucket. Transport errors, 429 and 5xx responses are retried with
+    exponential backoff and jitter, honoring Retry-After. Identical concurrent
+    lookups are coalesced into one request, and responses are kept in a TTL
+    cache. The API shape is the one served by `candidates.stub_server`;
+    `transport` (an httpx transport) can route requests to it in-process.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        base_url,
+        api_key=None,
+        rate=10.0,
+        burst=20,
+        max_connections=20,
+        max_retries=3,
+        backoff=0.5,
+        cache_ttl=300.0,
+        cache_entries=1024,
+        timeout=10.0,
+        transport=None,
+    ):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.cache_entries = cache_entries
+        self._bucket = TokenBucket(rate, burst)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._stats = {"requests": 0, "retries": 0, "cache_hits": 0, "coalesced": 0}
+
+    async def _get(self, path, params=None):
+        """GET a JSON document through the cache, coalescing and rate limiter."""
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            self._stats["cache_hits"] += 1
+            return cached[1]
+
+        if key in self._inflight:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.ensure_future(self._request(path, params))
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+        self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return value
+
+    async def _request(self, path, params):
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            self._stats["requests"] += 1
+            retry_after = None
+            try:
+                response = await self._client.get(path, params=params)
+                if response.status_code == 404:
+                    return None
+                if response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+
+            if attempt == self.max_retries:
+                raise RuntimeError(
+                    f"Candidate API request {path} failed after {attempt + 1} attempts: {error}"
+                )
+            delay = self.backoff * 2**attempt * (1 + random.random())
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            self._stats["retries"] += 1
+            logging.warning(
+                f"[CANDIDATE_API_RETRY] {path} failed ({error}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def search(
+        self,
+        role=None,
+        experience_years=0,
+        skills=None,
+        location=None,
+        page=1,
+        page_size=10,
+    ):
+        params = {
+            "role": role,
+            "experience_years": experience_years,
+            "skills": ",".join(skills) if skills else None,
+            "location": location,
+            "page": page,
+            "page_size": page_size,
+        }
+        return await self._get(
+            "/profiles", {k: v for k, v in params.items() if v is not None}
+        )
+
+    async def get_profile(self, name):
+        return await self._get(f"/profiles/{quote(name, safe='')}")
+
+    async def get_availability(self, name):
+        return await self._get(f"/profiles/{quote(name, safe='')}/availability")
+
+    def stats(self):
+        return {"source": "http", **self._stats, "cached": len(self._cache)}
+
+    async def close(self):
+        await self._client.aclose()
@@ -0,0 +1,116 @@
+"""Local stand-in for the HTTP candidate API, for tests and development.
+
+Serves a CandidateIndex with the API shape HttpCandidateSource expects, and
+can inject latency and failures to exercise retries and rate limiting.
+
+Usage (from the src directory):
+    python -m candidates.stub_server --port 8100 --latency 0.05 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import random
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Response
+
+from candidates.index import CandidateIndex
+from candidates.source import LocalCandidateSource
+
+
+def create_app(index, latency=0.0, failure_rate=0.0):
+    """Build the stub API over `index`.
+
+    Every request waits `latency` seconds and fails with a 503 (with a
+    Retry-After header) with probability `failure_rate`. Request counts are
+    kept in `app.state.requests`.
+    """
+    app = FastAPI(title="Candidate API stub")
+    source = LocalCandidateSource(index)
+    app.state.requests = 0
+
+    async def simulate():
+        app.state.requests += 1
+        if latency:
+            await asyncio.sleep(latency)
+        if failure_rate and random.random() < failure_rate:
+            raise HTTPException(
+                status_code=503,
+                detail="Injected failure",
+                headers={"Retry-After": "0"},
+            )
+
+    @app.get("/profiles")
+    async def search_profiles(
+        role: Optional[str] = None,
+        experience_years: float = 0,
+        skills: Optional[str] = None,
+        location: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ):
+        await simulate()
+        return await source.search(
+            role=role,
+            experience_years=experience_years,
+            skills=skills.split(",") if skills else None,
+            location=location,
+            page=max(page, 1),
+            page_size=max(1, min(page_size, 50)),
+        )
+
+    # Names may contain "/" (sent percent-encoded), hence the path converters;
+    # the availability route has to be registered first to win the match
+    @app.get("/profiles/{name:path}/availability")
+    async def get_availability(name: str):
+        await simulate()
+        availability = await source.get_availability(name)
+        if availability is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return availability
+
+    @app.get("/profiles/{name:path}")
+    async def get_profile(name: str):
+        await simulate()
+        profile = await source.get_profile(name)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+
+    @app.get("/health")
+    async def health():
+        return Response(status_code=204)
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--index",
+        help="Saved index directory or CSV/JSONL export (default: mock profiles)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.index:
+        index = CandidateIndex.open(args.index)
+    else:
+        from tools.linkedin import MOCK_PROFILES
+
+        index = CandidateIndex.build(MOCK_PROFILES)
+
+    uvicorn.run(
+        create_app(index, args.latency, args.failure_rate),
+        host=args.host,
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
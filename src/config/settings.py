@@ -1,6 +1,7 @@
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Literal, Optional
 
 ENV_PATH = Path(__file__).parent / ".env"
 
@@ -12,5 +13,111 @@ class Settings(BaseSettings):
 
     openai_api_key: str
 
+    # Blackboard storage backend: "jsonl" (in-memory + append-only log) or "sqlite"
+    blackboard_backend: str = "jsonl"
+    blackboard_sqlite_path: str = "blackboard.db"
+
+    # Several processes (e.g. SERVER_WORKERS > 1) sharing one SQLite
+    # blackboard: demands are claimed with leases that live `lease_ttl`
+    # seconds unless renewed, and writes of other processes are picked up
+    # every `blackboard_follow_interval` seconds
+    blackboard_multiprocess: bool = False
+    lease_ttl: float = 30.0
+    blackboard_follow_interval: float = 0.2
+
+    # JSONL backend: "always", "batch" or "periodic" fsync of the log
+    blackboard_fsync_policy: str = "batch"
+    blackboard_fsync_batch_size: int = 64
+    blackboard_fsync_interval: float = 1.0
+    blackboard_compact_threshold: int = 10000
+    # JSONL backend: message bodies of at least this many bytes are kept in
+    # a private temporary file instead of in memory (0 keeps them inline)
+    blackboard_content_threshold: int = 1024
+    # Most writes the blackboard writer thread persists in one group commit
+    blackboard_commit_batch: int = 256
+
+    # Retention per message type: messages older than `max_age` seconds,
+    # beyond the newest `max_count` or beyond the newest `keep_last_per_task`
+    # of their task are moved to compressed archive segments every
+    # `blackboard_retention_interval` seconds (0 disables the compactor)
+    blackboard_retention: dict[str, dict[str, float]] = {
+        "partial_output": {"max_age": 86400, "keep_last_per_task": 1},
+        "system_log": {"max_age": 604800, "max_count": 10000},
+    }
+    blackboard_retention_interval: float = 300.0
+    blackboard_archive_dir: str = "blackboard_archive"
+    blackboard_archive_segment_bytes: int = 16 * 1024 * 1024
+    # Oldest archive segments beyond this many are deleted (0 keeps them all)
+    blackboard_archive_max_segments: int = 0
+
+    # API server processes; more than one needs BLACKBOARD_MULTIPROCESS
+    server_workers: int = 1
+
+    # Demand pipeline concurrency; limits are JSON maps, e.g. '{"RH": 2}'
+    demand_workers: int = 4
+    demand_department_limits: dict[str, int] = {}
+    demand_priority_limits: dict[str, int] = {}
+
+    # Demand scheduling: seconds of waiting per priority level gained, how
+    # early a deadline takes precedence, and backlog size before 429s
+    demand_aging_interval: float = 60.0
+    demand_deadline_horizon: float = 300.0
+    demand_max_backlog: int = 100
+
+    # Worker runs started concurrently for the tasks of one breakdown
+    worker_concurrency: int = 4
+
+    # Near-duplicate demands (MinHash similarity >= threshold) seen within
+    # the window, in seconds, reuse one pipeline run; a window of 0 disables it
+    demand_dedup_threshold: float = 0.85
+    demand_dedup_window: float = 600.0
+
+    # Pipeline runs per demand before it is marked failed; each retry resumes
+    # from the last checkpointed stage
+    demand_max_attempts: int = 2
+
+    # Background boss/director runs for demands submitted asynchronously
+    boss_job_concurrency: int = 8
+
+    # Agent response cache. Only side-effect free stages should opt in: the
+    # boss/director runs post the demand through a tool, so caching them
+    # would skip that post.
+    agent_cache_stages: list[str] = ["head", "squad_leader", "worker"]
+    agent_cache_max_entries: int = 256
+    agent_cache_ttl: float = 3600.0
+    agent_cache_path: Optional[str] = None
+
+    # OCR: worker processes each holding a warm docling converter, and the
+    # number of converted documents kept in the content-hash cache
+    ocr_workers: int = 2
+    ocr_cache_entries: int = 128
+    ocr_warm_on_startup: bool = True
+    # Where batch uploads are stored until they are converted
+    document_upload_dir: str = "uploads"
+    # Zip archives with more entries, or more bytes once uncompressed, are
+    # rejected before anything is extracted
+    document_zip_max_entries: int = 1000
+    document_zip_max_bytes: int = 2 << 30
+
+    # Candidate dataset behind the LinkedIn tools: a directory built with
+    # `python -m candidates.build`, or a CSV/JSONL export (indexed on start)
+    candidate_index_path: Optional[str] = None
+    # Where search/profile/availability lookups go: "local" (the index above)
+    # or "http" (a candidate API, see `python -m candidates.stub_server`)
+    candidate_source: Literal["local", "http"] = "local"
+    candidate_api_url: Optional[str] = None
+    candidate_api_key: Optional[str] = None
+    candidate_api_rate: float = 10.0
+    candidate_api_burst: int = 20
+    candidate_api_max_connections: int = 20
+    candidate_api_retries: int = 3
+    candidate_cache_ttl: float = 300.0
+
+    # Agent runs are streamed whenever a client listens to their task; this
+    # streams every run. Partial output is checkpointed on the blackboard
+    # every `stream_checkpoint_interval` seconds (0 disables checkpoints).
+    agent_streaming: bool = False
+    stream_checkpoint_interval: float = 2.0
+
 
 settings = Settings()
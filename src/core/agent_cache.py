@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+class CachedRunResult:
+    """Stand-in for a Runner result served from the cache."""
+
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+def normalize_prompt(prompt):
+    """Normalize a prompt so trivially different demands share a cache entry."""
+    prompt = unicodedata.normalize("NFKC", prompt).casefold()
+    return " ".join(prompt.split())
+
+
+class AgentRunCache:
+    """LRU/TTL cache for agent run outputs with an optional on-disk tier.
+
+    Entries are keyed on the agent name, model, a hash of its instructions and
+    the normalized prompt, so changing an agent's configuration invalidates its
+    entries. The disk tier (SQLite) survives restarts; hits there are promoted
+    back into memory.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600.0, disk_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = {"memory": 0, "disk": 0}
+        self._misses = 0
+
+        self._disk = None
+        if disk_path:
+            self._disk = sqlite3.connect(
+                disk_path, check_same_thread=False, isolation_level=None
+            )
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS agent_cache "
+                "(key TEXT PRIMARY KEY, output TEXT, expires_at REAL)"
+            )
+
+    @staticmethod
+    def key(agent, prompt):
+        instructions = agent.instructions
+        if not isinstance(instructions, str):
+            instructions = repr(instructions)
+        parts = [
+            agent.name,
+            str(agent.model),
+            hashlib.sha256(instructions.encode()).hexdigest(),
+            normalize_prompt(prompt),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def get(self, key, output_type=None):
+        """Return the cached output for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits["memory"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+
+            row = self._get_from_disk(key, now, output_type)
+            if row is not None:
+                output, expires_at = row
+                self._hits["disk"] += 1
+                # With the expiry it was stored with, not a fresh TTL
+                self._remember(key, output, expires_at)
+                return output
+
+            self._misses += 1
+            return None
+
+    def put(self, key, output):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, output, expires_at)
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO agent_cache VALUES (?, ?, ?)",
+                        (key, self._encode(output), expires_at),
+                    )
+                except Exception as e:
+                    logging.warning(f"[AGENT_CACHE_DISK_ERROR] Could not persist: {e}")
+
+    def _remember(self, key, output, expires_at):
+        self._entries[key] = (expires_at, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_from_disk(self, key, now, output_type):
+        if self._disk is None:
+            return None
+        row = self._disk.execute(
+            "SELECT output, expires_at FROM agent_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._disk.execute("DELETE FROM agent_cache WHERE key = ?", (key,))
+            return None
+        return self._decode(row[0], output_type), row[1]
+
+    @staticmethod
+    def _encode(output):
+        if hasattr(output, "model_dump"):
+            output = output.model_dump()
+        return json.dumps(output)
+
+    @staticmethod
+    def _decode(raw, output_type):
+        value = json.loads(raw)
+        if output_type is not None and hasattr(output_type, "model_validate"):
+            return output_type.model_validate(value)
+        return value
+
+    def stats(self):
+        hits = sum(self._hits.values())
+        lookups = hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "memory_hits": self._hits["memory"],
+            "disk_hits": self._hits["disk"],
+            "misses": self._misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,6 @@
+from contextvars import ContextVar
+
+# Metadata of the demand currently flowing through the agents (priority,
+# department). Set by the entry point and read by tools that post to the
+# blackboard, since function tools only receive the arguments the LLM chose.
+demand_context: ContextVar[dict] = ContextVar("demand_context", default={})
@@ -0,0 +1,126 @@
+import hashlib
+import time
+
+import numpy as np
+
+from core.agent_cache import normalize_prompt
+
+# Mersenne prime used by the MinHash permutation family; products wrap
+# around in uint64 before the modulo, as in common MinHash implementations
+_PRIME = np.uint64((1 << 61) - 1)
+
+
+class DemandDeduplicator:
+    """Detects near-duplicate demands with character-shingle MinHash.
+
+    A demand similar to one seen within the last `window` seconds (estimated
+    Jaccard similarity >= `threshold`) is linked to that primary demand
+    instead of running the pipeline again. Linked demands are handed back when
+    the primary completes so its result can be fanned out to them.
+    """
+
+    def __init__(self, threshold=0.85, window=600.0, num_perm=64, shingle_size=4):
+        self.threshold = threshold
+        self.window = window
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(42)  # Fixed seed: signatures must be stable
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._entries = {}  # primary demand id -> entry
+        self._coalesced = 0
+
+    def _shingles(self, text):
+        text = normalize_prompt(text)
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {
+            text[i : i + self.shingle_size]
+            for i in range(len(text) - self.shingle_size + 1)
+        }
+
+    def signature(self, text):
+        hashes = np.array(
+            [
+                int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest())
+                for s in self._shingles(text)
+            ],
+            dtype=np.uint64,
+        )
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return float(np.mean(sig_a == sig_b))
+
+    def _expire(self, now):
+        # In-flight primaries stay until they finish, whatever their age
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if entry["completed"] and now - entry["seen_at"] > self.window
+        ]:
+            del self._entries[key]
+
+    def match(self, text):
+        """Return the id of a primary demand similar to `text`, or None."""
+        if self.window <= 0:
+            return None
+        now = time.time()
+        self._expire(now)
+
+        signature = self.signature(text)
+        best_key, best_score = None, self.threshold
+        for key, entry in self._entries.items():
+            score = self.similarity(signature, entry["signature"])
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def register(self, demand):
+        """Track a demand that is about to run the pipeline."""
+        if self.window <= 0:
+            return
+        self._entries[demand["id"]] = {
+            "demand": demand,
+            "signature": self.signature(demand["content"]),
+            "seen_at": time.time(),
+            "completed": False,
+            "linked": [],
+        }
+
+    def link(self, primary_id, demand):
+        """Attach a duplicate to its primary; returns True if the primary is done."""
+        entry = self._entries[primary_id]
+        self._coalesced += 1
+        if entry["completed"]:
+            return True
+        entry["linked"].append(demand)
+        return False
+
+    def primary(self, primary_id):
+        entry = self._entries.get(primary_id)
+        return entry["demand"] if entry else None
+
+    def complete(self, primary_id):
+        """Mark a primary as done and return the duplicates waiting on it."""
+        entry = self._entries.get(primary_id)
+        if entry is None:
+            return []
+        entry["completed"] = True
+        entry["seen_at"] = time.time()
+        linked, entry["linked"] = entry["linked"], []
+        return linked
+
+    def release(self, primary_id):
+        """Forget a failed primary and return its duplicates so they can run."""
+        entry = self._entries.pop(primary_id, None)
+        return entry["linked"] if entry else []
+
+    def stats(self):
+        return {
+            "tracked": len(self._entries),
+            "in_flight": sum(not e["completed"] for e in self._entries.values()),
+            "coalesced": self._coalesced,
+            "threshold": self.threshold,
+            "window_seconds": self.window,
+        }
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+
+from core.scheduler import DemandScheduler
+
+
+class DemandExecutor:
+    """Bounded pool that runs demand pipelines concurrently.
+
+    At most `workers` demands run at once. Optional per-department and
+    per-priority limits cap how many of those slots a single department or
+    priority level may hold. Waiting demands are ordered by a
+    `DemandScheduler`; a saturated department does not block the queue, the
+    dispatcher picks the next demand whose limits still have room.
+    """
+
+    def __init__(
+        self,
+        handler,
+        workers=4,
+        department_limits=None,
+        priority_limits=None,
+        scheduler=None,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.department_limits = department_limits or {}
+        self.priority_limits = priority_limits or {}
+        # Not `or`: an empty scheduler is falsy
+        self.scheduler = scheduler if scheduler is not None else DemandScheduler()
+
+        self._avg_duration = None
+        self._running = {}  # asyncio task -> demand
+        self._by_department = Counter()
+        self._by_priority = Counter()
+        self._processed = 0
+        self._failed = 0
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+        # Set whenever a running pipeline finishes and frees its slot
+        self.slot_freed = asyncio.Event()
+
+    @staticmethod
+    def _keys(demand):
+        return demand.get("department") or "default", demand.get("priority") or "normal"
+
+    async def start(self):
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+            logging.info(
+                f"[EXECUTOR_START] Demand executor started with {self.workers} workers"
+            )
+
+    async def stop(self):
+        """Stop dispatching and cancel running pipelines."""
+        tasks = list(self._running.keys())
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logging.info("[EXECUTOR_STOP] Demand executor stopped")
+
+    def submit(self, demand):
+        """Queue a demand message for processing."""
+        self.scheduler.push(demand)
+        self._wakeup.set()
+        logging.info(
+            f"[EXECUTOR_QUEUED] [MessageID: {demand['id']}] Queue depth: {len(self.scheduler)}"
+        )
+
+    def cancel(self, task_id):
+        """Drop queued demands of a task and cancel its running pipelines.
+
+        Returns the number of demands affected.
+        """
+        cancelled = self.scheduler.remove(
+            lambda demand: demand.get("task_id") == task_id
+        )
+        for task, demand in list(self._running.items()):
+            if demand.get("task_id") == task_id:
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            logging.info(
+                f"[EXECUTOR_CANCELLED] [TaskID: {task_id}] Cancelled {cancelled} demand(s)"
+            )
+        return cancelled
+
+    def abandon(self, message_id):
+        """Drop a demand, queued or running, that is no longer ours to run.
+
+        Used when another process has taken over the demand's lease. Returns
+        whether the demand was found.
+        """
+        found = self.scheduler.remove(lambda demand: demand["id"] == message_id) > 0
+        for task, demand in list(self._running.items()):
+            if demand["id"] == message_id:
+                task.cancel()
+                found = True
+        if found:
+            logging.warning(
+                f"[EXECUTOR_ABANDONED] [MessageID: {message_id}] Demand taken over by another process"
+            )
+        return found
+
+    @property
+    def saturated(self):
+        """Whether the backlog is over the admission limit."""
+        return self.scheduler.full
+
+    @property
+    def free_slots(self):
+        """Workers neither running nor already reserved by a queued demand."""
+        return max(0, self.workers - len(self._running) - len(self.scheduler))
+
+    def retry_after(self):
+        """Estimated seconds until the current backlog drains."""
+        duration = self._avg_duration or 30.0
+        return max(1, math.ceil(len(self.scheduler) * duration / self.workers))
+
+    def _has_room(self, demand):
+        department, priority = self._keys(demand)
+        department_limit = self.department_limits.get(department)
+        priority_limit = self.priority_limits.get(priority)
+        return (
+            department_limit is None
+            or self._by_department[department] < department_limit
+        ) and (priority_limit is None or self._by_priority[priority] < priority_limit)
+
+    async def _dispatch(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while len(self._running) < self.workers:
+                demand = self.scheduler.pop(self._has_room)
+                if demand is None:
+                    break
+                self._launch(demand)
+
+    def _launch(self, demand):
+        department, priority = self._keys(demand)
+        self._by_department[department] += 1
+        self._by_priority[priority] += 1
+
+        task = asyncio.create_task(self._run(demand))
+        self._running[task] = demand
+
+        def _done(finished):
+            self._running.pop(finished, None)
+            self._by_department[department] -= 1
+            self._by_priority[priority] -= 1
+            self._wakeup.set()
+            self.slot_freed.set()
+
+        task.add_done_callback(_done)
+
+    async def _run(self, demand):
+        started = time.monotonic()
+        try:
+            await self.handler(demand)
+            self._processed += 1
+            self._record_duration(time.monotonic() - started)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._failed += 1
+            logging.error(
+                f"[EXECUTOR_ERROR] [MessageID: {demand['id']}] Demand pipeline failed: {e}",
+                exc_info=True,
+            )
+
+    def _record_duration(self, duration):
+        # Exponentially weighted so the estimate follows current LLM latency
+        if self._avg_duration is None:
+            self._avg_duration = duration
+        else:
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    def stats(self):
+        """Queue depth and in-flight counts, overall and per department/priority."""
+        return {
+            "workers": self.workers,
+            "queue_depth": len(self.scheduler),
+            "in_flight": len(self._running),
+            "in_flight_by_department": {
+                k: v for k, v in self._by_department.items() if v
+            },
+            "in_flight_by_priority": {k: v for k, v in self._by_priority.items() if v},
+            "processed": self._processed,
+            "failed": self._failed,
+            "avg_duration_seconds": self._avg_duration,
+            "scheduler": self.scheduler.stats(),
+        }
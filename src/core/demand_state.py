@@ -0,0 +1,95 @@
+import logging
+from datetime import datetime
+
+# Pipeline states: queued -> head -> squad_leader -> worker -> done, or failed.
+# Staying in the same state (a resumed stage) is always allowed.
+TRANSITIONS = {
+    # Duplicates go straight to done with the result of their primary demand
+    "queued": {"head", "done", "failed"},
+    "head": {"squad_leader", "failed"},
+    # A breakdown without tasks finishes right after the squad leader
+    "squad_leader": {"worker", "done", "failed"},
+    "worker": {"done", "failed"},
+    "done": set(),
+    "failed": set(),
+}
+
+
+class DemandLifecycle:
+    """Persisted pipeline state of one demand.
+
+    The state, the number of failed attempts and the ids of the messages
+    holding each finished stage's output (checkpoints) are stored as fields
+    of the demand message itself, so a restarted pipeline can pick up from
+    the last completed stage instead of calling the agents again.
+    """
+
+    def __init__(self, blackboard, demand):
+        self.blackboard = blackboard
+        self.demand = demand
+
+    @property
+    def state(self):
+        return self.demand.get("state") or "queued"
+
+    @property
+    def attempts(self):
+        return self.demand.get("attempts", 0)
+
+    @property
+    def checkpoints(self):
+        return self.demand.get("checkpoints") or {}
+
+    async def _update(self, **changes):
+        message = await self.blackboard.update(self.demand["id"], **changes)
+        if message is not None:
+            self.demand = message
+        return message
+
+    async def advance(self, state, **changes):
+        """Move to `state`, persisting extra message `changes` in the same write."""
+        current = self.state
+        if state == current and not changes:
+            return
+        if state != current and state not in TRANSITIONS[current]:
+            raise ValueError(f"Invalid demand transition '{current}' -> '{state}'")
+
+        await self._update(
+            state=state, state_changed_at=datetime.now().isoformat(), **changes
+        )
+        logging.info(
+            f"[DEMAND_STATE] [MessageID: {self.demand['id']}] {current} -> {state}"
+        )
+
+    async def checkpoint(self, name, message_id):
+        """Record the message holding the output of a finished step."""
+        await self._update(checkpoints={**self.checkpoints, name: message_id})
+
+    async def restore(self, name):
+        """Return the checkpointed message of a step, or None if it must run."""
+        message_id = self.checkpoints.get(name)
+        if message_id is None:
+            return None
+        message = await self.blackboard.get_by_id(message_id)
+        if message is None:
+            logging.warning(
+                f"[DEMAND_CHECKPOINT_MISSING] [MessageID: {self.demand['id']}] "
+                f"Checkpoint '{name}' ({message_id}) not found, running the step again"
+            )
+        return message
+
+    async def fail(self, error, max_attempts):
+        """Record a failed attempt; returns True if the demand should be retried.
+
+        The stage and its checkpoints are kept, so a retry resumes where the
+        failed attempt stopped. Once `max_attempts` is reached the demand
+        moves to `failed` and its message type to `demand_failed`.
+        """
+        attempts = self.attempts + 1
+        if attempts < max_attempts:
+            await self._update(attempts=attempts, error=str(error))
+            return True
+        await self.advance(
+            "failed", attempts=attempts, error=str(error), type="demand_failed"
+        )
+        return False
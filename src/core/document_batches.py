@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class ArchiveTooLarge(ValueError):
+    """A zip archive would extract to more bytes than allowed."""
+
+
+def check_archive(archive_path, max_entries, max_bytes):
+    """Reject a zip archive before extracting it.
+
+    Raises ValueError if it is not a valid zip or has more than `max_entries`
+    entries, and ArchiveTooLarge if its entries add up to more than
+    `max_bytes` uncompressed. Only the central directory is read; the sizes
+    it declares are the most extraction will write.
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            entries = archive.infolist()
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a valid zip archive: {e}")
+    if len(entries) > max_entries:
+        raise ValueError(
+            f"The archive has {len(entries)} entries, more than the {max_entries} allowed"
+        )
+    size = sum(entry.file_size for entry in entries)
+    if size > max_bytes:
+        raise ArchiveTooLarge(
+            f"The archive extracts to {size} bytes, more than the {max_bytes} allowed"
+        )
+
+
+def _extract_pdfs(archive_path, target_dir, max_entries, max_bytes):
+    """Extract the PDFs of a zip archive entry by entry; returns their paths."""
+    check_archive(archive_path, max_entries, max_bytes)
+    paths = []
+    prefix = os.path.basename(archive_path).split("_", 1)[0]
+    with zipfile.ZipFile(archive_path) as archive:
+        for index, entry in enumerate(archive.infolist()):
+            if entry.is_dir() or not entry.filename.lower().endswith(".pdf"):
+                continue
+            # Never trust archive paths: flatten them into the batch directory
+            name = os.path.basename(entry.filename)
+            path = os.path.join(target_dir, f"{prefix}-{index:05d}_{name}")
+            with archive.open(entry) as source, open(path, "wb") as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+            paths.append(path)
+    os.unlink(archive_path)
+    return paths
+
+
+class DocumentBatchManager:
+    """Converts batches of uploaded PDFs and posts them to the blackboard.
+
+    Uploaded files (PDFs or zip archives of PDFs) are already on disk in the
+    batch directory. They are converted in parallel through the converter
+    pool, each result is posted as a `document` message and the batch keeps
+    progress and throughput counters that can be polled while it runs.
+    Finished batches are kept in memory up to `max_finished`. Zip archives
+    are checked against `max_archive_entries` and `max_archive_bytes` (see
+    `check_archive`) before they are extracted.
+    """
+
+    def __init__(
+        self,
+        converter_pool,
+        blackboard,
+        upload_dir,
+        max_finished=100,
+        max_archive_entries=1000,
+        max_archive_bytes=2 << 30,
+    ):
+        self.converter_pool = converter_pool
+        self.blackboard = blackboard
+        self.upload_dir = upload_dir
+        self.max_finished = max_finished
+        self.max_archive_entries = max_archive_entries
+        self.max_archive_bytes = max_archive_bytes
+        self._batches = OrderedDict()
+        self._tasks = {}
+
+    def create(self):
+        """Register a new batch and return its record and upload directory."""
+        batch_id = str(uuid.uuid4())[:8]
+        directory = os.path.join(self.upload_dir, batch_id)
+        os.makedirs(directory, exist_ok=True)
+        batch = {
+            "batch_id": batch_id,
+            "state": "receiving",
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "pages": 0,
+            "pages_per_second": 0.0,
+            "errors": [],
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+        }
+        self._batches[batch_id] = batch
+        return batch, directory
+
+    def start(self, batch, directory, task_id=None):
+        """Start converting everything uploaded to the batch directory."""
+        batch_id = batch["batch_id"]
+        self._tasks[batch_id] = asyncio.create_task(
+            self._run(batch, directory, task_id)
+        )
+        logging.info(f"[DOCUMENT_BATCH_START] [BatchID: {batch_id}] Batch queued")
+
+    async def _run(self, batch, directory, task_id):
+        batch_id = batch["batch_id"]
+        try:
+            paths = []
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if name.lower().endswith(".zip"):
+                    paths.extend(
+                        await asyncio.to_thread(
+                            _extract_pdfs,
+                            path,
+                            directory,
+                            self.max_archive_entries,
+                            self.max_archive_bytes,
+                        )
+                    )
+                else:
+                    paths.append(path)
+
+            batch["total"] = len(paths)
+            batch["state"] = "converting"
+            started = time.perf_counter()
+
+            async def convert(path):
+                await self._convert(batch, path, task_id)
+                elapsed = time.perf_counter() - started
+                batch["pages_per_second"] = round(batch["pages"] / elapsed, 2)
+
+            await asyncio.gather(*(convert(path) for path in paths))
+            batch["state"] = "completed"
+            logging.info(
+                f"[DOCUMENT_BATCH_COMPLETE] [BatchID: {batch_id}] "
+                f"{batch['completed']}/{batch['total']} documents, "
+                f"{batch['pages']} pages at {batch['pages_per_second']} pages/s"
+            )
+        except asyncio.CancelledError:
+            batch["state"] = "cancelled"
+            raise
+        except Exception as e:
+            batch["state"] = "failed"
+            batch["errors"].append({"document": None, "error": str(e)})
+            logging.error(f"[DOCUMENT_BATCH_ERROR] [BatchID: {batch_id}] {e}")
+        finally:
+            batch["finished_at"] = datetime.now().isoformat()
+            self._tasks.pop(batch_id, None)
+            shutil.rmtree(directory, ignore_errors=True)
+            self._evict_finished()
+
+    async def _convert(self, batch, path, task_id):
+        # Strip the ordering prefix added when the file was stored
+        name = os.path.basename(path).split("_", 1)[-1]
+        try:
+            result = await self.converter_pool.convert_file(path, name)
+        except Exception as e:
+            batch["failed"] += 1
+            batch["errors"].append({"document": name, "error": str(e)})
+            logging.error(
+                f"[DOCUMENT_ERROR] [BatchID: {batch['batch_id']}] {name}: {e}"
+            )
+            return
+
+        fields = {
+            "batch_id": batch["batch_id"],
+            "filename": name,
+            "pages": result["pages"],
+        }
+        if task_id:
+            fields["task_id"] = task_id
+        await self.blackboard.post(
+            sender="ocr", content=result["markdown"], type_="document", **fields
+        )
+        batch["completed"] += 1
+        batch["pages"] += result["pages"]
+
+    def abort(self, batch, directory, error):
+        """Drop a batch whose upload failed before conversion started."""
+        batch["state"] = "failed"
+        batch["errors"].append({"document": None, "error": error})
+        batch["finished_at"] = datetime.now().isoformat()
+        shutil.rmtree(directory, ignore_errors=True)
+        self._evict_finished()
+
+    def check_archive(self, path):
+        """Check an uploaded zip archive against the limits; see `check_archive`."""
+        check_archive(path, self.max_archive_entries, self.max_archive_bytes)
+
+    def _evict_finished(self):
+        # Batches still receiving uploads are not running yet, but not finished
+        finished = [
+            key
+            for key, batch in self._batches.items()
+            if batch["state"] in FINISHED_STATES
+        ]
+        for key in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._batches[key]
+
+    def get(self, batch_id):
+        return self._batches.get(batch_id)
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+# One converter per worker process, created (and its models loaded) once
+_converter = None
+
+
+def _get_converter():
+    global _converter
+    if _converter is None:
+        from docling.datamodel.base_models import InputFormat
+        from docling.document_converter import DocumentConverter
+
+        _converter = DocumentConverter()
+        _converter.initialize_pipeline(InputFormat.PDF)
+    return _converter
+
+
+def _init_worker():
+    # Exit along with the parent: workers of a crashed server would otherwise
+    # live on as orphans, waiting for documents that never come
+    sentinel = multiprocessing.parent_process().sentinel
+    threading.Thread(
+        target=_exit_with_parent, args=(sentinel,), name="parent-watch", daemon=True
+    ).start()
+
+
+def _exit_with_parent(sentinel):
+    multiprocessing.connection.wait([sentinel])
+    os._exit(1)
+
+
+def _warm():
+    _get_converter()
+    return multiprocessing.current_process().name
+
+
+def _summarize(result):
+    return {
+        "markdown": result.document.export_to_markdown(),
+        "pages": result.document.num_pages(),
+    }
+
+
+def _convert(data, name):
+    from docling.datamodel.base_models import DocumentStream
+
+    return _summarize(
+        _get_converter().convert(DocumentStream(name=name, stream=BytesIO(data)))
+    )
+
+
+def _convert_path(path):
+    return _summarize(_get_converter().convert(path))
+
+
+def _hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentConverterPool:
+    """Runs docling conversions in a pool of warm worker processes.
+
+    Each worker builds its `DocumentConverter` once, so models are loaded per
+    process instead of per document, and conversions run off the event loop.
+    Documents are passed as in-memory streams, and results are cached by the
+    SHA-256 of the document bytes: the same file uploaded twice, even
+    concurrently, is converted once.
+
+    Workers are spawned, not forked: the server has threads running (the
+    agents SDK starts one on import) and a child forked while another thread
+    holds a lock can deadlock on it. Spawned workers re-import the script
+    that started the process, so that script must do its work behind an
+    `if __name__ == "__main__"` guard (see `server.py`).
+    """
+
+    def __init__(self, workers=2, cache_entries=128):
+        self.workers = workers
+        self.cache_entries = cache_entries
+        self._executor = None
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def start(self):
+        """Load the models of every worker process ahead of the first document."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        names = await asyncio.gather(
+            *(loop.run_in_executor(executor, _warm) for _ in range(self.workers))
+        )
+        logging.info(
+            f"[OCR_POOL_READY] {len(set(names))} converter worker(s) warmed up"
+        )
+
+    async def convert(self, data, name="document.pdf"):
+        """Convert document bytes; returns `{"markdown": ..., "pages": ...}`."""
+        key = hashlib.sha256(data).hexdigest()
+        return await self._convert_cached(key, name, _convert, data, name)
+
+    async def convert_file(self, path, name=None):
+        """Convert a document on disk without loading it into this process."""
+        key = await asyncio.to_thread(_hash_file, path)
+        return await self._convert_cached(
+            key, name or os.path.basename(path), _convert_path, str(path)
+        )
+
+    async def _convert_cached(self, key, name, function, *args):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._hits += 1
+            logging.info(f"[OCR_CACHE_HIT] Document {name} served from cache")
+            return self._cache[key]
+
+        if key in self._inflight:
+            self._hits += 1
+            return await asyncio.shield(self._inflight[key])
+
+        self._misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), function, *args)
+        self._inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): start a fresh pool next time
+            logging.error(
+                "[OCR_POOL_BROKEN] A converter worker died; restarting the pool"
+            )
+            self.shutdown()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self._cache[key] = result
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "cached_documents": len(self._cache),
+            "in_flight": len(self._inflight),
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
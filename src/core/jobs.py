@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+
+class JobManager:
+    """Runs submitted demand jobs in the background with bounded concurrency.
+
+    Jobs are keyed by task id. Finished jobs are kept in memory (up to
+    `max_finished`) so their result can be looked up; the durable record of a
+    job lives on the blackboard.
+    """
+
+    def __init__(self, max_concurrency=8, max_finished=1000):
+        self.max_finished = max_finished
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._jobs = OrderedDict()
+        self._tasks = {}
+
+    def submit(self, task_id, job_factory):
+        """Schedule `job_factory()` (a coroutine function) under `task_id`."""
+        job = {
+            "task_id": task_id,
+            "state": "queued",
+            "result": None,
+            "error": None,
+            "submitted_at": datetime.now().isoformat(),
+            "finished_at": None,
+        }
+        self._jobs[task_id] = job
+        self._tasks[task_id] = asyncio.create_task(self._run(job, job_factory))
+        logging.info(f"[JOB_SUBMITTED] [TaskID: {task_id}] Job queued")
+        return job
+
+    async def _run(self, job, job_factory):
+        task_id = job["task_id"]
+        try:
+            async with self._semaphore:
+                job["state"] = "running"
+                logging.info(f"[JOB_START] [TaskID: {task_id}] Job running")
+                job["result"] = await job_factory()
+                job["state"] = "completed"
+                logging.info(f"[JOB_COMPLETE] [TaskID: {task_id}] Job completed")
+        except asyncio.CancelledError:
+            job["state"] = "cancelled"
+            logging.info(f"[JOB_CANCELLED] [TaskID: {task_id}] Job cancelled")
+        except Exception as e:
+            job["state"] = "failed"
+            job["error"] = str(e)
+            logging.error(f"[JOB_ERROR] [TaskID: {task_id}] Job failed: {e}")
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            self._tasks.pop(task_id, None)
+            self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [task_id for task_id in self._jobs if task_id not in self._tasks]
+        for task_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[task_id]
+
+    def get(self, task_id):
+        """Return the job record for a task, or None if unknown."""
+        return self._jobs.get(task_id)
+
+    def cancel(self, task_id):
+        """Cancel a queued or running job. Returns False if it is not active."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def stats(self):
+        states = {}
+        for job in self._jobs.values():
+            states[job["state"]] = states.get(job["state"], 0) + 1
+        return {"active": len(self._tasks), "by_state": states}
+
+    async def shutdown(self):
+        """Cancel every active job and wait for them to finish."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    renewed_at REAL NOT NULL
+);
+"""
+
+
+class LeaseManager:
+    """Time-limited claims on work items, shared through a SQLite database.
+
+    Every process sharing the database uses its own `owner` name. A claim
+    succeeds if nobody holds the key or the holder's lease has expired, so
+    each demand is run by exactly one live process. Held leases are renewed
+    by `heartbeat`; when a process dies its leases run out after `ttl`
+    seconds and the work can be reclaimed elsewhere. With ":memory:" the
+    leases only coordinate the current process.
+    """
+
+    def __init__(self, path, owner, ttl=30.0, busy_timeout=30.0):
+        self.path = str(path)
+        self.owner = owner
+        self.ttl = ttl
+        self._held = set()
+        # Keys with a claim in flight, reserved before the database hop so
+        # concurrent claims from this process can't both win
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=busy_timeout,
+        )
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._stats = {"claimed": 0, "contended": 0, "reclaimed": 0, "lost": 0}
+
+    def holds(self, key):
+        return key in self._held
+
+    def _claim(self, key):
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT owner FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+            cursor = self._conn.execute(
+                "INSERT INTO leases (key, owner, expires_at, renewed_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, "
+                "expires_at = excluded.expires_at, renewed_at = excluded.renewed_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (key, self.owner, now + self.ttl, now, now),
+            )
+            claimed = cursor.rowcount > 0
+
+        if not claimed:
+            self._stats["contended"] += 1
+            return False
+        self._held.add(key)
+        self._stats["claimed"] += 1
+        if previous is not None and previous[0] != self.owner:
+            self._stats["reclaimed"] += 1
+            logging.info(
+                f"[LEASE_RECLAIMED] [{key}] Took over the expired lease of {previous[0]}"
+            )
+        return True
+
+    async def claim(self, key):
+        """Claim `key` for this process.
+
+        Returns False if the key is already held or being claimed here, or if
+        another live process holds it, so exactly one caller gets True.
+        """
+        if key in self._held or key in self._pending:
+            return False
+        self._pending.add(key)
+        try:
+            return await asyncio.to_thread(self._claim, key)
+        finally:
+            self._pending.discard(key)
+
+    def _release(self, key):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner)
+            )
+
+    async def release(self, key):
+        """Give up a claim (the work is finished or handed back)."""
+        if key in self._held:
+            self._held.discard(key)
+            await asyncio.to_thread(self._release, key)
+
+    def _renew(self):
+        now = time.time()
+        keys = list(self._held)
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE leases SET expires_at = ?, renewed_at = ? "
+                "WHERE key = ? AND owner = ?",
+                [(now + self.ttl, now, key, self.owner) for key in keys],
+            )
+            owned = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT key FROM leases WHERE owner = ?", (self.owner,)
+                )
+            }
+        lost = [key for key in keys if key not in owned and key in self._held]
+        for key in lost:
+            self._held.discard(key)
+        return lost
+
+    async def heartbeat(self):
+        """Extend every held lease; returns the keys taken over by others."""
+        lost = await asyncio.to_thread(self._renew)
+        if lost:
+            self._stats["lost"] += len(lost)
+            logging.warning(
+                f"[LEASE_LOST] {len(lost)} lease(s) expired before renewal: {lost}"
+            )
+        return lost
+
+    def release_all(self):
+        """Hand every held lease back, e.g. on a clean shutdown."""
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE owner = ?", (self.owner,))
+        self._held.clear()
+
+    def stats(self):
+        return {"owner": self.owner, "held": len(self._held), **self._stats}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+
+class RetentionPolicy:
+    """How long messages of one type stay on the live blackboard.
+
+    A message expires once any of the limits catches it: it is older than
+    `max_age` seconds, it is not among the newest `max_count` messages of its
+    type, or it is not among the newest `keep_last_per_task` messages of its
+    type within its task. Limits left as None don't apply.
+    """
+
+    def __init__(self, type_, max_age=None, max_count=None, keep_last_per_task=None):
+        self.type_ = type_
+        self.max_age = max_age
+        self.max_count = max_count
+        self.keep_last_per_task = keep_last_per_task
+
+    @classmethod
+    def from_config(cls, config):
+        """Build policies from a `{type: {limit: value}}` map (see settings)."""
+        policies = []
+        for type_, limits in config.items():
+            unknown = set(limits) - {"max_age", "max_count", "keep_last_per_task"}
+            if unknown:
+                raise ValueError(
+                    f"Unknown retention limits for '{type_}': {sorted(unknown)}"
+                )
+            policies.append(
+                cls(
+                    type_,
+                    max_age=limits.get("max_age"),
+                    max_count=(
+                        int(limits["max_count"]) if "max_count" in limits else None
+                    ),
+                    keep_last_per_task=(
+                        int(limits["keep_last_per_task"])
+                        if "keep_last_per_task" in limits
+                        else None
+                    ),
+                )
+            )
+        return policies
+
+    def expired(self, messages, now=None):
+        """Return the expired ones among `messages` (all of this type, oldest first)."""
+        now = now or datetime.now()
+        expired = {}
+
+        if self.max_age is not None:
+            cutoff = (now - timedelta(seconds=self.max_age)).isoformat()
+            for message in messages:
+                if message["timestamp"] < cutoff:
+                    expired[message["id"]] = message
+
+        if self.max_count is not None and len(messages) > self.max_count:
+            for message in messages[: len(messages) - self.max_count]:
+                expired[message["id"]] = message
+
+        if self.keep_last_per_task is not None:
+            by_task = defaultdict(list)
+            for message in messages:
+                by_task[message.get("task_id")].append(message)
+            for task_messages in by_task.values():
+                surplus = len(task_messages) - self.keep_last_per_task
+                for message in task_messages[: max(surplus, 0)]:
+                    expired[message["id"]] = message
+
+        return sorted(expired.values(), key=lambda message: message["timestamp"])
+
+
+class RetentionCompactor:
+    """Enforces retention policies by moving expired messages to the archive.
+
+    Each pass reads the messages of every policy's type, then archives and
+    removes the expired ones in chunks of `batch_size`. Reads and archive
+    writes run off the event loop and removals go through the blackboard's
+    writer thread like any post, so posting never waits for a whole pass.
+    """
+
+    def __init__(self, blackboard, policies, batch_size=1000):
+        self.blackboard = blackboard
+        self.policies = policies
+        self.batch_size = batch_size
+        self._stats = {"passes": 0, "archived": 0, "last_pass_seconds": None}
+
+    def _select(self, policy):
+        # Runs off the event loop: reading a large type can take a while
+        with self.blackboard._state_lock:
+            messages = self.blackboard.storage.find("type", policy.type_)
+        return policy.expired(messages)
+
+    async def run_once(self):
+        """Run one pass over every policy; returns the number of messages archived."""
+        started = time.monotonic()
+        archived = 0
+        for policy in self.policies:
+            expired = await asyncio.to_thread(self._select, policy)
+            for start in range(0, len(expired), self.batch_size):
+                archived += await self.blackboard.archive_messages(
+                    expired[start : start + self.batch_size]
+                )
+            if expired:
+                logging.info(
+                    f"[RETENTION] Archived {len(expired)} expired '{policy.type_}' messages"
+                )
+
+        self._stats["passes"] += 1
+        self._stats["archived"] += archived
+        self._stats["last_pass_seconds"] = round(time.monotonic() - started, 3)
+        return archived
+
+    def stats(self):
+        return {
+            **self._stats,
+            "policies": {
+                policy.type_: {
+                    "max_age": policy.max_age,
+                    "max_count": policy.max_count,
+                    "keep_last_per_task": policy.keep_last_per_task,
+                }
+                for policy in self.policies
+            },
+            "archive": (
+                self.blackboard.archive.stats()
+                if self.blackboard.archive is not None
+                else None
+            ),
+        }
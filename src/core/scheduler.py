@@ -0,0 +1,92 @@
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+# Lower rank runs first; unknown priorities are treated as "normal"
+PRIORITY_RANKS = {"urgent": 0, "high": 1, "normal": 2, "low": 3}
+
+
+class DemandScheduler:
+    """Priority queue of demands with aging and deadline awareness.
+
+    Each demand gets a static sort key on the time axis:
+    `enqueued_at + rank * aging_interval`. A demand therefore climbs one
+    priority level for every `aging_interval` seconds it waits, so low
+    priority work is never starved. A demand with a deadline is keyed no later
+    than `deadline - deadline_horizon`, which orders demands close to their
+    deadline earliest-deadline-first ahead of everything else.
+    """
+
+    def __init__(self, aging_interval=60.0, deadline_horizon=300.0, max_backlog=100):
+        self.aging_interval = aging_interval
+        self.deadline_horizon = deadline_horizon
+        self.max_backlog = max_backlog
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def full(self):
+        return len(self._heap) >= self.max_backlog
+
+    def _key(self, demand, enqueued_at):
+        rank = PRIORITY_RANKS.get(demand.get("priority") or "normal", 2)
+        key = enqueued_at + rank * self.aging_interval
+
+        deadline = demand.get("deadline")
+        if deadline:
+            deadline_ts = datetime.fromisoformat(deadline).timestamp()
+            key = min(key, deadline_ts - self.deadline_horizon)
+        return key
+
+    def push(self, demand):
+        enqueued_at = time.time()
+        entry = (
+            self._key(demand, enqueued_at),
+            next(self._sequence),
+            enqueued_at,
+            demand,
+        )
+        heapq.heappush(self._heap, entry)
+
+    def pop(self, eligible=lambda demand: True):
+        """Remove and return the first demand accepted by `eligible`, or None."""
+        skipped = []
+        found = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if eligible(entry[3]):
+                found = entry[3]
+                break
+            skipped.append(entry)
+
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def remove(self, predicate):
+        """Remove every queued demand accepted by `predicate`; return how many."""
+        kept = [entry for entry in self._heap if not predicate(entry[3])]
+        removed = len(self._heap) - len(kept)
+        if removed:
+            heapq.heapify(kept)
+            self._heap = kept
+        return removed
+
+    def stats(self):
+        now = time.time()
+        by_priority = {}
+        oldest_wait = 0.0
+        for _, _, enqueued_at, demand in self._heap:
+            priority = demand.get("priority") or "normal"
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+            oldest_wait = max(oldest_wait, now - enqueued_at)
+        return {
+            "depth": len(self._heap),
+            "max_backlog": self.max_backlog,
+            "depth_by_priority": by_priority,
+            "oldest_wait_seconds": round(oldest_wait, 3),
+        }
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+
+class StreamListener:
+    """Live agent events of one task (or of every task) for a single consumer.
+
+    Use it as a context manager so it is detached from the hub when the
+    consumer goes away; iterate it with `async for` to receive events.
+    """
+
+    def __init__(self, hub, task_id):
+        self.hub = hub
+        self.task_id = task_id
+        self.queue = asyncio.Queue()
+
+    async def get(self, timeout=None):
+        if timeout is None:
+            return await self.queue.get()
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.hub._unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StreamHub:
+    """Fans out live agent events (tokens, tool calls, handoffs) per task.
+
+    Events are plain dicts with an `event` name, the pipeline `stage`, the
+    `agent` producing it, its `data` and the `task_id`. Unlike the blackboard
+    nothing is persisted: listeners only see events published while they are
+    subscribed.
+    """
+
+    def __init__(self):
+        self._listeners = {}  # task id (None: every task) -> set of listeners
+
+    def subscribe(self, task_id=None):
+        listener = StreamListener(self, task_id)
+        self._listeners.setdefault(task_id, set()).add(listener)
+        logging.info(f"[STREAM_SUBSCRIBE] Listener attached to task {task_id}")
+        return listener
+
+    def _unsubscribe(self, listener):
+        listeners = self._listeners.get(listener.task_id, set())
+        listeners.discard(listener)
+        if not listeners:
+            self._listeners.pop(listener.task_id, None)
+
+    def has_listeners(self, task_id):
+        return bool(self._listeners.get(task_id) or self._listeners.get(None))
+
+    def publish(self, task_id, event):
+        event = {**event, "task_id": task_id}
+        for key in {task_id, None}:
+            for listener in self._listeners.get(key, ()):
+                listener.queue.put_nowait(event)
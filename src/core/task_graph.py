@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import logging
+
+# Lower rank is started first when more tasks are ready than there are workers
+TASK_PRIORITY_RANKS = {"high": 0, "medium": 1, "low": 2}
+
+
+class TaskGraph:
+    """Dependency DAG of tasks that runs independent tasks concurrently.
+
+    Tasks are dicts with a `number`, a `priority` (High/Medium/Low) and the
+    `dependencies` (task numbers) that must finish first, as in the squad
+    leader's structured breakdown.
+
+    Ready tasks are started on up to `max_concurrency` slots, preferring the
+    higher priority and then the longest chain of dependents, so a demand
+    takes about as long as its critical path. A failed task skips everything
+    that depends on it; unrelated tasks keep running.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = {task["number"]: task for task in tasks}
+        self.dependencies = {}
+        for number, task in self.tasks.items():
+            unknown = [dep for dep in task["dependencies"] if dep not in self.tasks]
+            if unknown:
+                logging.warning(
+                    f"[TASK_GRAPH] Task {number} depends on unknown tasks {unknown}, ignoring them"
+                )
+            self.dependencies[number] = {
+                dep for dep in task["dependencies"] if dep in self.tasks
+            } - {number}
+        self.dependents = {number: set() for number in self.tasks}
+        for number, dependencies in self.dependencies.items():
+            for dep in dependencies:
+                self.dependents[dep].add(number)
+
+        self.order = self._topological_order()
+        self.path_lengths = self._path_lengths()
+
+    def _topological_order(self):
+        pending = {number: len(deps) for number, deps in self.dependencies.items()}
+        ready = sorted(number for number, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            number = ready.pop(0)
+            order.append(number)
+            for dependent in sorted(self.dependents[number]):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        blocked = set(self.tasks) - set(order)
+        # Tasks that merely wait on a cycle keep their dependencies: peel off
+        # those no other blocked task depends on
+        while trailing := {n for n in blocked if not self.dependents[n] & blocked}:
+            blocked -= trailing
+        cyclic = sorted(blocked)
+        if cyclic:
+            # Run the tasks of a cycle without their dependencies on each other
+            logging.warning(
+                f"[TASK_GRAPH] Dependency cycle between tasks {cyclic}, breaking it"
+            )
+            for number in cyclic:
+                self.dependencies[number] -= set(cyclic)
+                self.dependents[number] -= set(cyclic)
+            return self._topological_order()
+        return order
+
+    def _path_lengths(self):
+        lengths = {}
+        for number in reversed(self.order):
+            lengths[number] = 1 + max(
+                (lengths[dependent] for dependent in self.dependents[number]),
+                default=0,
+            )
+        return lengths
+
+    @property
+    def critical_path_length(self):
+        return max(self.path_lengths.values(), default=0)
+
+    def _ready_key(self, number):
+        rank = TASK_PRIORITY_RANKS.get(self.tasks[number]["priority"].lower(), 1)
+        return (rank, -self.path_lengths[number], number)
+
+    def _skip_dependents(self, number, results):
+        for dependent in self.dependents[number]:
+            if dependent not in results:
+                results[dependent] = {
+                    "status": "skipped",
+                    "error": f"Dependency task {number} did not complete",
+                }
+                self._skip_dependents(dependent, results)
+
+    async def run(self, run_task, max_concurrency=4):
+        """Run every task with `run_task(task, dependency_outputs)`.
+
+        Returns a dict mapping task number to
+        `{"status": "completed", "output": ...}`, or `"failed"`/`"skipped"`
+        with an `error`.
+        """
+        results = {}
+        waiting = {number: set(deps) for number, deps in self.dependencies.items()}
+        ready = [
+            self._ready_key(number) for number, deps in waiting.items() if not deps
+        ]
+        heapq.heapify(ready)
+        running = {}
+
+        try:
+            while ready or running:
+                while ready and len(running) < max_concurrency:
+                    number = heapq.heappop(ready)[2]
+                    dependency_outputs = {
+                        dep: results[dep]["output"]
+                        for dep in sorted(self.dependencies[number])
+                    }
+                    task = asyncio.create_task(
+                        run_task(self.tasks[number], dependency_outputs)
+                    )
+                    running[task] = number
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    number = running.pop(task)
+                    if task.exception() is not None:
+                        logging.error(
+                            f"[TASK_GRAPH] Task {number} failed: {task.exception()}"
+                        )
+                        results[number] = {
+                            "status": "failed",
+                            "error": str(task.exception()),
+                        }
+                        self._skip_dependents(number, results)
+                        continue
+
+                    results[number] = {"status": "completed", "output": task.result()}
+                    for dependent in self.dependents[number]:
+                        waiting[dependent].discard(number)
+                        if not waiting[dependent] and dependent not in results:
+                            heapq.heappush(ready, self._ready_key(dependent))
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return results
@@ -1,32 +1,209 @@
 import asyncio
 import logging
 import os
+import socket
+import time
 import uuid
 from datetime import datetime
 
 from agents import Runner
+from openai.types.responses import ResponseTextDeltaEvent
 
 from ai_agents.ai_agents import boss, director, head, squad_leader, worker
-from blackboard import Blackboard
+from ai_agents.schemas import PlannedTask, TaskBreakdown
+from blackboard import BLACKBOARD_DATA_FILE, Blackboard
 from config.settings import settings
+from core.agent_cache import AgentRunCache, CachedRunResult
+from core.context import demand_context
+from core.dedup import DemandDeduplicator
+from core.demand_executor import DemandExecutor
+from core.demand_state import DemandLifecycle
+from core.document_batches import DocumentBatchManager
+from core.document_converter import DocumentConverterPool
+from core.jobs import JobManager
+from core.leases import LeaseManager
+from core.retention import RetentionCompactor, RetentionPolicy
+from core.scheduler import DemandScheduler
+from core.streaming import StreamHub
+from core.task_graph import TaskGraph
+from storage import JsonlStorage, MessageArchive, SqliteStorage
 import tools.blackboard
+import tools.ocr
 
-blackboard = Blackboard()
+# Name of this process among the processes sharing the blackboard
+INSTANCE_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+if settings.blackboard_multiprocess and settings.blackboard_backend != "sqlite":
+    raise ValueError("BLACKBOARD_MULTIPROCESS requires BLACKBOARD_BACKEND=sqlite")
+
+if settings.blackboard_backend == "sqlite":
+    storage = SqliteStorage(
+        settings.blackboard_sqlite_path,
+        origin=INSTANCE_ID if settings.blackboard_multiprocess else None,
+    )
+else:
+    storage = JsonlStorage(
+        BLACKBOARD_DATA_FILE,
+        fsync_policy=settings.blackboard_fsync_policy,
+        fsync_batch_size=settings.blackboard_fsync_batch_size,
+        fsync_interval=settings.blackboard_fsync_interval,
+        compact_threshold=settings.blackboard_compact_threshold,
+        content_threshold=settings.blackboard_content_threshold,
+    )
+
+blackboard = Blackboard(
+    storage=storage,
+    max_batch=settings.blackboard_commit_batch,
+    archive=MessageArchive(
+        settings.blackboard_archive_dir,
+        segment_max_bytes=settings.blackboard_archive_segment_bytes,
+        max_segments=settings.blackboard_archive_max_segments,
+    ),
+)
 tools.blackboard.blackboard = blackboard
+retention_compactor = RetentionCompactor(
+    blackboard, RetentionPolicy.from_config(settings.blackboard_retention)
+)
+
+# Demands and submissions are claimed by message id before they run; in
+# multi-process mode the leases live next to the shared blackboard
+lease_manager = LeaseManager(
+    settings.blackboard_sqlite_path if settings.blackboard_multiprocess else ":memory:",
+    owner=INSTANCE_ID,
+    ttl=settings.lease_ttl,
+)
+
+# Worker processes are spawned on the first conversion (or warm-up)
+converter_pool = DocumentConverterPool(
+    workers=settings.ocr_workers, cache_entries=settings.ocr_cache_entries
+)
+tools.ocr.converter_pool = converter_pool
+document_batches = DocumentBatchManager(
+    converter_pool,
+    blackboard,
+    upload_dir=settings.document_upload_dir,
+    max_archive_entries=settings.document_zip_max_entries,
+    max_archive_bytes=settings.document_zip_max_bytes,
+)
 
 os.environ["OPENAI_API_KEY"] = settings.openai_api_key
 
-message_ids = {}
+agent_cache = AgentRunCache(
+    max_entries=settings.agent_cache_max_entries,
+    ttl=settings.agent_cache_ttl,
+    disk_path=settings.agent_cache_path,
+)
+
+
+stream_hub = StreamHub()
+
+
+async def run_agent(stage, agent, prompt, max_turns):
+    """Run an agent, serving repeated prompts from the cache for opted-in stages."""
+    if stage not in settings.agent_cache_stages:
+        return await execute_agent(stage, agent, prompt, max_turns)
+
+    key = agent_cache.key(agent, prompt)
+    cached = agent_cache.get(key, output_type=agent.output_type)
+    if cached is not None:
+        logging.info(f"[AGENT_CACHE_HIT] Stage '{stage}' served from cache")
+        stream_hub.publish(
+            demand_context.get().get("task_id"),
+            {
+                "event": "cached_output",
+                "stage": stage,
+                "agent": agent.name,
+                "data": str(cached),
+            },
+        )
+        return CachedRunResult(cached)
+
+    result = await execute_agent(stage, agent, prompt, max_turns)
+    agent_cache.put(key, result.final_output)
+    return result
+
 
+async def execute_agent(stage, agent, prompt, max_turns):
+    """Run an agent, streaming its events to the stream hub when anyone listens.
 
-async def process_with_boss(task):
+    Streamed runs publish text deltas, tool calls and agent handoffs as they
+    happen and checkpoint the partial output on the blackboard.
+    """
+    task_id = demand_context.get().get("task_id")
+    if not (settings.agent_streaming or stream_hub.has_listeners(task_id)):
+        return await Runner.run(agent, prompt, max_turns=max_turns)
+
+    def publish(event, data, agent_name):
+        stream_hub.publish(
+            task_id,
+            {"event": event, "stage": stage, "agent": agent_name, "data": data},
+        )
+
+    async def checkpoint(agent_name):
+        await blackboard.post(
+            sender=agent_name,
+            content="".join(partial),
+            type_="partial_output",
+            stage=stage,
+        )
+
+    loop = asyncio.get_running_loop()
+    agent_name = agent.name
+    partial = []
+    last_checkpoint = loop.time()
+
+    result = Runner.run_streamed(agent, prompt, max_turns=max_turns)
+    async for event in result.stream_events():
+        if event.type == "agent_updated_stream_event":
+            agent_name = event.new_agent.name
+            publish("agent", agent_name, agent_name)
+        elif event.type == "raw_response_event":
+            if not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            partial.append(event.data.delta)
+            publish("token", event.data.delta, agent_name)
+
+            interval = settings.stream_checkpoint_interval
+            if interval and loop.time() - last_checkpoint >= interval:
+                await checkpoint(agent_name)
+                last_checkpoint = loop.time()
+        elif event.name == "tool_called":
+            tool_call = event.item.raw_item
+            publish(
+                "tool_call",
+                {
+                    "name": getattr(tool_call, "name", None),
+                    "arguments": getattr(tool_call, "arguments", None),
+                },
+                agent_name,
+            )
+        elif event.name == "tool_output":
+            publish("tool_output", str(event.item.output), agent_name)
+
+    publish("stage_complete", None, agent_name)
+    return result
+
+
+async def process_with_boss(
+    task, task_id=None, priority="normal", department=None, deadline=None
+):
     """Process the initial task with the boss agent."""
-    task_id = str(uuid.uuid4())[:8]
+    task_id = task_id or str(uuid.uuid4())[:8]
+    # Messages posted during this run (e.g. the director's demand) inherit
+    # these fields, which correlates them with the task on the blackboard
+    demand_context.set(
+        {
+            "task_id": task_id,
+            "priority": priority,
+            "department": department,
+            "deadline": deadline,
+        }
+    )
     logging.info(f"[FLOW_START] [TaskID: {task_id}] New task received: {task}")
     logging.info(f"[BOSS_START] [TaskID: {task_id}] Boss processing task: {task}")
 
     start_time = datetime.now()
-    result = await Runner.run(boss, task, max_turns=50)
+    result = await run_agent("boss", boss, task, max_turns=50)
     end_time = datetime.now()
 
     processing_time = (end_time - start_time).total_seconds()
@@ -45,7 +222,9 @@ async def process_with_boss(task):
             )
             handoff_message = result.handoff_details.get("message", task)
             director_start_time = datetime.now()
-            director_result = await Runner.run(director, handoff_message, max_turns=50)
+            director_result = await run_agent(
+                "director", director, handoff_message, max_turns=50
+            )
             director_end_time = datetime.now()
 
             director_processing_time = (
@@ -62,53 +241,427 @@ async def process_with_boss(task):
                 f"\n\nDirector's response: {director_result.final_output}"
             )
 
-    message_ids[task] = task_id
     return result.final_output
 
 
-async def monitor_blackboard_for_demands():
-    """Monitor the blackboard for new demands and trigger head agents to discuss."""
-    logging.info("[MONITOR_START] Starting to monitor blackboard for demands...")
+job_manager = JobManager(max_concurrency=settings.boss_job_concurrency)
 
-    while True:
-        all_messages = await blackboard.get_all()
-        logging.debug(
-            f"[BLACKBOARD_CHECK] Checking blackboard. Found {len(all_messages)} messages."
+
+async def run_boss_job(submission):
+    """Run the boss flow for a submitted demand and record the outcome.
+
+    Cancellation is recorded by `cancel_demand`; a job cancelled by a shutdown
+    keeps its submission pending so it is resumed on the next start.
+    """
+    task_id = submission["task_id"]
+    try:
+        result = await process_with_boss(
+            submission["content"],
+            task_id=task_id,
+            priority=submission.get("priority"),
+            department=submission.get("department"),
+            deadline=submission.get("deadline"),
         )
+    except Exception as e:
+        await blackboard.set_type(submission["id"], "demand_failed")
+        await blackboard.post(
+            sender="system",
+            content=f"Boss flow failed: {e}",
+            type_="system_log",
+            task_id=task_id,
+        )
+        await lease_manager.release(submission["id"])
+        raise
 
-        demands = [msg for msg in all_messages if msg["type"] == "demand"]
+    await blackboard.post(
+        sender="boss", content=result, type_="boss_response", task_id=task_id
+    )
+    await blackboard.set_type(submission["id"], "demand_dispatched")
+    await lease_manager.release(submission["id"])
+    return result
 
-        if demands:
-            logging.info(
-                f"[DEMANDS_FOUND] Found {len(demands)} demand(s) on blackboard."
+
+async def submit_demand(
+    task, task_id=None, priority="normal", department=None, deadline=None
+):
+    """Persist a demand and run the boss flow for it in the background."""
+    task_id = task_id or str(uuid.uuid4())[:8]
+    message_id = await blackboard.post(
+        sender="api",
+        content=task,
+        type_="demand_submitted",
+        task_id=task_id,
+        priority=priority,
+        department=department,
+        deadline=deadline,
+    )
+    submission = await blackboard.get_by_id(message_id)
+    # The lease keeper may have resumed it already since it was posted
+    if await lease_manager.claim(message_id):
+        job_manager.submit(task_id, lambda: run_boss_job(submission))
+    return task_id
+
+
+async def resume_submitted_demands():
+    """Restart background boss jobs for submissions nobody is running.
+
+    Covers submissions interrupted by a shutdown and, in multi-process mode,
+    those whose process died and let its lease expire.
+    """
+    submissions = await blackboard.get_by_type("demand_submitted")
+    for submission in submissions:
+        if not await lease_manager.claim(submission["id"]):
+            continue
+        logging.info(
+            f"[JOB_RESUME] [TaskID: {submission['task_id']}] Resuming submitted demand"
+        )
+        job_manager.submit(submission["task_id"], lambda s=submission: run_boss_job(s))
+
+
+async def cancel_demand(task_id):
+    """Cancel the boss job and any queued or running pipeline of a task."""
+    cancelled = job_manager.cancel(task_id)
+    cancelled = demand_executor.cancel(task_id) > 0 or cancelled
+
+    # Keep cancelled demands from being picked up again after a restart; other
+    # processes running them stop when they see the type change
+    for msg in await blackboard.get_by_task(task_id):
+        if msg["type"] in ("demand", "demand_submitted"):
+            await blackboard.set_type(msg["id"], "demand_cancelled")
+            await lease_manager.release(msg["id"])
+            cancelled = True
+
+    if cancelled:
+        await blackboard.post(
+            sender="system",
+            content=f"Demand {task_id} cancelled",
+            type_="system_log",
+            task_id=task_id,
+        )
+    return cancelled
+
+
+demand_deduplicator = DemandDeduplicator(
+    threshold=settings.demand_dedup_threshold, window=settings.demand_dedup_window
+)
+
+# Pipeline outputs copied onto the duplicates of a demand
+FAN_OUT_TYPES = ("structured_plan", "task_breakdown", "task_execution", "task_results")
+
+
+async def fan_out_result(primary, duplicates):
+    """Give duplicate demands the pipeline output of their primary demand."""
+    primary_task = primary.get("task_id")
+    outputs = []
+    if primary_task:
+        outputs = [
+            msg
+            for msg in await blackboard.get_by_task(primary_task)
+            if msg["type"] in FAN_OUT_TYPES
+        ]
+
+    for duplicate in duplicates:
+        duplicate_task = duplicate.get("task_id")
+        if duplicate_task and duplicate_task != primary_task:
+            for msg in outputs:
+                # Structured fields (e.g. the typed tasks) are copied as well
+                fields = {
+                    key: value
+                    for key, value in msg.items()
+                    if key not in ("id", "sender", "content", "type", "timestamp")
+                }
+                fields.update(task_id=duplicate_task, duplicate_of=primary_task)
+                await blackboard.post(
+                    sender=msg["sender"],
+                    content=msg["content"],
+                    type_=msg["type"],
+                    **fields,
+                )
+        await DemandLifecycle(blackboard, duplicate).advance(
+            "done", type="demand_processed"
+        )
+        await lease_manager.release(duplicate["id"])
+        logging.info(
+            f"[DEMAND_DEDUP_FANOUT] [TaskID: {duplicate_task}] Reused result of task {primary_task}"
+        )
+
+
+async def dispatch_demand(demand):
+    """Queue a demand, or coalesce it onto a similar demand seen recently."""
+    if DemandLifecycle(blackboard, demand).state != "queued":
+        # Resumed demands already paid for their finished stages: let them finish
+        demand_executor.submit(demand)
+        return
+
+    primary_id = demand_deduplicator.match(demand["content"])
+    if primary_id is None:
+        demand_deduplicator.register(demand)
+        demand_executor.submit(demand)
+        return
+
+    logging.info(
+        f"[DEMAND_DEDUP] [MessageID: {demand['id']}] Duplicate of demand {primary_id}"
+    )
+    if demand_deduplicator.link(primary_id, demand):
+        # The primary already finished within the window: reuse its result now
+        await fan_out_result(demand_deduplicator.primary(primary_id), [demand])
+
+
+async def run_stage(lifecycle, checkpoint, state, run):
+    """Return the checkpointed output message of a step, running it if needed.
+
+    `run` posts the step's output and returns the message id, which becomes
+    the checkpoint; a resumed demand skips steps that already have one.
+    """
+    message = await lifecycle.restore(checkpoint)
+    if message is not None:
+        logging.info(
+            f"[DEMAND_RESUME] [MessageID: {lifecycle.demand['id']}] Reusing checkpoint '{checkpoint}'"
+        )
+        return message
+
+    await lifecycle.advance(state)
+    await lifecycle.checkpoint(checkpoint, await run())
+    return await lifecycle.restore(checkpoint)
+
+
+async def process_demand(demand):
+    """Run the pipeline for a demand, resuming from its last checkpoint.
+
+    The demand moves through queued -> head -> squad_leader -> worker -> done
+    (or failed), persisted on its blackboard message along with the id of
+    each stage's output, so a demand interrupted by a crash or shutdown only
+    re-runs the stage it was in.
+    """
+    demand_id = str(uuid.uuid4())[:8]
+    demand_content = demand["content"]
+    lifecycle = DemandLifecycle(blackboard, demand)
+    logging.info(
+        f"[DEMAND_PROCESSING] [DemandID: {demand_id}] [TaskID: {demand.get('task_id')}] "
+        f"Processing demand ({lifecycle.state}): {demand_content[:50]}..."
+    )
+
+    # Everything the pipeline posts for this demand is correlated with its task
+    demand_context.set(
+        {
+            "task_id": demand.get("task_id"),
+            "priority": demand.get("priority"),
+            "department": demand.get("department"),
+        }
+    )
+
+    try:
+        plan = await run_stage(
+            lifecycle,
+            "structured_plan",
+            "head",
+            lambda: heads_discussion(demand_content, demand_id),
+        )
+        plan_id = plan["id"]
+        breakdown = await run_stage(
+            lifecycle,
+            "task_breakdown",
+            "squad_leader",
+            lambda: process_with_squad_leader(plan["content"], plan_id, demand_id),
+        )
+        if breakdown.get("tasks"):
+            await run_stage(
+                lifecycle,
+                "task_results",
+                "worker",
+                lambda: execute_tasks(breakdown["tasks"], plan_id, lifecycle),
             )
-            for demand in demands:
-                demand_id = str(uuid.uuid4())[:8]
-                demand_content = demand["content"]
-                logging.info(
-                    f"[DEMAND_PROCESSING] [DemandID: {demand_id}] Processing demand: {demand_content[:50]}..."
+    except (Exception, asyncio.CancelledError) as e:
+        # Duplicates waiting on this demand have to run on their own now
+        for duplicate in demand_deduplicator.release(demand["id"]):
+            demand_executor.submit(duplicate)
+        # A cancelled pipeline keeps its state and resumes on the next start
+        if isinstance(e, Exception):
+            if await lifecycle.fail(e, settings.demand_max_attempts):
+                logging.warning(
+                    f"[DEMAND_RETRY] [DemandID: {demand_id}] Attempt {lifecycle.attempts} failed, "
+                    f"retrying from stage '{lifecycle.state}'"
                 )
+                demand_executor.submit(lifecycle.demand)
+            else:
+                await blackboard.post(
+                    sender="system",
+                    content=f"Demand {demand_id} failed after {lifecycle.attempts} attempts: {e}",
+                    type_="system_log",
+                )
+                await lease_manager.release(demand["id"])
+        raise
 
-                await heads_discussion(demand_content, demand_id)
+    old_type = demand["type"]
+    await lifecycle.advance("done", type="demand_processed")
+    await lease_manager.release(demand["id"])
+    logging.info(
+        f"[DEMAND_MARKED] [DemandID: {demand_id}] Changed type from '{old_type}' to 'demand_processed'"
+    )
+    await blackboard.post(
+        sender="system",
+        content=f"Demand {demand_id} marked as processed: {demand_content[:30]}...",
+        type_="system_log",
+    )
+
+    duplicates = demand_deduplicator.complete(demand["id"])
+    if duplicates:
+        await fan_out_result(demand, duplicates)
+
+
+demand_executor = DemandExecutor(
+    process_demand,
+    workers=settings.demand_workers,
+    department_limits=settings.demand_department_limits,
+    priority_limits=settings.demand_priority_limits,
+    scheduler=DemandScheduler(
+        aging_interval=settings.demand_aging_interval,
+        deadline_horizon=settings.demand_deadline_horizon,
+        max_backlog=settings.demand_max_backlog,
+    ),
+)
+
+
+async def claim_demand(demand):
+    """Dispatch a demand unless this or another live process already has it.
+
+    In multi-process mode a process only claims demands it can start right
+    away; the rest stay unclaimed for processes with free workers.
+    """
+    if lease_manager.holds(demand["id"]):
+        return
+    if settings.blackboard_multiprocess and demand_executor.free_slots == 0:
+        return
+    if await lease_manager.claim(demand["id"]):
+        await dispatch_demand(demand)
+
+
+async def claim_backlog():
+    """Claim waiting demands nobody has taken, up to the free workers."""
+    for demand in await blackboard.get_by_type("demand"):
+        await claim_demand(demand)
 
-                for msg in all_messages:
-                    if msg == demand:
-                        old_type = msg["type"]
-                        msg["type"] = "demand_processed"
-                        logging.info(
-                            f"[DEMAND_MARKED] [DemandID: {demand_id}] Changed type from '{old_type}' to 'demand_processed'"
-                        )
-                        await blackboard.post(
-                            sender="system",
-                            content=f"Demand {demand_id} marked as processed: {demand_content[:30]}...",
-                            type_="system_log",
-                        )
 
-        await asyncio.sleep(5)
+async def stop_cancelled(message):
+    """Stop local work for a demand cancelled here or by another process."""
+    task_id = message.get("task_id")
+    if task_id is not None:
+        job_manager.cancel(task_id)
+        demand_executor.cancel(task_id)
+    await lease_manager.release(message["id"])
+
+
+async def stop_lost_work(keys):
+    """Stop local work whose lease lapsed and was taken over by another process.
+
+    The new owner runs the demand (or boss job) from its last checkpoint, so
+    carrying on here would run it twice.
+    """
+    for key in keys:
+        if demand_executor.abandon(key):
+            continue
+        message = await blackboard.get_by_id(key)
+        if message is not None and message["type"] == "demand_submitted":
+            job_manager.cancel(message["task_id"])
+
+
+async def maintain_leases():
+    """Renew this process's leases and take over work whose owner died."""
+    interval = settings.lease_ttl / 3
+    next_heartbeat = time.monotonic() + interval
+    while True:
+        # Wake up early when a worker frees up, to pull the next waiting demand
+        try:
+            await asyncio.wait_for(
+                demand_executor.slot_freed.wait(),
+                max(0.0, next_heartbeat - time.monotonic()),
+            )
+        except asyncio.TimeoutError:
+            pass
+        demand_executor.slot_freed.clear()
+
+        try:
+            if time.monotonic() >= next_heartbeat:
+                next_heartbeat = time.monotonic() + interval
+                await stop_lost_work(await lease_manager.heartbeat())
+                await resume_submitted_demands()
+            await claim_backlog()
+        except Exception as e:
+            logging.error(f"[LEASE_ERROR] Error maintaining leases: {e}")
+
+
+async def enforce_retention():
+    """Archive expired blackboard messages every retention interval.
+
+    Only the process holding the retention lease runs the compactor, so a
+    shared blackboard is not compacted by several processes at once.
+    """
+    while True:
+        await asyncio.sleep(settings.blackboard_retention_interval)
+        try:
+            lease = "blackboard-retention"
+            if lease_manager.holds(lease) or await lease_manager.claim(lease):
+                await retention_compactor.run_once()
+        except Exception as e:
+            logging.error(f"[RETENTION_ERROR] Error enforcing retention: {e}")
+
+
+async def monitor_blackboard_for_demands():
+    """Monitor the blackboard for new demands and hand them to the executor.
+
+    Demands are claimed before they are queued, so with several processes
+    sharing the blackboard each demand runs in exactly one of them.
+    """
+    logging.info("[MONITOR_START] Starting to monitor blackboard for demands...")
+    if settings.blackboard_multiprocess:
+        blackboard.follow(settings.blackboard_follow_interval)
+    await demand_executor.start()
+    lease_keeper = asyncio.create_task(maintain_leases())
+    compactor = (
+        asyncio.create_task(enforce_retention())
+        if settings.blackboard_retention_interval
+        else None
+    )
+
+    try:
+        # Subscribe before reading the backlog so nothing posted in between is missed
+        async with blackboard.subscribe(
+            types=["demand", "demand_cancelled"]
+        ) as new_demands:
+            pending = await blackboard.get_by_type("demand")
+            if pending:
+                logging.info(
+                    f"[DEMANDS_FOUND] Found {len(pending)} pending demand(s) on blackboard."
+                )
+            queued = set()
+            for demand in pending:
+                queued.add(demand["id"])
+                await claim_demand(demand)
+
+            async for demand in new_demands:
+                if demand["type"] == "demand_cancelled":
+                    await stop_cancelled(demand)
+                    continue
+                # Already queued if it was also part of the backlog
+                if demand["id"] in queued:
+                    queued.discard(demand["id"])
+                    continue
+                logging.info(
+                    f"[DEMANDS_FOUND] [MessageID: {demand['id']}] New demand posted."
+                )
+                await claim_demand(demand)
+    finally:
+        lease_keeper.cancel()
+        if compactor is not None:
+            compactor.cancel()
+        await demand_executor.stop()
 
 
 async def heads_discussion(demand_content, demand_id):
-    """Use the head agent to discuss and structure the demand."""
+    """Use the head agent to discuss and structure the demand.
+
+    Returns the id of the structured plan message.
+    """
     logging.info(
         f"[HEAD_START] [DemandID: {demand_id}] Head starting to process demand"
     )
@@ -134,7 +687,7 @@ async def heads_discussion(demand_content, demand_id):
     )
     start_time = datetime.now()
 
-    result = await Runner.run(head, discussion_prompt, max_turns=20)
+    result = await run_agent("head", head, discussion_prompt, max_turns=20)
     structured_plan = result.final_output
 
     end_time = datetime.now()
@@ -143,8 +696,7 @@ async def heads_discussion(demand_content, demand_id):
         f"[HEAD_COMPLETE] [DemandID: {demand_id}] Head finished analysis in {processing_time:.2f} seconds"
     )
 
-    plan_id = str(uuid.uuid4())[:8]
-    await blackboard.post(
+    plan_id = await blackboard.post(
         sender="head", content=structured_plan, type_="structured_plan"
     )
 
@@ -157,13 +709,14 @@ async def heads_discussion(demand_content, demand_id):
         f"[PLAN_READY] [PlanID: {plan_id}] Plan is ready for squad leaders to implement"
     )
 
-    await process_with_squad_leader(structured_plan, plan_id, demand_id)
-
-    return structured_plan
+    return plan_id
 
 
 async def process_with_squad_leader(plan, plan_id, demand_id):
-    """Process the structured plan with the squad leader."""
+    """Break the structured plan down into tasks with the squad leader.
+
+    Returns the id of the task breakdown message.
+    """
     logging.info(
         f"[SQUAD_LEADER_START] [PlanID: {plan_id}] Squad leader processing plan"
     )
@@ -179,57 +732,134 @@ async def process_with_squad_leader(plan, plan_id, demand_id):
     2. Priority (High/Medium/Low)
     3. Required skills
     4. Estimated time to complete
-    5. Dependencies (if any)
+    5. Dependencies (the numbers of the tasks that must finish first, if any)
     
     Organize these tasks into a clear, structured breakdown.
     """
 
     start_time = datetime.now()
-    result = await Runner.run(squad_leader, breakdown_prompt, max_turns=20)
+    result = await run_agent(
+        "squad_leader", squad_leader, breakdown_prompt, max_turns=20
+    )
     task_breakdown = result.final_output
     end_time = datetime.now()
+    if not isinstance(task_breakdown, TaskBreakdown):
+        raise TypeError(
+            f"Squad leader returned {type(task_breakdown).__name__}, not a TaskBreakdown"
+        )
 
     processing_time = (end_time - start_time).total_seconds()
     logging.info(
         f"[SQUAD_LEADER_COMPLETE] [PlanID: {plan_id}] Completed in {processing_time:.2f} seconds"
     )
 
+    # The typed tasks are stored alongside the text so nothing re-parses it
+    tasks = [task.model_dump() for task in task_breakdown.tasks]
     message_id = await blackboard.post(
-        sender="squad_leader", content=task_breakdown, type_="task_breakdown"
+        sender="squad_leader",
+        content=task_breakdown.to_text(),
+        type_="task_breakdown",
+        tasks=tasks,
     )
 
     logging.info(
-        f"[TASKS_POSTED] [PlanID: {plan_id}] [MessageID: {message_id}] Tasks posted to blackboard"
+        f"[TASKS_POSTED] [PlanID: {plan_id}] [MessageID: {message_id}] {len(tasks)} tasks posted to blackboard"
+    )
+    logging.info(
+        f"[TASKS_SUMMARY] [PlanID: {plan_id}] Summary: {task_breakdown.summary}"
     )
-    logging.info(f"[TASKS_SUMMARY] [PlanID: {plan_id}] Summary: {task_breakdown}")
 
-    task_lines = task_breakdown.split("\n")
-    high_priority_tasks = [
-        line
-        for line in task_lines
-        if "Priority: High" in line or "Priority:High" in line
-    ]
+    if not tasks:
+        logging.warning(f"[TASKS_EMPTY] [PlanID: {plan_id}] The breakdown has no tasks")
 
-    if high_priority_tasks:
-        task_description = high_priority_tasks[0]
-        task_id = str(uuid.uuid4())[:8]
+    return message_id
 
-        await process_with_worker(task_description, task_id, plan_id)
 
-    return task_breakdown
+async def execute_tasks(tasks, plan_id, lifecycle):
+    """Run the breakdown's tasks through workers following their dependencies.
 
+    Each finished task is checkpointed on the demand's lifecycle, so a resumed
+    demand only runs the tasks that had not finished. Returns the id of the
+    aggregated `task_results` message.
+    """
+    graph = TaskGraph(tasks)
+    logging.info(
+        f"[TASKS_FANOUT] [PlanID: {plan_id}] Running {len(tasks)} tasks, "
+        f"critical path of {graph.critical_path_length}"
+    )
 
-async def process_with_worker(task, task_id, plan_id):
-    """Assign a task to a worker and get execution results."""
+    async def run_task(task, dependency_outputs):
+        checkpoint = f"task:{task['number']}"
+        message = await lifecycle.restore(checkpoint)
+        if message is None:
+            task_id = str(uuid.uuid4())[:8]
+            message_id = await process_with_worker(
+                PlannedTask.model_validate(task).to_text(),
+                task_id,
+                plan_id,
+                dependency_outputs,
+            )
+            await lifecycle.checkpoint(checkpoint, message_id)
+            message = await blackboard.get_by_id(message_id)
+        return message["content"]
+
+    start_time = datetime.now()
+    results = await graph.run(run_task, max_concurrency=settings.worker_concurrency)
+    processing_time = (datetime.now() - start_time).total_seconds()
+
+    sections = []
+    summary = []
+    for number in sorted(graph.tasks):
+        task, outcome = graph.tasks[number], results[number]
+        summary.append(
+            {
+                "number": number,
+                "title": task["title"],
+                "priority": task["priority"],
+                "status": outcome["status"],
+            }
+        )
+        body = outcome.get("output") or outcome.get("error")
+        sections.append(
+            f"## Task {number}: {task['title']} [{outcome['status']}]\n\n{body}"
+        )
+
+    message_id = await blackboard.post(
+        sender="squad_leader",
+        content="\n\n".join(sections),
+        type_="task_results",
+        tasks=summary,
+    )
+    completed = sum(outcome["status"] == "completed" for outcome in results.values())
+    logging.info(
+        f"[TASKS_COMPLETE] [PlanID: {plan_id}] [MessageID: {message_id}] "
+        f"{completed}/{len(tasks)} tasks completed in {processing_time:.2f} seconds"
+    )
+    return message_id
+
+
+async def process_with_worker(task, task_id, plan_id, dependency_outputs=None):
+    """Assign a task to a worker; returns the id of its execution report message."""
     logging.info(
         f"[WORKER_START] [TaskID: {task_id}] Worker processing task from plan {plan_id}"
     )
 
+    dependency_context = ""
+    if dependency_outputs:
+        results = "\n\n".join(
+            f"Task {number}:\n{output}" for number, output in dependency_outputs.items()
+        )
+        dependency_context = f"""
+    This task builds on the results of the tasks it depends on:
+    
+    {results}
+    """
+
     execution_prompt = f"""
     You have been assigned the following task:
     
     {task}
-    
+    {dependency_context}
     Please execute this task and provide:
     1. A detailed execution report
     2. Any challenges encountered
@@ -238,7 +868,7 @@ async def process_with_worker(task, task_id, plan_id):
     """
 
     start_time = datetime.now()
-    result = await Runner.run(worker, execution_prompt, max_turns=15)
+    result = await run_agent("worker", worker, execution_prompt, max_turns=15)
     execution_result = result.final_output
     end_time = datetime.now()
 
@@ -256,32 +886,41 @@ async def process_with_worker(task, task_id, plan_id):
     )
     logging.info(f"[EXECUTION_SUMMARY] [TaskID: {task_id}] Summary: {execution_result}")
 
-    return execution_result
+    return message_id
 
 
-async def view_blackboard():
-    """Display the current blackboard messages in a readable format."""
-    messages = await blackboard.get_all()
+async def view_blackboard(page_size=20):
+    """Display the blackboard messages in a readable format, one page at a time."""
+    total = len(blackboard.storage)
     print("\n=== BLACKBOARD CONTENTS ===")
-    print(f"Total messages: {len(messages)}\n")
-
-    for msg in messages:
-        print(f"Message ID: {msg['id']}")
-        print(f"Type: {msg['type']}")
-        print(f"Sender: {msg['sender']}")
-        print(f"Timestamp: {msg['timestamp']}")
-        print("Content:")
-        print(f"{msg['content']}")
-        print("-" * 50)
+    print(f"Total messages: {total}\n")
+
+    cursor = None
+    while True:
+        page = await blackboard.get_page(cursor=cursor, limit=page_size)
+        for msg in page["messages"]:
+            print(f"Message ID: {msg['id']}")
+            print(f"Type: {msg['type']}")
+            print(f"Sender: {msg['sender']}")
+            print(f"Timestamp: {msg['timestamp']}")
+            print("Content:")
+            print(f"{msg['content']}")
+            print("-" * 50)
+
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        answer = await asyncio.to_thread(
+            input, "Press Enter for the next page or 'q' to stop: "
+        )
+        if answer.strip().lower() == "q":
+            break
     print("===========================\n")
 
 
 async def get_process_status(task_id):
     """Get the status of a specific task process."""
-    all_messages = await blackboard.get_all()
-    task_messages = [
-        msg for msg in all_messages if task_id in str(msg.get("content", ""))
-    ]
+    task_messages = await blackboard.get_by_task(task_id)
     return {
         "task_id": task_id,
         "total_messages": len(task_messages),
@@ -291,6 +930,24 @@ async def get_process_status(task_id):
     }
 
 
+async def print_agent_stream():
+    """Echo live agent output to the terminal as it arrives."""
+    with stream_hub.subscribe() as events:
+        speaker = None
+        async for event in events:
+            if event["event"] == "token":
+                if speaker != (event["task_id"], event["agent"]):
+                    speaker = (event["task_id"], event["agent"])
+                    print(f"\n[{event['agent']}] ", end="")
+                print(event["data"], end="", flush=True)
+            elif event["event"] == "tool_call":
+                print(f"\n[{event['agent']}] -> {event['data']['name']}", flush=True)
+                speaker = None
+            elif event["event"] == "stage_complete":
+                print(flush=True)
+                speaker = None
+
+
 async def main():
     logging.info("[SYSTEM_START] Multi-agent blackboard system starting up")
 
@@ -303,6 +960,7 @@ async def main():
 
     logging.info("[MONITOR_LAUNCH] Starting blackboard monitoring service")
     blackboard_monitor = asyncio.create_task(monitor_blackboard_for_demands())
+    stream_printer = asyncio.create_task(print_agent_stream())
 
     try:
         task = input("Enter a task: ")
@@ -332,6 +990,7 @@ async def main():
     except Exception as e:
         logging.error(f"[ERROR] Unexpected error occurred: {str(e)}", exc_info=True)
     finally:
+        stream_printer.cancel()
         logging.info("[SYSTEM_SHUTDOWN] System shutting down")
 
 
@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from main import blackboard
+
+# Initialize router
+router = APIRouter(prefix="/api/v1/blackboard", tags=["blackboard"])
+
+
+class BlackboardPage(BaseModel):
+    """Response model for a page of blackboard messages."""
+
+    messages: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+@router.get("", response_model=BlackboardPage)
+async def list_messages(
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page; omit for the first page"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Messages per page"),
+    type: Optional[str] = Query(None, description="Only messages of this type"),
+    sender: Optional[str] = Query(None, description="Only messages from this sender"),
+    task_id: Optional[str] = Query(None, description="Only messages of this task"),
+):
+    """
+    Read the blackboard page by page, in posting order.
+
+    Follow `next_cursor` until it is null to walk the whole board without
+    loading it in a single response.
+    """
+    filters = {
+        field: value
+        for field, value in (("type", type), ("sender", sender), ("task_id", task_id))
+        if value is not None
+    }
+    try:
+        page = await blackboard.get_page(cursor=cursor, limit=limit, filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(
+            f"[API_ERROR] Error reading blackboard page: {str(e)}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Error reading blackboard: {str(e)}"
+        )
+
+    return BlackboardPage(**page)
+
+
+@router.get("/archive")
+async def list_archived_messages(
+    type: Optional[str] = Query(None, description="Only messages of this type"),
+    sender: Optional[str] = Query(None, description="Only messages from this sender"),
+    task_id: Optional[str] = Query(None, description="Only messages of this task"),
+    since: Optional[str] = Query(None, description="Posted at or after (ISO time)"),
+    until: Optional[str] = Query(None, description="Posted at or before (ISO time)"),
+    limit: int = Query(500, ge=1, le=5000, description="Most messages returned"),
+):
+    """
+    Search messages moved off the board by the retention policies.
+
+    The archive is compressed on disk and scanned on request, so narrow the
+    search with `task_id` or a time range where possible.
+    """
+    filters = {
+        field: value
+        for field, value in (("type", type), ("sender", sender), ("task_id", task_id))
+        if value is not None
+    }
+    try:
+        messages = await blackboard.get_archived(
+            filters=filters, since=since, until=until, limit=limit
+        )
+    except Exception as e:
+        logging.error(
+            f"[API_ERROR] Error reading blackboard archive: {str(e)}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Error reading blackboard archive: {str(e)}"
+        )
+
+    return {"messages": messages}
@@ -1,11 +1,24 @@
 import asyncio
+import json
 import logging
+import uuid
+from datetime import datetime
 from typing import Optional, List, Dict
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, WebSocket
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-
-from main import process_with_boss, message_ids, blackboard
+from sse_starlette.sse import EventSourceResponse
+
+from main import (
+    process_with_boss,
+    submit_demand,
+    cancel_demand,
+    blackboard,
+    demand_executor,
+    job_manager,
+    stream_hub,
+)
 
 # Initialize router
 router = APIRouter(prefix="/api/v1/demands", tags=["demands"])
@@ -17,6 +30,7 @@ class DemandRequest(BaseModel):
     demand: str
     priority: Optional[str] = "normal"
     department: Optional[str] = None
+    deadline: Optional[datetime] = None
 
 
 class ProcessingStep(BaseModel):
@@ -35,97 +49,165 @@ class DemandResponse(BaseModel):
     message: str
     status: str
     processing_complete: bool = False
+    processing_status: Optional[str] = None
     processing_steps: Optional[List[ProcessingStep]] = None
     last_update: Optional[str] = None
 
 
-def _get_demand_text_by_task_id(task_id: str) -> Optional[str]:
-    """Retrieve the original demand text given a task_id."""
-    for demand_text, t_id in message_ids.items():
-        if t_id == task_id:
-            return demand_text
-    return None
+# Blackboard message types that represent a processing step: (agent, action, status)
+STEP_ACTIONS = {
+    "demand_submitted": ("api", "submitted_demand", "complete"),
+    "demand_dispatched": ("api", "submitted_demand", "complete"),
+    "boss_response": ("boss", "responded", "complete"),
+    "demand": ("director", "posted_demand", "complete"),
+    "structured_plan": ("head", "created_plan", "complete"),
+    "task_breakdown": ("squad_leader", "broke_down_tasks", "complete"),
+    "task_execution": ("worker", "executed_task", "complete"),
+    "task_results": ("squad_leader", "aggregated_results", "complete"),
+    "demand_processed": ("system", "completed_processing", "complete"),
+    "demand_cancelled": ("system", "cancelled_processing", "cancelled"),
+    "demand_failed": ("system", "failed_processing", "failed"),
+}
+
+# Message types after which a demand will not make any more progress, with
+# the status they end it in
+TERMINAL_TYPES = {
+    "demand_processed": "completed",
+    "demand_cancelled": "cancelled",
+    "demand_failed": "failed",
+}
+
+
+def _demand_status(task_messages: List[Dict]) -> str:
+    """Outcome of a demand from its task's messages ("in_progress" until it ends)."""
+    types = {msg["type"] for msg in task_messages}
+    for type_, status in TERMINAL_TYPES.items():
+        if type_ in types:
+            return status
+    return "in_progress"
+
+
+def _message_to_step(msg: Dict) -> Optional[ProcessingStep]:
+    """Convert a blackboard message into a processing step, if it is one."""
+    if msg["type"] not in STEP_ACTIONS:
+        return None
+    agent, action, status = STEP_ACTIONS[msg["type"]]
+    return ProcessingStep(
+        agent=agent, action=action, timestamp=msg["timestamp"], status=status
+    )
 
 
 async def get_processing_details(task_id: str) -> Dict:
-    """Get detailed processing information for a demand by scanning messages containing the original demand text."""
-
-    demand_text = _get_demand_text_by_task_id(task_id)
+    """Get detailed processing information for a demand from its task's messages."""
 
-    if demand_text is None:
-        # Fallback to original behaviour if mapping not found
-        demand_text = task_id
+    task_messages = await blackboard.get_by_task(task_id)
 
-    messages = await blackboard.get_all()
-    task_messages = [
-        msg for msg in messages if demand_text in str(msg.get("content", ""))
+    steps = [
+        step
+        for step in (_message_to_step(msg) for msg in task_messages)
+        if step is not None
     ]
 
-    steps = []
-    for msg in task_messages:
-        # Convert known message types to processing steps
-        if msg["type"] == "demand":
-            steps.append(
-                ProcessingStep(
-                    agent="director",
-                    action="posted_demand",
-                    timestamp=msg["timestamp"],
-                    status="complete",
-                )
-            )
-        elif msg["type"] == "structured_plan":
-            steps.append(
-                ProcessingStep(
-                    agent="head",
-                    action="created_plan",
-                    timestamp=msg["timestamp"],
-                    status="complete",
-                )
-            )
-        elif msg["type"] == "task_breakdown":
-            steps.append(
-                ProcessingStep(
-                    agent="squad_leader",
-                    action="broke_down_tasks",
-                    timestamp=msg["timestamp"],
-                    status="complete",
-                )
-            )
-        elif msg["type"] == "demand_processed":
-            steps.append(
-                ProcessingStep(
-                    agent="system",
-                    action="completed_processing",
-                    timestamp=msg["timestamp"],
-                    status="complete",
-                )
-            )
-
-    is_complete = any(msg["type"] == "demand_processed" for msg in task_messages)
+    status = _demand_status(task_messages)
     last_update = (
         max(msg["timestamp"] for msg in task_messages) if task_messages else None
     )
 
-    return {"steps": steps, "is_complete": is_complete, "last_update": last_update}
+    return {
+        "steps": steps,
+        "status": status,
+        "is_complete": status == "completed",
+        "last_update": last_update,
+    }
+
+
+async def stream_processing_steps(task_id: str):
+    """
+    Yield the processing steps of a demand as they are posted to the blackboard.
+    Steps already on the board are replayed first; the stream ends once the
+    demand is complete, cancelled or failed.
+    """
+    async with blackboard.subscribe(
+        types=list(STEP_ACTIONS), task_ids=[task_id]
+    ) as updates:
+        seen = set()
+        for msg in await blackboard.get_by_task(task_id):
+            step = _message_to_step(msg)
+            if step is not None:
+                seen.add((msg["id"], msg["type"]))
+                yield step
+            if msg["type"] in TERMINAL_TYPES:
+                return
+
+        async for msg in updates:
+            # Anything posted between subscribing and reading the backlog
+            if (msg["id"], msg["type"]) in seen:
+                continue
+            yield _message_to_step(msg)
+            if msg["type"] in TERMINAL_TYPES:
+                return
 
 
 async def wait_for_demand_completion(task_id: str, timeout: int = 60) -> Dict:
     """
-    Wait for a demand to be fully processed.
-    Returns processing details and completion status.
+    Wait for a demand to finish: processed, cancelled or failed.
+    Returns processing details; `status` stays "in_progress" on timeout.
     """
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
 
-    while (asyncio.get_event_loop().time() - start_time) < timeout:
+    # Only the demand's terminal messages can change the outcome
+    async with blackboard.subscribe(
+        types=list(TERMINAL_TYPES), task_ids=[task_id]
+    ) as outcomes:
         details = await get_processing_details(task_id)
 
-        if details["is_complete"]:
-            return details
+        while details["status"] == "in_progress":
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await outcomes.get(timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            details = await get_processing_details(task_id)
+
+    return details
 
-        await asyncio.sleep(1)  # Check every second
 
-    # If we timed out, return current state
-    return await get_processing_details(task_id)
+async def demand_exists(task_id: str) -> bool:
+    """Whether the task has messages on the board or a background job."""
+    return bool(await blackboard.get_by_task(task_id)) or (
+        job_manager.get(task_id) is not None
+    )
+
+
+async def get_task_overview(task_id: str, task_messages: List[Dict]) -> List[Dict]:
+    """Planned tasks of a demand, each with its execution status once known."""
+    tasks = await blackboard.get_tasks(task_id)
+
+    outcomes = {}
+    for msg in task_messages:
+        if msg["type"] == "task_results":
+            outcomes = {task["number"]: task["status"] for task in msg["tasks"]}
+
+    return [
+        {**task, "status": outcomes.get(task["number"], "pending")} for task in tasks
+    ]
+
+
+def check_admission():
+    """Admission control: shed load instead of growing the backlog forever."""
+    if demand_executor.saturated:
+        retry_after = demand_executor.retry_after()
+        logging.warning(
+            f"[API_REJECTED] Demand backlog full, retry after {retry_after}s"
+        )
+        raise HTTPException(
+            status_code=429,
+            detail="Demand backlog is full, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
 
 
 @router.post("", response_model=DemandResponse)
@@ -134,21 +216,53 @@ async def create_demand(
     wait_complete: bool = Query(
         False, description="Whether to wait for complete processing before returning"
     ),
+    background: bool = Query(
+        False,
+        description="Return 202 Accepted right away and process the demand in the background",
+    ),
 ):
     """
     Submit a new demand to the system.
 
     The demand will be processed by the boss agent and delegated through the hierarchy.
     If wait_complete is True, will wait for full processing before returning.
+    If background is True, the demand is persisted and 202 Accepted is returned
+    immediately with its task_id; follow it through the status endpoint.
     """
     try:
         logging.info(f"[API_REQUEST] Received new demand: {request.demand}")
 
-        # Process the demand through the boss agent
-        result = await process_with_boss(request.demand)
+        check_admission()
 
-        # Get task_id from message_ids dictionary
-        task_id = message_ids.get(request.demand, "unknown")
+        task_id = str(uuid.uuid4())[:8]
+        deadline = request.deadline.isoformat() if request.deadline else None
+
+        if background:
+            await submit_demand(
+                request.demand,
+                task_id=task_id,
+                priority=request.priority,
+                department=request.department,
+                deadline=deadline,
+            )
+            logging.info(f"[API_ACCEPTED] Demand accepted with task ID: {task_id}")
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "task_id": task_id,
+                    "message": "Demand accepted for background processing",
+                    "status": "accepted",
+                },
+            )
+
+        # Process the demand through the boss agent
+        result = await process_with_boss(
+            request.demand,
+            task_id=task_id,
+            priority=request.priority,
+            department=request.department,
+            deadline=deadline,
+        )
 
         logging.info(f"[API_SUCCESS] Processed demand with task ID: {task_id}")
 
@@ -158,8 +272,9 @@ async def create_demand(
                 f"[API_WAITING] Waiting for complete processing of task {task_id}"
             )
             details = await wait_for_demand_completion(task_id)
+            outcome = details["status"]
             logging.info(
-                f"[API_WAIT_COMPLETE] Task {task_id} processing {'completed' if details['is_complete'] else 'timed out'}"
+                f"[API_WAIT_COMPLETE] Task {task_id} processing {'timed out' if outcome == 'in_progress' else outcome}"
             )
         else:
             details = await get_processing_details(task_id)
@@ -169,10 +284,13 @@ async def create_demand(
             message=result,
             status="success",
             processing_complete=details["is_complete"],
+            processing_status=details["status"],
             processing_steps=details["steps"],
             last_update=details["last_update"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"[API_ERROR] Error processing demand: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -180,37 +298,125 @@ async def create_demand(
         )
 
 
+@router.post("/stream")
+async def stream_demand(request: DemandRequest):
+    """
+    Submit a demand and stream the agents' output as Server-Sent Events.
+
+    Sends an `accepted` event with the task_id, then `token`, `tool_call`,
+    `tool_output`, `agent`, `cached_output` and `stage_complete` events from
+    every stage as they happen, and the boss answer as `boss_response`. The
+    stream ends with `complete` once the demand's pipeline finishes, right
+    after `boss_response` if no demand was posted, or with `error`.
+    """
+    check_admission()
+
+    task_id = str(uuid.uuid4())[:8]
+    deadline = request.deadline.isoformat() if request.deadline else None
+    logging.info(f"[API_STREAM] Streaming new demand with task ID: {task_id}")
+
+    async def run_boss():
+        try:
+            result = await process_with_boss(
+                request.demand,
+                task_id=task_id,
+                priority=request.priority,
+                department=request.department,
+                deadline=deadline,
+            )
+            event = {"event": "boss_response", "data": result}
+        except Exception as e:
+            logging.error(f"[API_ERROR] Error streaming demand: {str(e)}")
+            event = {"event": "error", "data": str(e)}
+        stream_hub.publish(task_id, {"stage": "boss", "agent": "boss", **event})
+
+    async def watch_completion(completions):
+        msg = await completions.get()
+        stream_hub.publish(
+            task_id,
+            {
+                "event": "complete",
+                "stage": "system",
+                "agent": "system",
+                "data": msg["type"],
+            },
+        )
+
+    async def event_generator():
+        with stream_hub.subscribe(task_id) as events:
+            async with blackboard.subscribe(
+                types=list(TERMINAL_TYPES), task_ids=[task_id]
+            ) as completions:
+                tasks = [
+                    asyncio.create_task(run_boss()),
+                    asyncio.create_task(watch_completion(completions)),
+                ]
+                try:
+                    yield {
+                        "event": "accepted",
+                        "data": json.dumps({"task_id": task_id}),
+                    }
+                    async for event in events:
+                        yield {"event": event["event"], "data": json.dumps(event)}
+                        if event["event"] in ("complete", "error"):
+                            break
+                        if event["event"] == "boss_response" and not any(
+                            msg["type"] == "demand" or msg["type"] in TERMINAL_TYPES
+                            for msg in await blackboard.get_by_task(task_id)
+                        ):
+                            break
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return EventSourceResponse(event_generator())
+
+
+@router.get("/queue")
+async def get_queue_stats():
+    """
+    Get queue depth, in-flight counts and scheduler stats of the demand executor.
+    """
+    return demand_executor.stats()
+
+
 @router.get("/{task_id}/status")
 async def get_demand_status(task_id: str):
     """
     Get the status of a specific demand by its task ID.
+
+    For demands submitted in the background this also reports the job state
+    and, once the boss has answered, its response.
     """
     try:
-        # Get all messages from the blackboard
-        messages = await blackboard.get_all()
-
-        # Filter messages related to this task
-        task_messages = [
-            msg for msg in messages if task_id in str(msg.get("content", ""))
-        ]
+        # Messages correlated with this task through the blackboard task index
+        task_messages = await blackboard.get_by_task(task_id)
+        job = job_manager.get(task_id)
 
-        if not task_messages:
+        if not task_messages and job is None:
             raise HTTPException(
                 status_code=404, detail=f"No demand found with task ID: {task_id}"
             )
 
-        # Determine the status
-        status = (
-            "completed"
-            if any(msg["type"] == "demand_processed" for msg in task_messages)
-            else "in_progress"
-        )
+        status = _demand_status(task_messages)
+        responses = [msg for msg in task_messages if msg["type"] == "boss_response"]
+        # Pipeline stage persisted on the demand message (queued ... done/failed)
+        stages = [msg["state"] for msg in task_messages if msg.get("state")]
 
         return {
             "task_id": task_id,
             "status": status,
             "message_count": len(task_messages),
-            "latest_update": max(msg["timestamp"] for msg in task_messages),
+            "latest_update": (
+                max(msg["timestamp"] for msg in task_messages)
+                if task_messages
+                else None
+            ),
+            "job": job,
+            "stage": stages[-1] if stages else None,
+            "result": responses[-1]["content"] if responses else None,
+            "tasks": await get_task_overview(task_id, task_messages),
         }
 
     except HTTPException:
@@ -222,3 +428,110 @@ async def get_demand_status(task_id: str):
         raise HTTPException(
             status_code=500, detail=f"Error retrieving demand status: {str(e)}"
         )
+
+
+@router.get("/{task_id}/tasks")
+async def get_demand_tasks(task_id: str):
+    """
+    Get the tasks the squad leader broke a demand into, with their priority,
+    skills, estimate, dependencies and execution status.
+    """
+    task_messages = await blackboard.get_by_task(task_id)
+    if not task_messages:
+        raise HTTPException(
+            status_code=404, detail=f"No demand found with task ID: {task_id}"
+        )
+    return {
+        "task_id": task_id,
+        "tasks": await get_task_overview(task_id, task_messages),
+    }
+
+
+@router.delete("/{task_id}")
+async def delete_demand(task_id: str):
+    """
+    Cancel a demand: stops its background boss job and any queued or running
+    pipeline work.
+    """
+    try:
+        if await cancel_demand(task_id):
+            logging.info(f"[API_CANCELLED] Demand {task_id} cancelled")
+            return {"task_id": task_id, "status": "cancelled"}
+
+        if not await blackboard.get_by_task(task_id):
+            raise HTTPException(
+                status_code=404, detail=f"No demand found with task ID: {task_id}"
+            )
+        raise HTTPException(
+            status_code=409, detail=f"Demand {task_id} has already finished"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"[API_ERROR] Error cancelling demand: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Error cancelling demand: {str(e)}"
+        )
+
+
+@router.get("/{task_id}/events")
+async def stream_demand_events(task_id: str):
+    """
+    Stream the processing steps of a demand as Server-Sent Events.
+
+    Each step is sent as a `step` event; a final `complete` event is sent
+    once the demand has been fully processed. Unknown task IDs get a 404.
+    """
+    if not await demand_exists(task_id):
+        raise HTTPException(
+            status_code=404, detail=f"No demand found with task ID: {task_id}"
+        )
+
+    async def event_generator():
+        async for step in stream_processing_steps(task_id):
+            yield {"event": "step", "data": step.model_dump_json()}
+        yield {"event": "complete", "data": task_id}
+
+    logging.info(f"[API_EVENTS] Client watching task {task_id} over SSE")
+    return EventSourceResponse(event_generator())
+
+
+@router.websocket("/{task_id}/ws")
+async def demand_events_websocket(websocket: WebSocket, task_id: str):
+    """
+    WebSocket equivalent of the events endpoint: sends each processing step
+    as JSON and closes once the demand has been fully processed. Unknown task
+    IDs are closed right away with code 4404.
+    """
+    await websocket.accept()
+    if not await demand_exists(task_id):
+        await websocket.close(
+            code=4404, reason=f"No demand found with task ID: {task_id}"
+        )
+        return
+    logging.info(f"[API_EVENTS] Client watching task {task_id} over WebSocket")
+
+    async def forward_steps():
+        async for step in stream_processing_steps(task_id):
+            await websocket.send_json({"event": "step", "data": step.model_dump()})
+        await websocket.send_json({"event": "complete", "data": task_id})
+
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    # Watch for disconnects too, so idle watchers are released right away
+    forwarder = asyncio.create_task(forward_steps())
+    watcher = asyncio.create_task(wait_for_disconnect())
+    done, pending = await asyncio.wait(
+        {forwarder, watcher}, return_when=asyncio.FIRST_COMPLETED
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    if forwarder in done and forwarder.exception() is None:
+        await websocket.close()
+    else:
+        logging.info(f"[API_EVENTS] WebSocket client for task {task_id} disconnected")
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from core.document_batches import ArchiveTooLarge
+from main import document_batches
+
+# Initialize router
+router = APIRouter(prefix="/api/v1/documents", tags=["documents"])
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _store_upload(upload: UploadFile, path: str):
+    """Copy an upload to disk chunk by chunk, never holding the whole file.
+
+    Disk writes run in a worker thread so a slow disk doesn't stall the loop.
+    """
+    target = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(target.write, chunk)
+    finally:
+        await asyncio.to_thread(target.close)
+
+
+@router.post("/batch", status_code=202)
+async def create_document_batch(
+    files: List[UploadFile] = File(
+        ..., description="PDF files and/or zip archives of PDF files"
+    ),
+    task_id: Optional[str] = Form(
+        None, description="Demand the documents belong to, if any"
+    ),
+):
+    """
+    Upload a batch of PDFs (or zip archives of PDFs) for conversion.
+
+    Files are streamed to disk and converted in parallel in the background;
+    each converted document is posted to the blackboard as a `document`
+    message. Returns 202 Accepted with the batch_id to poll for progress.
+    """
+    for upload in files:
+        if not upload.filename:
+            raise HTTPException(
+                status_code=400, detail="Every uploaded file must have a filename"
+            )
+        if not upload.filename.lower().endswith((".pdf", ".zip")):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file '{upload.filename}': expected .pdf or .zip",
+            )
+
+    batch, directory = document_batches.create()
+    try:
+        for index, upload in enumerate(files):
+            name = os.path.basename(upload.filename)
+            path = os.path.join(directory, f"{index:05d}_{name}")
+            await _store_upload(upload, path)
+            if name.lower().endswith(".zip"):
+                await asyncio.to_thread(document_batches.check_archive, path)
+    except ValueError as e:
+        document_batches.abort(batch, directory, str(e))
+        raise HTTPException(
+            status_code=413 if isinstance(e, ArchiveTooLarge) else 400,
+            detail=f"Rejected '{upload.filename}': {e}",
+        )
+    except Exception as e:
+        logging.error(f"[API_ERROR] Error receiving document batch: {str(e)}")
+        document_batches.abort(batch, directory, str(e))
+        raise HTTPException(
+            status_code=500, detail=f"Error receiving documents: {str(e)}"
+        )
+
+    document_batches.start(batch, directory, task_id=task_id)
+    logging.info(
+        f"[API_DOCUMENTS] Batch {batch['batch_id']} accepted with {len(files)} upload(s)"
+    )
+    return JSONResponse(
+        status_code=202,
+        content={
+            "batch_id": batch["batch_id"],
+            "uploads": len(files),
+            "status": "accepted",
+        },
+    )
+
+
+@router.get("/batch/{batch_id}")
+async def get_document_batch(batch_id: str):
+    """
+    Get the progress of a document batch: documents converted and failed,
+    pages converted and throughput in pages per second.
+    """
+    batch = document_batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=404, detail=f"No document batch found with ID: {batch_id}"
+        )
+    return batch
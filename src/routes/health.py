@@ -1,5 +1,17 @@
 from fastapi import APIRouter
 
+from main import (
+    agent_cache,
+    blackboard,
+    converter_pool,
+    demand_deduplicator,
+    demand_executor,
+    job_manager,
+    lease_manager,
+    retention_compactor,
+)
+from tools.linkedin import candidate_source
+
 # Initialize router
 router = APIRouter(prefix="/api/v1/health", tags=["health"])
 
@@ -10,3 +22,23 @@ async def health_check():
     Simple health check endpoint.
     """
     return {"status": "healthy", "version": "1.0.0"}
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Runtime metrics: blackboard writer, retention and archive, demand leases,
+    agent response cache, demand executor, deduplication, background jobs,
+    OCR converter pool and candidate source.
+    """
+    return {
+        "blackboard_writer": blackboard.writer_stats(),
+        "retention": retention_compactor.stats(),
+        "leases": lease_manager.stats(),
+        "agent_cache": agent_cache.stats(),
+        "demand_executor": demand_executor.stats(),
+        "demand_dedup": demand_deduplicator.stats(),
+        "jobs": job_manager.stats(),
+        "ocr": converter_pool.stats(),
+        "candidate_source": candidate_source.stats(),
+    }
@@ -0,0 +1,21 @@
+"""Storage engines for the Multi-Agent Blackboard System."""
+
+from storage.archive import MessageArchive
+from storage.base import StorageEngine
+from storage.jsonl import FSYNC_POLICIES, JsonlStorage
+from storage.memory import MemoryStorage
+from storage.records import ContentStore, MessageRecord
+from storage.sqlite import SqliteStorage
+from storage.writer import GroupCommitWriter
+
+__all__ = [
+    "StorageEngine",
+    "MemoryStorage",
+    "JsonlStorage",
+    "SqliteStorage",
+    "FSYNC_POLICIES",
+    "GroupCommitWriter",
+    "MessageArchive",
+    "MessageRecord",
+    "ContentStore",
+]
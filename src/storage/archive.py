@@ -0,0 +1,198 @@
+import gzip
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+INDEX_FILE = "index.json"
+
+
+class MessageArchive:
+    """Compressed, append-only home for messages expired from the blackboard.
+
+    Messages are written as JSON lines to gzip segment files
+    (`segment-000001.jsonl.gz`, ...). Each batch is appended as its own gzip
+    member, so a segment is readable after every append, and a new segment
+    is started once the current one passes `segment_max_bytes`. With
+    `max_segments` set, the oldest segments are deleted as new ones are
+    started.
+
+    `index.json` records the time range, types and tasks of every segment,
+    so queries skip segments outside their time range or task. The index is
+    re-read on every call, which lets other processes query an archive that
+    a single process writes to.
+    """
+
+    def __init__(self, directory, segment_max_bytes=16 * 1024 * 1024, max_segments=0):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+
+    def _read_index(self):
+        path = self.directory / INDEX_FILE
+        if not path.exists():
+            return []
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _write_index(self, segments):
+        path = self.directory / INDEX_FILE
+        tmp_path = path.with_name(INDEX_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(segments, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _new_segment(self, segments):
+        number = int(segments[-1]["name"][8:14]) + 1 if segments else 1
+        segment = {
+            "name": f"segment-{number:06d}.jsonl.gz",
+            "count": 0,
+            "first": None,
+            "last": None,
+            "types": [],
+            "task_ids": [],
+        }
+        segments.append(segment)
+
+        if self.max_segments and len(segments) > self.max_segments:
+            for old in segments[: -self.max_segments]:
+                (self.directory / old["name"]).unlink(missing_ok=True)
+                logging.info(
+                    f"[ARCHIVE_ROTATE] Dropped segment {old['name']} ({old['count']} messages)"
+                )
+            del segments[: -self.max_segments]
+        return segment
+
+    def append(self, messages):
+        """Write messages to the current segment and return how many were written."""
+        if not messages:
+            return 0
+        data = "".join(json.dumps(message) + "\n" for message in messages)
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            segments = self._read_index()
+            if (
+                not segments
+                or (self.directory / segments[-1]["name"]).stat().st_size
+                >= self.segment_max_bytes
+            ):
+                segment = self._new_segment(segments)
+            else:
+                segment = segments[-1]
+
+            path = self.directory / segment["name"]
+            with open(path, "ab") as f:
+                f.write(gzip.compress(data.encode("utf-8")))
+                f.flush()
+                os.fsync(f.fileno())
+
+            timestamps = [message["timestamp"] for message in messages]
+            segment["count"] += len(messages)
+            segment["first"] = min(filter(None, [segment["first"], *timestamps]))
+            segment["last"] = max(filter(None, [segment["last"], *timestamps]))
+            for field, key in (("type", "types"), ("task_id", "task_ids")):
+                values = set(segment[key])
+                values.update(
+                    message.get(field)
+                    for message in messages
+                    if message.get(field) is not None
+                )
+                segment[key] = sorted(values)
+            self._write_index(segments)
+
+        logging.info(
+            f"[ARCHIVE_WRITE] Archived {len(messages)} messages into {segment['name']}"
+        )
+        return len(messages)
+
+    # A message archived again (see `query`) may have a new type, but never a
+    # new task or timestamp: only those can rule out a segment or a copy
+    @staticmethod
+    def _may_match(segment, filters, since, until):
+        if since and segment["last"] and segment["last"] < since:
+            return False
+        if until and segment["first"] and segment["first"] > until:
+            return False
+        if "task_id" in filters and filters["task_id"] not in segment["task_ids"]:
+            return False
+        return True
+
+    @staticmethod
+    def _in_range(message, filters, since, until):
+        return (
+            ("task_id" not in filters or message.get("task_id") == filters["task_id"])
+            and (not since or message["timestamp"] >= since)
+            and (not until or message["timestamp"] <= until)
+        )
+
+    def _read_segment(self, name):
+        try:
+            with gzip.open(self.directory / name, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+            # A batch being written by another process, or torn by a crash
+            logging.warning(f"[ARCHIVE_READ] Stopped reading {name} early: {e}")
+
+    def query(self, filters=None, since=None, until=None, limit=None):
+        """Return archived messages matching every filter, oldest first.
+
+        Takes the same `filters`, `since` and `until` as the storage engines'
+        `query`, except that a filter set to None is no constraint (e.g. a
+        query parameter left out). A message archived twice (e.g. after a
+        crash between archiving and deleting it) is returned once, in its
+        latest version.
+        """
+        filters = {
+            field: value
+            for field, value in (filters or {}).items()
+            if value is not None
+        }
+        with self._lock:
+            segments = self._read_index()
+
+        # The other filters apply to the latest copy of each message only
+        latest = {}
+        for segment in segments:
+            if not self._may_match(segment, filters, since, until):
+                continue
+            for message in self._read_segment(segment["name"]):
+                if self._in_range(message, filters, since, until):
+                    latest[message["id"]] = message
+
+        matches = (
+            message
+            for message in latest.values()
+            if all(message.get(field) == value for field, value in filters.items())
+        )
+        results = sorted(matches, key=lambda message: message["timestamp"])
+        return results[:limit] if limit is not None else results
+
+    def get(self, message_id):
+        """Return the archived message with the given id, or None."""
+        found = None
+        with self._lock:
+            segments = self._read_index()
+        for segment in segments:
+            for message in self._read_segment(segment["name"]):
+                if message["id"] == message_id:
+                    found = message
+        return found
+
+    def stats(self):
+        with self._lock:
+            segments = self._read_index()
+        return {
+            "segments": len(segments),
+            "messages": sum(segment["count"] for segment in segments),
+            "bytes": sum(
+                (self.directory / segment["name"]).stat().st_size
+                for segment in segments
+                if (self.directory / segment["name"]).exists()
+            ),
+        }
@@ -0,0 +1,81 @@
+class StorageEngine:
+    """Interface implemented by every blackboard storage engine.
+
+    The engine owns the message list and its persistence. Writes are split
+    in two steps: `apply` stages one operation (in-memory engines update
+    their state right away) and `flush` persists everything staged since the
+    previous flush in one write or transaction. The blackboard's single
+    writer thread is the only caller of both, so engines only need to guard
+    their own I/O.
+    """
+
+    def load(self):
+        """Load persisted messages into memory."""
+        raise NotImplementedError
+
+    def apply(self, operation):
+        """Stage one write and return its result.
+
+        `operation` is `("append", message)`, which returns the message,
+        `("update", message_id, changes)`, which returns the updated message
+        (None if it does not exist), or `("delete", message_ids)`, which
+        returns the messages actually removed.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist every operation staged since the last flush."""
+
+    def append(self, message):
+        """Store a new message."""
+        self.apply(("append", message))
+        self.flush()
+
+    def update(self, message_id, changes):
+        """Apply field changes to a stored message and return it (or None)."""
+        message = self.apply(("update", message_id, changes))
+        self.flush()
+        return message
+
+    def delete(self, message_ids):
+        """Remove messages by id and return the ones that existed."""
+        removed = self.apply(("delete", message_ids))
+        self.flush()
+        return removed
+
+    def get(self, message_id):
+        """Return the message with the given id, or None."""
+        raise NotImplementedError
+
+    def seq(self, message_id):
+        """Return the sequence number of a stored message, or None."""
+        raise NotImplementedError
+
+    def find(self, field, value):
+        """Return messages whose indexed `field` equals `value`."""
+        raise NotImplementedError
+
+    def range(self, since=None, until=None):
+        """Return messages with `since <= timestamp <= until` (ISO strings)."""
+        raise NotImplementedError
+
+    def query(self, filters=None, since=None, until=None, after=None, limit=None):
+        """Return messages in insertion order matching every filter.
+
+        `filters` maps message fields to required values, `since`/`until`
+        bound the timestamp, `after` is the id of the last message already
+        seen or its sequence number (a pagination cursor; the number stays
+        usable after the message is deleted) and `limit` caps the number of
+        results.
+        """
+        raise NotImplementedError
+
+    def all(self):
+        """Return every stored message in insertion order."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def close(self):
+        """Flush pending writes and release resources."""
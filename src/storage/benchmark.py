@@ -0,0 +1,131 @@
+"""Compare the memory of blackboard messages as dicts and as MessageRecords.
+
+Messages are decoded from JSON lines, as when a board is loaded, and kept
+in three layouts: plain dicts, records with every body in memory, and
+records with large bodies in a ContentStore.
+
+Usage (from the src directory):
+    python -m storage.benchmark --messages 200000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from storage.records import ContentStore, MessageRecord
+
+# (sender, type, typical body size in characters) of a demand's messages
+PIPELINE = [
+    ("director", "demand", 200),
+    ("head", "structured_plan", 3000),
+    ("squad_leader", "task_breakdown", 2500),
+    ("worker", "task_execution", 2000),
+    ("worker", "task_execution", 2000),
+    ("worker", "task_execution", 2000),
+    ("worker", "partial_output", 1200),
+    ("system", "system_log", 120),
+    ("system", "system_log", 120),
+    ("worker", "task_results", 6000),
+]
+WORDS = "candidate python senior backend interview salary remote team plan".split()
+
+
+def synthetic_lines(count, seed=42):
+    """JSON lines of `count` messages from demands run one after another."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        sender, type_, size = PIPELINE[i % len(PIPELINE)]
+        words = rng.randint(size // 2, size * 3 // 2) // 8
+        message = {
+            "id": f"{i:08x}",
+            "sender": sender,
+            "content": " ".join(rng.choice(WORDS) for _ in range(words)),
+            "type": type_,
+            "timestamp": (start + timedelta(seconds=i * 1.5)).isoformat(),
+            "task_id": f"{i // len(PIPELINE):08x}",
+        }
+        if type_ == "demand":
+            message.update(state="done", attempts=0, priority="normal")
+        yield json.dumps(message)
+
+
+def _measure(label, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    messages = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<32} {size / 2**20:10.1f} MiB {size / len(messages):8.0f} B/msg"
+        f" {elapsed:8.2f} s"
+    )
+    return messages, size
+
+
+def _timed(label, function, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<32} {elapsed * 1000:10.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--threshold", type=int, default=1024)
+    args = parser.parse_args()
+
+    lines = list(synthetic_lines(args.messages))
+    print(f"{args.messages} messages, {sum(map(len, lines)) / 2**20:.1f} MiB of JSON")
+
+    dicts, dict_size = _measure("dict", lambda: [json.loads(line) for line in lines])
+    del dicts
+    records, record_size = _measure(
+        "MessageRecord (inline)",
+        lambda: [MessageRecord(json.loads(line)) for line in lines],
+    )
+    del records
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ContentStore(directory, args.threshold)
+        records, store_size = _measure(
+            f"MessageRecord + store ({args.threshold} B)",
+            lambda: [MessageRecord(json.loads(line), store) for line in lines],
+        )
+        print(
+            f"{'content store on disk':<32} {store.stats()['bytes'] / 2**20:10.1f} MiB"
+        )
+        print(
+            f"saved vs dict: inline {1 - record_size / dict_size:.0%},"
+            f" with store {1 - store_size / dict_size:.0%}"
+        )
+
+        dicts = [json.loads(line) for line in lines]
+        sample = random.Random(1).sample(range(len(lines)), 10_000)
+        _timed(
+            "10k type lookups (dict)",
+            lambda: [dicts[i]["type"] for i in sample],
+            repeat=5,
+        )
+        _timed(
+            "10k type lookups (record)",
+            lambda: [records[i]["type"] for i in sample],
+            repeat=5,
+        )
+        _timed(
+            "10k content reads (record)",
+            lambda: [records[i]["content"] for i in sample],
+            repeat=5,
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
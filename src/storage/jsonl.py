@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from storage.memory import MemoryStorage
+from storage.records import ContentStore, MessageRecord
+
+# "always" fsyncs every record, "batch" every `fsync_batch_size` records and
+# "periodic" every `fsync_interval` seconds from a background thread.
+FSYNC_POLICIES = ("always", "batch", "periodic")
+
+
+class JsonlStorage(MemoryStorage):
+    """Append-only JSON-lines log with periodic snapshot compaction.
+
+    Every post or update appends a single line to the log instead of rewriting
+    the whole board, and the lines of a batch of writes go out in one write
+    and at most one fsync. Once the log grows past `compact_threshold`
+    records it is rotated and folded into the snapshot file on a background
+    thread. The snapshot keeps the legacy `blackboard_data.json` format (a
+    JSON array), so existing boards load without migration.
+
+    Message bodies of at least `content_threshold` bytes are kept out of
+    memory in a private `ContentStore` file in the snapshot's directory (0
+    keeps every body in memory, e.g. for one-off readers).
+    """
+
+    def __init__(
+        self,
+        snapshot_path,
+        log_path=None,
+        fsync_policy="batch",
+        fsync_batch_size=64,
+        fsync_interval=1.0,
+        compact_threshold=10000,
+        content_threshold=1024,
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy '{fsync_policy}', expected one of {FSYNC_POLICIES}"
+            )
+        self.snapshot_path = Path(snapshot_path)
+        super().__init__(
+            ContentStore(self.snapshot_path.parent, content_threshold)
+            if content_threshold
+            else None
+        )
+        self.log_path = (
+            Path(log_path) if log_path else self.snapshot_path.with_suffix(".log")
+        )
+        self._rotated_path = self.log_path.with_name(self.log_path.name + ".1")
+        self.fsync_policy = fsync_policy
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+
+        self._io_lock = threading.Lock()
+        self._pending = []
+        self._log = None
+        self._log_records = 0
+        self._unsynced = 0
+        self._compaction = None
+        self._stop = threading.Event()
+        self._syncer = None
+
+    def load(self, compact=True):
+        """Replay the snapshot followed by the log tail.
+
+        A rotated segment left by an interrupted compaction is folded into
+        the snapshot unless `compact` is False, which keeps the load
+        read-only (e.g. to copy a board another process may be writing).
+        """
+        messages = {}
+        records = 0
+
+        if self.snapshot_path.exists() and self.snapshot_path.stat().st_size:
+            with open(self.snapshot_path, "r") as f:
+                for message in json.load(f):
+                    messages[message["id"]] = MessageRecord(message, self.content_store)
+
+        # A rotated segment only survives if compaction was interrupted.
+        # Replay is idempotent, so anything already in the snapshot is skipped.
+        for segment in (self._rotated_path, self.log_path):
+            if segment.exists():
+                records += self._replay(segment, messages)
+
+        self._reindex(messages.values())
+        self._log_records = records
+
+        if compact and self._rotated_path.exists():
+            self.compact(wait=True)
+
+        return self.messages
+
+    def _replay(self, segment, messages):
+        count = 0
+        with open(segment, "r") as f:
+            for line_no, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write at the tail of the log after a crash
+                    logging.warning(
+                        f"[BLACKBOARD_LOG_REPLAY] Skipping corrupt record {segment.name}:{line_no}"
+                    )
+                    continue
+
+                if record["op"] == "append":
+                    message = record["message"]
+                    if message["id"] not in messages:
+                        messages[message["id"]] = MessageRecord(
+                            message, self.content_store
+                        )
+                elif record["op"] == "update" and record["id"] in messages:
+                    messages[record["id"]].update(record["changes"])
+                elif record["op"] == "delete":
+                    for message_id in record["ids"]:
+                        messages.pop(message_id, None)
+                count += 1
+        return count
+
+    def apply(self, operation):
+        # Serialised before the state changes, so an operation that can't be
+        # logged fails on its own and leaves the board untouched
+        line = None
+        if operation[0] == "append":
+            # The posted dict, not the record, so the body needn't be read back
+            line = json.dumps({"op": "append", "message": operation[1]})
+        elif operation[0] == "update":
+            _, message_id, changes = operation
+            line = json.dumps({"op": "update", "id": message_id, "changes": changes})
+
+        result = super().apply(operation)
+        if operation[0] == "delete":
+            if result:
+                self._pending.append(
+                    json.dumps(
+                        {"op": "delete", "ids": [message["id"] for message in result]}
+                    )
+                )
+        elif result is not None:
+            self._pending.append(line)
+        return result
+
+    def flush(self):
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        data = "".join(line + "\n" for line in lines)
+
+        with self._io_lock:
+            log = self._open_log()
+            log.write(data)
+            log.flush()
+            self._log_records += len(lines)
+            self._unsynced += len(lines)
+
+            if self.fsync_policy == "always" or (
+                self.fsync_policy == "batch" and self._unsynced >= self.fsync_batch_size
+            ):
+                self._fsync()
+
+            needs_compaction = self._log_records >= self.compact_threshold
+
+        if needs_compaction:
+            self.compact()
+
+    def _open_log(self):
+        if self._log is None:
+            self._log = open(self.log_path, "a")
+            if self.fsync_policy == "periodic" and self._syncer is None:
+                self._syncer = threading.Thread(
+                    target=self._sync_periodically, name="blackboard-fsync", daemon=True
+                )
+                self._syncer.start()
+        return self._log
+
+    def _fsync(self):
+        if self._log is not None and self._unsynced:
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    def _sync_periodically(self):
+        while not self._stop.wait(self.fsync_interval):
+            with self._io_lock:
+                self._fsync()
+
+    def compact(self, wait=False):
+        """Fold the log into a fresh snapshot.
+
+        The log is rotated under the I/O lock and the snapshot is written on a
+        background thread, so posts only pause for the rotation itself.
+        """
+        with self._io_lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+
+            if self._log is not None:
+                self._log.flush()
+                self._fsync()
+                self._log.close()
+                self._log = None
+            if self.log_path.exists() and not self._rotated_path.exists():
+                os.replace(self.log_path, self._rotated_path)
+
+            # Shallow copies so later updates don't race with serialisation;
+            # out-of-line bodies are only read back while writing
+            snapshot = [message.copy() for message in self.messages]
+            self._log_records = 0
+            self._compaction = threading.Thread(
+                target=self._write_snapshot,
+                args=(snapshot,),
+                name="blackboard-compaction",
+                daemon=True,
+            )
+            self._compaction.start()
+
+        if wait:
+            self._compaction.join()
+
+    def _write_snapshot(self, snapshot):
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                # Written message by message, so bodies are never all in memory
+                f.write("[")
+                for position, message in enumerate(snapshot):
+                    if position:
+                        f.write(", ")
+                    f.write(json.dumps(dict(message)))
+                f.write("]")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._rotated_path.unlink(missing_ok=True)
+            logging.info(
+                f"[BLACKBOARD_COMPACT] Compacted {len(snapshot)} messages into {self.snapshot_path.name}"
+            )
+        except Exception as e:
+            logging.error(f"[BLACKBOARD_COMPACT_ERROR] Error compacting log: {e}")
+
+    def close(self):
+        self.flush()
+        self._stop.set()
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._io_lock:
+            if self._log is not None:
+                self._log.flush()
+                self._fsync()
+                self._log.close()
+                self._log = None
+        if self.content_store is not None:
+            self.content_store.close()
@@ -0,0 +1,185 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+from storage.base import StorageEngine
+from storage.records import MessageRecord, to_epoch
+
+# Fields with a secondary index: value -> sorted list of sequence numbers
+INDEXED_FIELDS = ("type", "sender", "task_id")
+
+
+class MemoryStorage(StorageEngine):
+    """Volatile storage that keeps every message in a Python list.
+
+    Secondary indexes by id, type, sender and task plus a sorted timestamp list
+    keep lookups proportional to the result size instead of the board size.
+    Messages without a value for an indexed field are left out of its index.
+    Each message also gets a sequence number, used as a pagination cursor;
+    index buckets hold sorted sequence numbers, so a page starts with a
+    bisect instead of a walk from the first message of the bucket.
+
+    Messages are kept as `MessageRecord`s; given a `content_store`, large
+    bodies are moved out of memory into it.
+    """
+
+    def __init__(self, content_store=None):
+        self.content_store = content_store
+        self._reindex([])
+
+    def _reindex(self, messages):
+        self.messages = []
+        self._by_id = {}
+        self._indexes = {field: {} for field in INDEXED_FIELDS}
+        self._timestamps = []
+        self._seqs = []
+        self._seq_by_id = {}
+        self._by_seq = {}
+        self._next_seq = 1
+        for message in messages:
+            self._index(message)
+
+    def _index(self, message):
+        message = MessageRecord.from_message(message, self.content_store)
+        self.messages.append(message)
+        self._by_id[message["id"]] = message
+        self._timestamps.append(message.epoch)
+        self._seqs.append(self._next_seq)
+        self._seq_by_id[message["id"]] = self._next_seq
+        self._by_seq[self._next_seq] = message
+        for field, index in self._indexes.items():
+            if message.get(field) is not None:
+                index.setdefault(message[field], []).append(self._next_seq)
+        self._next_seq += 1
+        return message
+
+    def load(self):
+        return self.messages
+
+    def apply(self, operation):
+        if operation[0] == "append":
+            return self._index(operation[1])
+        if operation[0] == "delete":
+            return self._delete(operation[1])
+        return self._update(*operation[1:])
+
+    def _delete(self, message_ids):
+        removed = {}
+        for message_id in message_ids:
+            if message_id in self._by_id:
+                removed[message_id] = self._by_id.pop(message_id)
+        if not removed:
+            return []
+
+        # One pass over the board per batch, keeping the survivors' sequence
+        # numbers so pagination cursors stay valid
+        kept = [
+            (seq, message)
+            for seq, message in zip(self._seqs, self.messages)
+            if message["id"] not in removed
+        ]
+        self.messages = [message for _, message in kept]
+        self._seqs = [seq for seq, _ in kept]
+        self._timestamps = [message.epoch for message in self.messages]
+
+        for message_id, message in removed.items():
+            seq = self._seq_by_id.pop(message_id)
+            del self._by_seq[seq]
+            for field in self._indexes:
+                self._unindex(field, message.get(field), seq)
+        return list(removed.values())
+
+    def _unindex(self, field, value, seq):
+        if value is None:
+            return
+        index = self._indexes[field]
+        bucket = index[value]
+        del bucket[bisect_left(bucket, seq)]
+        if not bucket:
+            del index[value]
+
+    def _update(self, message_id, changes):
+        message = self._by_id.get(message_id)
+        if message is None:
+            return None
+
+        seq = self._seq_by_id[message_id]
+        for field, index in self._indexes.items():
+            old, new = message.get(field), changes.get(field)
+            if field not in changes or new == old:
+                continue
+            self._unindex(field, old, seq)
+            if new is not None:
+                insort(index.setdefault(new, []), seq)
+
+        message.update(changes)
+        return message
+
+    def get(self, message_id):
+        return self._by_id.get(message_id)
+
+    def find(self, field, value):
+        return [self._by_seq[seq] for seq in self._indexes[field].get(value, ())]
+
+    def range(self, since=None, until=None):
+        start = bisect_left(self._timestamps, to_epoch(since)) if since else 0
+        end = (
+            bisect_right(self._timestamps, to_epoch(until))
+            if until
+            else len(self.messages)
+        )
+        return self.messages[start:end]
+
+    def query(self, filters=None, since=None, until=None, after=None, limit=None):
+        filters = filters or {}
+        after_seq = self._cursor_seq(after)
+        since = to_epoch(since) if since else None
+        until = to_epoch(until) if until else None
+
+        indexed = [
+            self._indexes[field].get(value, [])
+            for field, value in filters.items()
+            if field in self._indexes
+        ]
+        if indexed:
+            # Walk the smallest matching bucket from the cursor (or `since`)
+            # on and check the other filters
+            bucket = min(indexed, key=len)
+            start = bisect_right(bucket, after_seq)
+            if since:
+                start = max(
+                    start,
+                    bisect_left(bucket, since, key=lambda seq: self._by_seq[seq].epoch),
+                )
+            candidates = (self._by_seq[bucket[i]] for i in range(start, len(bucket)))
+        else:
+            start = bisect_right(self._seqs, after_seq)
+            if since:
+                start = max(start, bisect_left(self._timestamps, since))
+            candidates = (self.messages[i] for i in range(start, len(self.messages)))
+
+        matches = (
+            message
+            for message in candidates
+            if all(message.get(field) == value for field, value in filters.items())
+            and (since is None or message.epoch >= since)
+            and (until is None or message.epoch <= until)
+        )
+        return list(islice(matches, limit))
+
+    def seq(self, message_id):
+        return self._seq_by_id.get(message_id)
+
+    def _cursor_seq(self, after):
+        if after is None:
+            return 0
+        if isinstance(after, int):
+            return after
+        if after not in self._seq_by_id:
+            raise ValueError(f"Unknown cursor message id '{after}'")
+        return self._seq_by_id[after]
+
+    def all(self):
+        return self.messages
+
+    def __len__(self):
+        return len(self.messages)
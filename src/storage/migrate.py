@@ -0,0 +1,46 @@
+"""Import an existing JSON blackboard into a SQLite database.
+
+Usage (from the src directory):
+    python -m storage.migrate --source blackboard_data.json --target blackboard.db
+"""
+
+import argparse
+import logging
+
+from storage.jsonl import JsonlStorage
+from storage.sqlite import SqliteStorage
+
+
+def migrate(source, target):
+    """Copy every message of a JSON snapshot (plus its log) into SQLite.
+
+    Messages already present in the target are skipped, so the migration can
+    be re-run safely. Returns the number of messages read from the source.
+    """
+    # Read once and copied right away: no point moving bodies out of memory.
+    # Read-only, as the source may still belong to a running (or crashed) server
+    messages = JsonlStorage(source, content_threshold=0).load(compact=False)
+    storage = SqliteStorage(target)
+    try:
+        storage.append_many(messages)
+        logging.info(
+            f"[BLACKBOARD_MIGRATE] Imported {len(messages)} messages from {source} into {target} "
+            f"({len(storage)} messages in target)"
+        )
+    finally:
+        storage.close()
+    return len(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="blackboard_data.json")
+    parser.add_argument("--target", default="blackboard.db")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrate(args.source, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure blackboard post latency as the board grows.
+
+The board is filled up to each size with concurrent posts, then a run of
+posts is awaited one at a time and timed. For comparison, the baseline
+column times what every post used to cost: rewriting the whole board as
+one JSON file.
+
+Usage (from the src directory):
+    python -m storage.post_benchmark --sizes 1000 10000 50000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from blackboard import Blackboard
+from storage.jsonl import FSYNC_POLICIES, JsonlStorage
+from storage.sqlite import SqliteStorage
+
+BODY = "x" * 500
+
+
+def _make_storage(backend, directory, fsync_policy):
+    if backend == "sqlite":
+        return SqliteStorage(os.path.join(directory, "blackboard.db"))
+    return JsonlStorage(
+        os.path.join(directory, "blackboard_data.json"), fsync_policy=fsync_policy
+    )
+
+
+def _rewrite_ms(messages, path, samples):
+    """Milliseconds to dump the whole board, as `_save_messages` used to."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        with open(path, "w") as f:
+            json.dump(messages, f)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def _grow(blackboard, count, chunk=1000):
+    for start in range(0, count, chunk):
+        await asyncio.gather(
+            *(
+                blackboard.post(sender="benchmark", content=BODY, type_="discussion")
+                for _ in range(min(chunk, count - start))
+            )
+        )
+
+
+async def _measure(args, directory):
+    blackboard = Blackboard(
+        storage=_make_storage(args.backend, directory, args.fsync_policy)
+    )
+    print(
+        f"backend={args.backend}"
+        + (f" fsync={args.fsync_policy}" if args.backend == "jsonl" else "")
+        + f" posts per size={args.posts}"
+    )
+    print(
+        f"{'board size':>10} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}"
+        f" {'rewrite ms':>11}"
+    )
+    for size in sorted(args.sizes):
+        await _grow(blackboard, size - len(blackboard.storage))
+        latencies = []
+        for _ in range(args.posts):
+            started = time.perf_counter()
+            await blackboard.post(sender="benchmark", content=BODY, type_="discussion")
+            latencies.append((time.perf_counter() - started) * 1e6)
+        latencies.sort()
+
+        rewrite = "-"
+        if args.rewrite_samples:
+            messages = [dict(message) for message in blackboard.messages]
+            path = os.path.join(directory, "rewrite.json")
+            rewrite = f"{_rewrite_ms(messages, path, args.rewrite_samples):.1f}"
+        print(
+            f"{size:>10} {statistics.fmean(latencies):>10.0f}"
+            f" {latencies[len(latencies) // 2]:>10.0f}"
+            f" {latencies[int(len(latencies) * 0.99)]:>10.0f} {rewrite:>11}"
+        )
+    blackboard.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000, 100_000]
+    )
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--backend", choices=("jsonl", "sqlite"), default="jsonl")
+    parser.add_argument("--fsync-policy", choices=FSYNC_POLICIES, default="batch")
+    parser.add_argument(
+        "--rewrite-samples",
+        type=int,
+        default=3,
+        help="full-board rewrites timed per size (0 skips the baseline)",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(_measure(args, directory))
+
+
+if __name__ == "__main__":
+    main()
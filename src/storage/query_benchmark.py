@@ -0,0 +1,99 @@
+"""Time task, id and type lookups on a large blackboard.
+
+The board is filled with synthetic demands (see `storage.benchmark`) and
+each lookup is timed through the `Blackboard` API, next to the scan the
+status endpoints used to run: every message's content searched for the
+demand text.
+
+Usage (from the src directory):
+    python -m storage.query_benchmark --messages 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from blackboard import Blackboard
+from storage.benchmark import PIPELINE, synthetic_lines
+from storage.memory import MemoryStorage
+from storage.sqlite import SqliteStorage
+
+
+def _make_storage(backend, directory):
+    if backend == "sqlite":
+        return SqliteStorage(os.path.join(directory, "blackboard.db"))
+    return MemoryStorage()
+
+
+async def _timed(label, function, samples):
+    started = time.perf_counter()
+    for sample in samples:
+        result = function(sample)
+        if asyncio.iscoroutine(result):
+            await result
+    elapsed = (time.perf_counter() - started) / len(samples)
+    print(f"{label:<36} {elapsed * 1e6:12.1f} us")
+
+
+async def _measure(args, directory):
+    storage = _make_storage(args.backend, directory)
+    storage.load()
+    started = time.perf_counter()
+    for line in synthetic_lines(args.messages):
+        storage.apply(("append", json.loads(line)))
+    storage.flush()
+    print(
+        f"backend={args.backend}: {args.messages} messages loaded in"
+        f" {time.perf_counter() - started:.1f} s"
+    )
+    blackboard = Blackboard(storage=storage)
+
+    rng = random.Random(1)
+    demand_ids = [f"{i:08x}" for i in range(0, args.messages, len(PIPELINE))]
+    demands = rng.sample(demand_ids, min(args.lookups, len(demand_ids)))
+    task_ids = [blackboard.storage.get(demand_id)["task_id"] for demand_id in demands]
+    scan_samples = demands[: args.scans]
+
+    def substring_scan(demand_id):
+        # What get_demand_status did before the task index
+        demand_text = blackboard.storage.get(demand_id)["content"]
+        return [
+            message
+            for message in blackboard.messages
+            if demand_text in str(message["content"])
+        ]
+
+    await _timed("status by substring scan (baseline)", substring_scan, scan_samples)
+    await _timed("get_by_task", blackboard.get_by_task, task_ids)
+    await _timed("get_by_id", blackboard.get_by_id, demands)
+    await _timed("get_tasks", blackboard.get_tasks, task_ids)
+    await _timed(
+        "get_page(type=demand, limit=50)",
+        lambda _: blackboard.get_page(filters={"type": "demand"}, limit=50),
+        task_ids,
+    )
+    blackboard.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument(
+        "--scans", type=int, default=20, help="lookups timed with the slow baseline"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(_measure(args, directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import json
+import sys
+import tempfile
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+
+# Message fields with a slot of their own, in the order a message dict has them
+FIELDS = ("id", "sender", "content", "type", "timestamp", "task_id")
+# Fields whose few distinct values repeat across the whole board
+INTERNED_FIELDS = ("sender", "type", "task_id")
+
+# Slot value of a field the message does not have
+_MISSING = object()
+
+
+def to_epoch(timestamp):
+    """Seconds since the epoch of an ISO timestamp (naive ones are local time)."""
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+class ContentRef:
+    """Location of a message body stored out of line in a `ContentStore`."""
+
+    __slots__ = ("store", "offset", "length")
+
+    def __init__(self, store, offset, length):
+        self.store = store
+        self.offset = offset
+        self.length = length
+
+    def load(self):
+        return self.store.read(self)
+
+
+class ContentStore:
+    """Scratch file holding message bodies too large to keep in memory.
+
+    Bodies of at least `threshold` bytes (JSON-encoded) are appended to the
+    file and replaced in the record by a `ContentRef`; they are read back on
+    access, which mostly hits the OS page cache. The file only mirrors what
+    the storage engine already persists, so it is an anonymous temporary
+    file in `directory` (the system default if None), private to this store
+    and removed when closed. Space of deleted messages is reclaimed on the
+    next start.
+    """
+
+    def __init__(self, directory=None, threshold=1024):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._file = tempfile.TemporaryFile(prefix="blackboard-content-", dir=directory)
+        self._size = 0
+        self._entries = 0
+
+    def put(self, content):
+        """Return `content` itself if it is small, else a reference to it."""
+        if isinstance(content, str) and len(content) < self.threshold // 4:
+            # Can't reach the threshold even at 4 bytes per character
+            return content
+        data = json.dumps(content).encode("utf-8")
+        if len(data) < self.threshold:
+            return content
+
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._size += len(data)
+            self._entries += 1
+        return ContentRef(self, offset, len(data))
+
+    def read(self, ref):
+        with self._lock:
+            self._file.seek(ref.offset)
+            data = self._file.read(ref.length)
+        return json.loads(data)
+
+    def stats(self):
+        return {"entries": self._entries, "bytes": self._size}
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class MessageRecord(MutableMapping):
+    """Compact in-memory form of a blackboard message that behaves like a dict.
+
+    The common fields live in slots instead of a per-message dict: sender,
+    type and task id are interned so every message shares one copy of each
+    value, the timestamp is kept as epoch seconds (`epoch`, also used for
+    range lookups) and turned back into the original ISO string on access,
+    and a large body may be a `ContentRef` loaded on access. Any other field
+    goes into a small `extra` dict.
+    """
+
+    __slots__ = ("id", "sender", "_content", "type", "epoch", "_timestamp",
+                 "task_id", "extra")  # fmt: skip
+
+    def __init__(self, message=(), content_store=None):
+        self.id = self.sender = self.type = self.task_id = _MISSING
+        self._content = _MISSING
+        self.epoch = None
+        # Original text of the timestamp, kept only when `epoch` can't give it back
+        self._timestamp = _MISSING
+        self.extra = None
+        for field, value in message.items():
+            self._set(field, value, content_store)
+
+    @classmethod
+    def from_message(cls, message, content_store=None):
+        """Wrap a message dict, or return it unchanged if it is already a record."""
+        if isinstance(message, cls):
+            return message
+        return cls(message, content_store)
+
+    def _set(self, field, value, content_store=None):
+        if field == "content":
+            self._content = (
+                content_store.put(value) if content_store is not None else value
+            )
+        elif field == "timestamp":
+            self._set_timestamp(value)
+        elif field in FIELDS:
+            if field in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, field, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+
+    def _set_timestamp(self, value):
+        self._timestamp = _MISSING
+        try:
+            self.epoch = to_epoch(value)
+        except (TypeError, ValueError):
+            # Not an ISO timestamp: sorts first and keeps its text
+            self.epoch = 0.0
+            self._timestamp = value
+            return
+        # Keep the text when it doesn't survive the round trip (e.g. a time
+        # zone offset or a date without time)
+        if datetime.fromtimestamp(self.epoch).isoformat() != value:
+            self._timestamp = value
+
+    def _get_timestamp(self):
+        if self._timestamp is not _MISSING:
+            return self._timestamp
+        return datetime.fromtimestamp(self.epoch).isoformat()
+
+    def _slot(self, field):
+        if field == "content":
+            content = self._content
+            if type(content) is ContentRef:
+                return content.load()
+            return content
+        if field == "timestamp":
+            return _MISSING if self.epoch is None else self._get_timestamp()
+        return getattr(self, field)
+
+    def __getitem__(self, field):
+        if field in FIELDS:
+            value = self._slot(field)
+            if value is not _MISSING:
+                return value
+        elif self.extra is not None and field in self.extra:
+            return self.extra[field]
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        store = None
+        if field == "content" and type(self._content) is ContentRef:
+            # Updated bodies go to the store the old one came from
+            store = self._content.store
+        self._set(field, value, store)
+
+    def __delitem__(self, field):
+        if field in FIELDS:
+            if field not in self:
+                raise KeyError(field)
+            if field == "content":
+                self._content = _MISSING
+            elif field == "timestamp":
+                self.epoch, self._timestamp = None, _MISSING
+            else:
+                setattr(self, field, _MISSING)
+        elif self.extra is not None and field in self.extra:
+            del self.extra[field]
+        else:
+            raise KeyError(field)
+
+    def __contains__(self, field):
+        if field == "content":
+            return self._content is not _MISSING
+        if field == "timestamp":
+            return self.epoch is not None
+        if field in FIELDS:
+            return getattr(self, field) is not _MISSING
+        return self.extra is not None and field in self.extra
+
+    def __iter__(self):
+        for field in FIELDS:
+            if field in self:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, field, default=None):
+        # Hot path for lookups and filters: skip the KeyError round trip
+        if field in FIELDS:
+            value = self._slot(field)
+            return default if value is _MISSING else value
+        if self.extra is not None:
+            return self.extra.get(field, default)
+        return default
+
+    def copy(self):
+        """Shallow copy that shares the out-of-line body instead of loading it."""
+        record = MessageRecord.__new__(MessageRecord)
+        for slot in self.__slots__:
+            setattr(record, slot, getattr(self, slot))
+        if self.extra is not None:
+            record.extra = dict(self.extra)
+        return record
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.to_dict())
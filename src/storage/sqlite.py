@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import threading
+import time
+
+from storage.base import StorageEngine
+
+# Message fields stored in their own (indexed) columns; anything else goes
+# into the JSON `extra` column.
+COLUMNS = ("id", "sender", "type", "task_id", "timestamp")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    sender TEXT,
+    type TEXT,
+    task_id TEXT,
+    timestamp TEXT,
+    content TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_type ON messages (type, seq);
+CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages (sender, seq);
+CREATE INDEX IF NOT EXISTS idx_messages_task ON messages (task_id, seq);
+CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id TEXT NOT NULL,
+    fields TEXT,
+    origin TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SqliteStorage(StorageEngine):
+    """SQLite-backed storage with filters pushed down into indexed queries.
+
+    Messages stay on disk instead of in memory, staged writes are committed
+    as one transaction per flush and the database runs in WAL mode, so a
+    crash never leaves a half-written board behind.
+
+    Several processes can share one database. Given an `origin` (a name
+    unique to this process), every write is also recorded in a `changes`
+    table so the other processes can pick it up with `changes_since`.
+    """
+
+    def __init__(self, path, synchronous="NORMAL", origin=None, busy_timeout=30.0):
+        self.path = str(path)
+        self.origin = origin
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=busy_timeout,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(SCHEMA)
+
+    def load(self):
+        # Nothing to preload: every read goes to the database
+        return None
+
+    @staticmethod
+    def _to_row(message):
+        extra = {k: v for k, v in message.items() if k not in COLUMNS + ("content",)}
+        return (
+            *(message.get(column) for column in COLUMNS),
+            json.dumps(message.get("content")),
+            json.dumps(extra),
+        )
+
+    @staticmethod
+    def _from_row(row):
+        message = {column: row[column] for column in COLUMNS}
+        message["content"] = json.loads(row["content"])
+        message.update(json.loads(row["extra"]))
+        return message
+
+    def apply(self, operation):
+        with self._lock:
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN IMMEDIATE")
+            if operation[0] == "append":
+                message = operation[1]
+                self._conn.execute(
+                    "INSERT INTO messages (id, sender, type, task_id, timestamp, content, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._to_row(message),
+                )
+                self._record_change(message["id"], None)
+                return message
+            if operation[0] == "delete":
+                return self._delete(operation[1])
+
+            _, message_id, changes = operation
+            row = self._conn.execute(
+                "SELECT * FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            message = self._from_row(row)
+            message.update(changes)
+            self._conn.execute(
+                "UPDATE messages SET sender = ?, type = ?, task_id = ?, "
+                "timestamp = ?, content = ?, extra = ? WHERE id = ?",
+                (*self._to_row(message)[1:], message_id),
+            )
+            self._record_change(message_id, sorted(changes))
+            return message
+
+    def _delete(self, message_ids):
+        removed = []
+        message_ids = list(message_ids)
+        # Chunked to stay under SQLite's limit on query parameters
+        for start in range(0, len(message_ids), 500):
+            chunk = message_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT * FROM messages WHERE id IN ({placeholders}) ORDER BY seq",
+                chunk,
+            ).fetchall()
+            self._conn.execute(
+                f"DELETE FROM messages WHERE id IN ({placeholders})", chunk
+            )
+            removed.extend(self._from_row(row) for row in rows)
+        return removed
+
+    def _record_change(self, message_id, fields):
+        if self.origin is not None:
+            self._conn.execute(
+                "INSERT INTO changes (message_id, fields, origin, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    message_id,
+                    json.dumps(fields) if fields is not None else None,
+                    self.origin,
+                    time.time(),
+                ),
+            )
+
+    def last_change(self):
+        """Sequence number of the latest recorded change (0 if none)."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM changes").fetchone()
+        return row[0] or 0
+
+    def changes_since(self, seq, limit=500):
+        """Writes made by other processes after change `seq`.
+
+        Returns `(last_seq, changes)`, where each change is an operation in
+        the form taken by `apply` (for updates only the changed field names
+        are known, with None values) paired with the message as it is now.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT changes.seq AS change_seq, changes.fields, changes.origin, "
+                "messages.* FROM changes "
+                "LEFT JOIN messages ON messages.id = changes.message_id "
+                "WHERE changes.seq > ? ORDER BY changes.seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+
+        changes = []
+        for row in rows:
+            seq = row["change_seq"]
+            if row["origin"] == self.origin or row["id"] is None:
+                continue
+            message = self._from_row(row)
+            if row["fields"] is None:
+                changes.append((("append", message), message))
+            else:
+                fields = dict.fromkeys(json.loads(row["fields"]))
+                changes.append((("update", message["id"], fields), message))
+        return seq, changes
+
+    def prune_changes(self, max_age):
+        """Drop change records older than `max_age` seconds."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM changes WHERE created_at < ?", (time.time() - max_age,)
+            )
+
+    def flush(self):
+        with self._lock:
+            if not self._conn.in_transaction:
+                return
+            try:
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def append_many(self, messages):
+        """Insert several messages in one transaction (used by migrations)."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO messages "
+                    "(id, sender, type, task_id, timestamp, content, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._to_row(message) for message in messages],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get(self, message_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def find(self, field, value):
+        return self.query(filters={field: value})
+
+    def range(self, since=None, until=None):
+        return self.query(since=since, until=until)
+
+    def query(self, filters=None, since=None, until=None, after=None, limit=None):
+        clauses, params = [], []
+        for field, value in (filters or {}).items():
+            column = field if field in COLUMNS else f"json_extract(extra, '$.{field}')"
+            if value is None:
+                clauses.append(f"{column} IS NULL")
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if after is not None:
+            clauses.append("seq > ?")
+            params.append(self._cursor_seq(after))
+
+        sql = "SELECT * FROM messages"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def seq(self, message_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seq FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+        return row["seq"] if row is not None else None
+
+    def _cursor_seq(self, after):
+        if isinstance(after, int):
+            return after
+        seq = self.seq(after)
+        if seq is None:
+            raise ValueError(f"Unknown cursor message id '{after}'")
+        return seq
+
+    def all(self):
+        return self.query()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread that owns every write to a storage engine.
+
+    Operations (see `StorageEngine.apply`) are submitted from any thread or
+    event loop and answered through a `concurrent.futures.Future`. The writer
+    drains whatever is queued, up to `max_batch` operations, applies them to
+    the engine under `state_lock` (the lock readers take), then persists the
+    whole batch with one `flush` outside the lock. Concurrent posters thus
+    share a single disk write and never touch the storage themselves.
+
+    `on_commit` is called from the writer thread with the `(operation,
+    result)` pairs of each batch before its futures are resolved.
+    """
+
+    def __init__(self, storage, state_lock, max_batch=256, on_commit=None):
+        self.storage = storage
+        self.state_lock = state_lock
+        self.max_batch = max_batch
+        self.on_commit = on_commit
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._stats = {"operations": 0, "batches": 0, "largest_batch": 0}
+
+    def submit(self, operation):
+        """Queue one operation; the future resolves once it is persisted."""
+        if self._closed:
+            raise RuntimeError("Blackboard writer is closed")
+        self._ensure_started()
+        future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def _ensure_started(self):
+        # Started on first use, so boards that are never written cost no thread
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="blackboard-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            if item is _STOP:
+                return
+
+    def _commit(self, batch):
+        # Posters whose callers gave up before the write started are dropped
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+
+        applied = []
+        with self.state_lock:
+            for operation, future in batch:
+                try:
+                    applied.append((operation, future, self.storage.apply(operation)))
+                except Exception as e:
+                    future.set_exception(e)
+
+        error = None
+        try:
+            self.storage.flush()
+        except Exception as e:
+            error = e
+            logging.error(
+                f"[BLACKBOARD_FLUSH_ERROR] Error persisting {len(applied)} operations: {e}"
+            )
+
+        self._stats["operations"] += len(batch)
+        self._stats["batches"] += 1
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+        if self.on_commit is not None:
+            try:
+                self.on_commit(
+                    [(operation, result) for operation, _, result in applied]
+                )
+            except Exception as e:
+                logging.error(f"[BLACKBOARD_COMMIT_ERROR] Commit callback failed: {e}")
+
+        for _, future, result in applied:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self):
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "average_batch": (
+                round(self._stats["operations"] / batches, 2) if batches else 0.0
+            ),
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self):
+        """Commit everything already queued and stop the writer thread."""
+        with self._start_lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from pydantic import BaseModel
+
+from core.agent_cache import AgentRunCache
+
+NOW = 1_000_000.0
+
+
+class Plan(BaseModel):
+    summary: str
+    steps: list[str]
+
+
+def agent(instructions="Analise a demanda."):
+    return SimpleNamespace(name="head", model="gpt-4o", instructions=instructions)
+
+
+def at(moment):
+    return mock.patch("core.agent_cache.time.time", return_value=moment)
+
+
+class AgentRunCacheTest(unittest.TestCase):
+    def test_key_normalizes_the_prompt_and_follows_the_agent(self):
+        key = AgentRunCache.key(agent(), "Quero contratar  o Bryan")
+        self.assertEqual(AgentRunCache.key(agent(), " quero CONTRATAR o bryan "), key)
+        self.assertNotEqual(
+            AgentRunCache.key(agent("Outra."), "quero contratar o bryan"), key
+        )
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AgentRunCache(max_entries=2)
+        cache.put("a", "output a")
+        cache.put("b", "output b")
+        self.assertEqual(cache.get("a"), "output a")
+        cache.put("c", "output c")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "output a")
+        self.assertEqual(cache.get("c"), "output c")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_entries_expire_after_ttl(self):
+        cache = AgentRunCache(ttl=60)
+        with at(NOW):
+            cache.put("a", "output a")
+        with at(NOW + 59):
+            self.assertEqual(cache.get("a"), "output a")
+        with at(NOW + 60):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+
+class AgentRunCacheDiskTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "agent_cache.db")
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache._disk.close()
+        self.directory.cleanup()
+
+    def make_cache(self, **kwargs):
+        cache = AgentRunCache(disk_path=self.path, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_outputs_survive_a_restart(self):
+        plan = Plan(summary="Contratar", steps=["Buscar perfis", "Entrevistar"])
+        self.make_cache().put("plan", plan)
+        self.make_cache().put("text", "texto")
+
+        cache = self.make_cache()
+        self.assertEqual(cache.get("plan", output_type=Plan), plan)
+        self.assertEqual(cache.get("text"), "texto")
+        # Promoted to memory
+        self.assertEqual(cache.get("text"), "texto")
+        self.assertEqual(cache.stats()["disk_hits"], 2)
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+
+    def test_disk_entries_keep_their_expiry(self):
+        with at(NOW):
+            self.make_cache(ttl=60).put("a", "output a")
+
+        cache = self.make_cache(ttl=60)
+        with at(NOW + 30):
+            self.assertEqual(cache.get("a"), "output a")
+        with at(NOW + 61):
+            self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+
+from storage import MessageArchive
+
+
+def message(message_id, type_, task_id, sender, timestamp):
+    return {
+        "id": message_id,
+        "sender": sender,
+        "content": f"content of {message_id}",
+        "type": type_,
+        "timestamp": timestamp,
+        "task_id": task_id,
+    }
+
+
+class MessageArchiveQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # Tiny segments: every append starts a new one
+        self.archive = MessageArchive(self.directory.name, segment_max_bytes=1)
+        self.archive.append(
+            [
+                message("m0", "system_log", None, "system", "2026-01-01T00:00:00"),
+                message("m1", "demand", "task-1", "director", "2026-01-02T00:00:00"),
+            ]
+        )
+        self.archive.append(
+            [
+                message(
+                    "m2", "partial_output", "task-2", "head", "2026-01-03T00:00:00"
+                ),
+                message("m3", "demand", "task-2", "director", "2026-01-04T00:00:00"),
+            ]
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def ids(self, **kwargs):
+        return [m["id"] for m in self.archive.query(**kwargs)]
+
+    def test_without_filters(self):
+        self.assertEqual(self.archive.stats()["segments"], 2)
+        self.assertEqual(self.ids(), ["m0", "m1", "m2", "m3"])
+        self.assertEqual(self.ids(filters={}), ["m0", "m1", "m2", "m3"])
+
+    def test_each_filter(self):
+        self.assertEqual(self.ids(filters={"type": "demand"}), ["m1", "m3"])
+        self.assertEqual(self.ids(filters={"task_id": "task-2"}), ["m2", "m3"])
+        self.assertEqual(self.ids(filters={"sender": "system"}), ["m0"])
+        self.assertEqual(
+            self.ids(filters={"type": "demand", "task_id": "task-1"}), ["m1"]
+        )
+        self.assertEqual(self.ids(filters={"type": "missing"}), [])
+        self.assertEqual(self.ids(since="2026-01-03T00:00:00"), ["m2", "m3"])
+        self.assertEqual(self.ids(until="2026-01-01T12:00:00"), ["m0"])
+        self.assertEqual(self.ids(limit=1), ["m0"])
+
+    def test_none_is_no_constraint(self):
+        for field in ("type", "task_id", "sender"):
+            with self.subTest(field=field):
+                self.assertEqual(
+                    self.ids(filters={field: None}), ["m0", "m1", "m2", "m3"]
+                )
+        self.assertEqual(
+            self.ids(filters={"type": "demand", "task_id": None}), ["m1", "m3"]
+        )
+        self.assertEqual(self.ids(since=None, until=None), ["m0", "m1", "m2", "m3"])
+
+    def test_latest_version_wins(self):
+        self.archive.append(
+            [
+                {
+                    **message(
+                        "m1", "demand", "task-1", "director", "2026-01-02T00:00:00"
+                    ),
+                    "type": "demand_processed",
+                }
+            ]
+        )
+        self.assertEqual(self.ids(filters={"type": "demand"}), ["m3"])
+        self.assertEqual(self.archive.get("m1")["type"], "demand_processed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from blackboard import Blackboard
+from storage import MemoryStorage
+
+
+class BlackboardPagingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.blackboard = Blackboard(storage=MemoryStorage())
+        self.ids = [
+            await self.blackboard.post(
+                sender="director", content=str(i), type_="demand"
+            )
+            for i in range(5)
+        ]
+
+    async def asyncTearDown(self):
+        self.blackboard.close()
+
+    async def test_cursor_survives_deleted_message(self):
+        page = await self.blackboard.get_page(limit=2)
+        self.assertEqual([m["id"] for m in page["messages"]], self.ids[:2])
+        # e.g. retention archiving the last message of the page
+        await self.blackboard.delete([self.ids[1]])
+
+        page = await self.blackboard.get_page(cursor=page["next_cursor"], limit=2)
+        self.assertEqual([m["id"] for m in page["messages"]], self.ids[2:4])
+
+    async def test_bare_message_id_cursor(self):
+        page = await self.blackboard.get_page(cursor=self.ids[2], limit=10)
+        self.assertEqual([m["id"] for m in page["messages"]], self.ids[3:])
+        self.assertIsNone(page["next_cursor"])
+        with self.assertRaises(ValueError):
+            await self.blackboard.get_page(cursor="missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from candidates import (
+    CandidateIndex,
+    HttpCandidateSource,
+    LocalCandidateSource,
+    TokenBucket,
+)
+from candidates.stub_server import create_app
+from tests.test_candidates import PROFILES
+
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50, capacity=3)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        self.assertLess(time.monotonic() - started, 0.02)
+
+        # Two more tokens at 50 per second
+        for _ in range(2):
+            await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.035)
+
+
+class HttpCandidateSourceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.index = CandidateIndex.build(
+            PROFILES + [{"name": "Davi A/B", "title": "QA", "experience": 2}]
+        )
+        self.app = create_app(self.index)
+        self.source = self.make_source(httpx.ASGITransport(app=self.app))
+
+    async def asyncTearDown(self):
+        await self.source.close()
+
+    def make_source(self, transport, **kwargs):
+        return HttpCandidateSource(
+            "http://candidates.test",
+            rate=1000,
+            burst=1000,
+            backoff=0,
+            transport=transport,
+            **kwargs,
+        )
+
+    async def test_same_answers_as_the_local_index(self):
+        local = LocalCandidateSource(self.index)
+        query = {"role": "Engineer", "skills": ["Go", "React"], "location": "SP"}
+        self.assertEqual(
+            await self.source.search(**query, page_size=1),
+            await local.search(**query, page_size=1),
+        )
+        self.assertEqual(
+            await self.source.get_profile("Davi A/B"),
+            await local.get_profile("Davi A/B"),
+        )
+        self.assertEqual(
+            await self.source.get_availability("carla souza"),
+            {"name": "Carla Souza", "status": "Open to work"},
+        )
+        self.assertIsNone(await self.source.get_profile("Nobody"))
+
+    async def test_identical_lookups_share_one_request(self):
+        profiles = await asyncio.gather(
+            *(self.source.get_profile("Ana Lima") for _ in range(5))
+        )
+        self.assertEqual({p["name"] for p in profiles}, {"Ana Lima"})
+        self.assertEqual(self.app.state.requests, 1)
+        self.assertEqual(self.source.stats()["coalesced"], 4)
+
+        await self.source.get_profile("Ana Lima")
+        self.assertEqual(self.app.state.requests, 1)
+        self.assertEqual(self.source.stats()["cache_hits"], 1)
+
+    async def test_cache_entries_expire(self):
+        source = self.make_source(httpx.ASGITransport(app=self.app), cache_ttl=0)
+        await source.get_profile("Ana Lima")
+        await source.get_profile("Ana Lima")
+        await source.close()
+        self.assertEqual(self.app.state.requests, 2)
+
+    async def test_unavailable_api_is_retried(self):
+        responses = [
+            httpx.Response(503, headers={"Retry-After": "0"}),
+            httpx.Response(429),
+            httpx.Response(200, json={"name": "Ana Lima"}),
+        ]
+        source = self.make_source(httpx.MockTransport(lambda _: responses.pop(0)))
+
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(await source.get_profile("Ana Lima"), {"name": "Ana Lima"})
+        self.assertEqual(source.stats()["requests"], 3)
+        self.assertEqual(source.stats()["retries"], 2)
+        await source.close()
+
+    async def test_gives_up_after_max_retries(self):
+        def broken(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        source = self.make_source(httpx.MockTransport(broken), max_retries=2)
+        with self.assertLogs(level="WARNING"):
+            with self.assertRaises(RuntimeError) as raised:
+                await source.get_profile("Ana Lima")
+            self.assertIn("after 3 attempts", str(raised.exception))
+            # A failure is not cached
+            with self.assertRaises(RuntimeError):
+                await source.get_profile("Ana Lima")
+        self.assertEqual(source.stats()["requests"], 6)
+        await source.close()
+
+    async def test_client_errors_are_not_retried(self):
+        source = self.make_source(httpx.MockTransport(lambda _: httpx.Response(400)))
+        with self.assertRaises(httpx.HTTPStatusError):
+            await source.search(role="Engineer")
+        self.assertEqual(source.stats()["requests"], 1)
+        await source.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from candidates import CandidateIndex, rank_candidates
+
+PROFILES = [
+    {
+        "name": "Ana Lima",
+        "title": "Backend Engineer",
+        "experience": "6 years",
+        "skills": "Go, Kubernetes, PostgreSQL",
+        "location": "São Paulo, SP",
+    },
+    {
+        "name": "Bruno Costa",
+        "title": "Data Scientist",
+        "experience": "4 years",
+        "skills": "R, Python, AI",
+        "location": "Campinas, SP",
+    },
+    {
+        "name": "Carla Souza",
+        "title": "Frontend Engineer",
+        "experience": "8 years",
+        "skills": "React, TypeScript",
+        "location": "Rio de Janeiro, RJ",
+        "availability": "Open to work",
+    },
+]
+
+
+class CandidateIndexSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.index = CandidateIndex.build(PROFILES)
+
+    def names(self, result):
+        return [profile["name"] for profile in result["results"]]
+
+    def test_role_and_skills_rank_matching_profiles(self):
+        result = self.index.search(
+            role="Backend Engineer", skills=["Go", "Python"], offset=1, limit=1
+        )
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(self.names(result), ["Bruno Costa"])
+        everyone = self.index.search(role="Backend Engineer", skills=["Go", "Python"])
+        self.assertEqual([p["score"] for p in everyone["results"]], [3.5, 1.5, 1.0])
+
+    def test_experience_range_without_criteria(self):
+        result = self.index.search(min_experience=5)
+        # Most experienced first when nothing else is scored
+        self.assertEqual(self.names(result), ["Carla Souza", "Ana Lima"])
+        result = self.index.search(min_experience=5, max_experience=6)
+        self.assertEqual(self.names(result), ["Ana Lima"])
+
+    def test_get_by_name(self):
+        profile = self.index.get("  carla SOUZA ")
+        self.assertEqual(profile["skills"], ["React", "TypeScript"])
+        self.assertEqual(profile["experience"], "8 years")
+        self.assertEqual(profile["availability"], "Open to work")
+        self.assertEqual(self.index.get("Ana Lima")["availability"], "Unknown")
+        self.assertIsNone(self.index.get("Nobody"))
+
+    def test_location_with_state_matches_indexed_parts(self):
+        result = self.index.search(location="São Paulo, SP")
+        self.assertEqual(self.names(result), ["Ana Lima", "Bruno Costa"])
+        self.assertEqual([p["score"] for p in result["results"]], [1.0, 0.5])
+
+
+class CandidateIndexStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv_export_saved_and_memory_mapped(self):
+        source = os.path.join(self.directory.name, "candidates.csv")
+        with open(source, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(PROFILES[2]))
+            writer.writeheader()
+            writer.writerows(PROFILES)
+        built = CandidateIndex.open(source)
+        target = os.path.join(self.directory.name, "candidate_index")
+        built.save(target)
+
+        loaded = CandidateIndex.open(target)
+        self.assertIsInstance(loaded.experience, np.memmap)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.get("Bruno Costa"), built.get("Bruno Costa"))
+        self.assertEqual(
+            loaded.search(role="Engineer", location="SP"),
+            built.search(role="Engineer", location="SP"),
+        )
+
+
+class RankCandidatesTest(unittest.TestCase):
+    def setUp(self):
+        self.index = CandidateIndex.build(PROFILES)
+
+    def test_every_candidate_scored_with_breakdown(self):
+        result = rank_candidates(
+            self.index,
+            "Frontend Engineer com React no Rio de Janeiro",
+            min_experience=5,
+        )
+
+        self.assertEqual(result["evaluated"], 3)
+        self.assertEqual(
+            result["criteria"],
+            {
+                "skills": ["react"],
+                "title_words": ["engineer", "frontend"],
+                "locations": ["janeiro", "rio", "rio de janeiro"],
+                "min_experience": 5,
+            },
+        )
+        best = result["candidates"][0]
+        self.assertEqual(best["name"], "Carla Souza")
+        self.assertEqual(best["score"], 1.0)
+        self.assertEqual(set(best["breakdown"].values()), {1.0})
+        # Below the minimum experience: ranked after everyone who meets it
+        self.assertEqual(
+            [c["name"] for c in result["candidates"][1:]], ["Ana Lima", "Bruno Costa"]
+        )
+        self.assertLess(result["candidates"][2]["score"], 0)
+
+    def test_short_skills_are_criteria(self):
+        result = rank_candidates(
+            self.index, "Precisamos de alguém com Go, R e AI em SP", top_k=1
+        )
+        self.assertEqual(sorted(result["criteria"]["skills"]), ["ai", "go", "r"])
+        # Short places and title words still are not
+        self.assertEqual(result["criteria"]["locations"], [])
+        self.assertEqual(result["candidates"][0]["name"], "Bruno Costa")
+
+
+if __name__ == "__main__":
+    unittest.main()
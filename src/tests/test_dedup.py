@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+from core.dedup import DemandDeduplicator
+
+DEMAND = "Quero contratar um desenvolvedor Python sênior para o time de dados"
+
+
+def demand(demand_id, content=DEMAND):
+    return {"id": demand_id, "content": content}
+
+
+class DemandDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.dedup = DemandDeduplicator(threshold=0.8, window=60)
+
+    def test_near_duplicate_matches_its_primary(self):
+        self.dedup.register(demand("d1"))
+        self.assertEqual(
+            self.dedup.match(
+                "  QUERO contratar um desenvolvedor Python sênior para o time de dados!"
+            ),
+            "d1",
+        )
+        self.assertIsNone(
+            self.dedup.match("Preciso de um designer de produto em Lisboa")
+        )
+
+    def test_duplicates_wait_for_the_primary(self):
+        self.dedup.register(demand("d1"))
+        self.assertFalse(self.dedup.link("d1", demand("d2")))
+        self.assertFalse(self.dedup.link("d1", demand("d3")))
+
+        linked = self.dedup.complete("d1")
+        self.assertEqual([d["id"] for d in linked], ["d2", "d3"])
+        self.assertEqual(self.dedup.primary("d1")["id"], "d1")
+        # Arriving after completion: the result can be fanned out right away
+        self.assertTrue(self.dedup.link("d1", demand("d4")))
+        self.assertEqual(self.dedup.stats()["coalesced"], 3)
+
+    def test_failed_primary_releases_its_duplicates(self):
+        self.dedup.register(demand("d1"))
+        self.dedup.link("d1", demand("d2"))
+
+        self.assertEqual([d["id"] for d in self.dedup.release("d1")], ["d2"])
+        self.assertIsNone(self.dedup.match(DEMAND))
+        self.assertEqual(self.dedup.release("d1"), [])
+
+    def test_only_completed_primaries_expire(self):
+        with mock.patch("core.dedup.time.time", return_value=1000.0):
+            self.dedup.register(demand("running"))
+            self.dedup.register(demand("done", DEMAND + " com inglês"))
+            self.dedup.complete("done")
+
+        with mock.patch("core.dedup.time.time", return_value=1061.0):
+            self.assertEqual(self.dedup.match(DEMAND), "running")
+            self.assertEqual(self.dedup.stats()["tracked"], 1)
+
+    def test_zero_window_disables_deduplication(self):
+        dedup = DemandDeduplicator(window=0)
+        dedup.register(demand("d1"))
+        self.assertIsNone(dedup.match(DEMAND))
+        self.assertEqual(dedup.stats()["tracked"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
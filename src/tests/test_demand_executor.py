@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from core.demand_executor import DemandExecutor
+
+
+def demand(demand_id, department="RH", priority="normal", task_id=None):
+    return {
+        "id": demand_id,
+        "department": department,
+        "priority": priority,
+        "task_id": task_id or demand_id,
+    }
+
+
+class DemandExecutorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.release = asyncio.Event()
+        self.started = []
+        self.finished = []
+        self.executor = None
+
+    async def asyncTearDown(self):
+        if self.executor is not None:
+            await self.executor.stop()
+
+    async def pipeline(self, demand):
+        self.started.append(demand["id"])
+        await self.release.wait()
+        if demand.get("fail"):
+            raise RuntimeError("pipeline broke")
+        self.finished.append(demand["id"])
+
+    async def make_executor(self, **kwargs):
+        self.executor = DemandExecutor(self.pipeline, **kwargs)
+        await self.executor.start()
+        return self.executor
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def drain(self):
+        self.release.set()
+        while self.executor.stats()["in_flight"] or len(self.executor.scheduler):
+            self.executor.slot_freed.clear()
+            await asyncio.wait_for(self.executor.slot_freed.wait(), 1)
+
+    async def test_runs_at_most_workers_demands_at_once(self):
+        executor = await self.make_executor(workers=2)
+        for i in range(5):
+            executor.submit(demand(f"d{i}"))
+        await self.settle()
+
+        self.assertEqual(self.started, ["d0", "d1"])
+        self.assertEqual(executor.stats()["queue_depth"], 3)
+        self.assertEqual(executor.free_slots, 0)
+
+        await self.drain()
+        self.assertEqual(sorted(self.finished), [f"d{i}" for i in range(5)])
+        self.assertEqual(executor.stats()["processed"], 5)
+
+    async def test_saturated_department_does_not_block_the_queue(self):
+        executor = await self.make_executor(workers=3, department_limits={"RH": 1})
+        executor.submit(demand("rh-1", priority="urgent"))
+        executor.submit(demand("rh-2", priority="urgent"))
+        executor.submit(demand("ti-1", department="TI", priority="low"))
+        await self.settle()
+
+        self.assertEqual(self.started, ["rh-1", "ti-1"])
+        self.assertEqual(
+            executor.stats()["in_flight_by_department"], {"RH": 1, "TI": 1}
+        )
+        await self.drain()
+        self.assertEqual(self.started[-1], "rh-2")
+
+    async def test_cancel_drops_queued_and_running_demands_of_a_task(self):
+        executor = await self.make_executor(workers=1)
+        executor.submit(demand("a-1", task_id="a"))
+        executor.submit(demand("a-2", task_id="a"))
+        executor.submit(demand("b-1", task_id="b"))
+        await self.settle()
+
+        self.assertEqual(executor.cancel("a"), 2)
+        await self.drain()
+        self.assertEqual(self.started, ["a-1", "b-1"])
+        self.assertEqual(self.finished, ["b-1"])
+
+    async def test_failed_pipeline_is_counted_and_frees_its_slot(self):
+        executor = await self.make_executor(workers=1)
+        executor.submit(demand("bad") | {"fail": True})
+        executor.submit(demand("good"))
+
+        with self.assertLogs(level="ERROR"):
+            await self.drain()
+        self.assertEqual(self.finished, ["good"])
+        self.assertEqual(executor.stats()["failed"], 1)
+        self.assertEqual(executor.stats()["processed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
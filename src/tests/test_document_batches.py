@@ -0,0 +1,181 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import zipfile
+
+from blackboard import Blackboard
+from core.document_batches import ArchiveTooLarge, DocumentBatchManager, check_archive
+from storage import MemoryStorage
+
+
+def make_zip(path, entries):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return path
+
+
+class CheckArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_archive_within_limits_passes(self):
+        archive = make_zip(self.path("ok.zip"), {"a.pdf": b"%PDF", "b.pdf": b"%PDF"})
+        check_archive(archive, max_entries=2, max_bytes=8)
+
+    def test_too_many_entries(self):
+        archive = make_zip(
+            self.path("many.zip"), {f"{i}.pdf": b"%PDF" for i in range(3)}
+        )
+        with self.assertRaises(ValueError) as raised:
+            check_archive(archive, max_entries=2, max_bytes=1 << 20)
+        self.assertNotIsInstance(raised.exception, ArchiveTooLarge)
+
+    def test_uncompressed_size_is_checked(self):
+        # A few KB on disk, a MB once extracted
+        archive = make_zip(self.path("bomb.zip"), {"a.pdf": bytes(1 << 20)})
+        self.assertLess(os.path.getsize(archive), 1 << 16)
+        with self.assertRaises(ArchiveTooLarge):
+            check_archive(archive, max_entries=10, max_bytes=1 << 19)
+
+    def test_not_a_zip(self):
+        with open(self.path("fake.zip"), "wb") as f:
+            f.write(b"%PDF-1.4")
+        with self.assertRaises(ValueError):
+            check_archive(self.path("fake.zip"), max_entries=10, max_bytes=1 << 20)
+
+
+class FakeConverterPool:
+    """Converts a "PDF" holding its page count; "broken" files fail."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def convert_file(self, path, name):
+        await self.release.wait()
+        if "broken" in name:
+            raise RuntimeError("not a PDF")
+        with open(path) as f:
+            pages = int(f.read())
+        return {"markdown": f"# {name}", "pages": pages}
+
+
+class DocumentBatchConversionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pool = FakeConverterPool()
+        self.blackboard = Blackboard(storage=MemoryStorage())
+        self.manager = DocumentBatchManager(
+            self.pool,
+            self.blackboard,
+            upload_dir=self.directory.name,
+            max_archive_bytes=64,
+        )
+
+    async def asyncTearDown(self):
+        await self.manager.shutdown()
+        self.blackboard.close()
+        self.directory.cleanup()
+
+    def upload(self, directory, files):
+        # Stored with an ordering prefix, as by the upload route
+        for index, (name, data) in enumerate(files.items()):
+            path = os.path.join(directory, f"{index:05d}_{name}")
+            if name.endswith(".zip"):
+                make_zip(path, data)
+            else:
+                with open(path, "w") as f:
+                    f.write(data)
+
+    async def run_batch(self, files, task_id=None):
+        batch, directory = self.manager.create()
+        self.upload(directory, files)
+        self.manager.start(batch, directory, task_id=task_id)
+        await asyncio.gather(*self.manager._tasks.values(), return_exceptions=True)
+        return batch, directory
+
+    async def test_batch_converts_files_and_archives(self):
+        with self.assertLogs(level="ERROR"):
+            batch, directory = await self.run_batch(
+                {
+                    "a.pdf": "2",
+                    "broken.pdf": "",
+                    "docs.zip": {"b.pdf": "3", "nested/c.PDF": "1", "notes.txt": "x"},
+                },
+                task_id="task-1",
+            )
+
+        self.assertEqual(batch["state"], "completed")
+        self.assertEqual(
+            (batch["total"], batch["completed"], batch["failed"], batch["pages"]),
+            (4, 3, 1, 6),
+        )
+        self.assertEqual(
+            batch["errors"], [{"document": "broken.pdf", "error": "not a PDF"}]
+        )
+        self.assertFalse(os.path.exists(directory))
+
+        page = await self.blackboard.get_page(filters={"type": "document"})
+        documents = {m["filename"]: m for m in page["messages"]}
+        self.assertEqual(sorted(documents), ["a.pdf", "b.pdf", "c.PDF"])
+        self.assertEqual(documents["b.pdf"]["content"], "# b.pdf")
+        self.assertEqual(documents["b.pdf"]["pages"], 3)
+        self.assertEqual(documents["b.pdf"]["batch_id"], batch["batch_id"])
+        self.assertEqual(documents["b.pdf"]["task_id"], "task-1")
+
+    async def test_oversized_archive_fails_the_batch(self):
+        with self.assertLogs(level="ERROR"):
+            batch, _ = await self.run_batch({"docs.zip": {"big.pdf": "1" * 100}})
+
+        self.assertEqual(batch["state"], "failed")
+        self.assertEqual(batch["completed"], 0)
+        self.assertIn("more than the 64 allowed", batch["errors"][0]["error"])
+
+    async def test_shutdown_cancels_running_batches(self):
+        self.pool.release.clear()
+        batch, directory = self.manager.create()
+        self.upload(directory, {"a.pdf": "1"})
+        self.manager.start(batch, directory)
+        await asyncio.sleep(0.01)
+        self.assertEqual(batch["state"], "converting")
+
+        await self.manager.shutdown()
+        self.assertEqual(batch["state"], "cancelled")
+        self.assertIsNotNone(batch["finished_at"])
+
+
+class DocumentBatchEvictionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.manager = DocumentBatchManager(
+            None, None, upload_dir=self.directory.name, max_finished=1
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_batches_still_receiving_are_kept(self):
+        receiving, _ = self.manager.create()
+        finished = []
+        for _ in range(3):
+            batch, directory = self.manager.create()
+            self.manager.abort(batch, directory, "upload failed")
+            finished.append(batch["batch_id"])
+
+        self.assertIs(self.manager.get(receiving["batch_id"]), receiving)
+        self.assertEqual(
+            [batch_id for batch_id in finished if self.manager.get(batch_id)],
+            finished[-1:],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from core.demand_executor import DemandExecutor
+from core.leases import LeaseManager
+
+
+class LeaseManagerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "leases.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_concurrent_claims_from_one_owner_win_once(self):
+        leases = LeaseManager(self.path, owner="node-a", ttl=30)
+        results = await asyncio.gather(
+            leases.claim("demand-1"), leases.claim("demand-1")
+        )
+        self.assertEqual(sorted(results), [False, True])
+        self.assertTrue(leases.holds("demand-1"))
+        # Already held: claiming again must not hand it out a second time
+        self.assertFalse(await leases.claim("demand-1"))
+        leases.close()
+
+    async def test_other_owner_waits_for_release(self):
+        first = LeaseManager(self.path, owner="node-a", ttl=30)
+        second = LeaseManager(self.path, owner="node-b", ttl=30)
+        self.assertTrue(await first.claim("demand-1"))
+        self.assertFalse(await second.claim("demand-1"))
+        await first.release("demand-1")
+        self.assertTrue(await second.claim("demand-1"))
+        first.close()
+        second.close()
+
+    async def test_expired_lease_is_reclaimed(self):
+        first = LeaseManager(self.path, owner="node-a", ttl=0.05)
+        second = LeaseManager(self.path, owner="node-b", ttl=30)
+        self.assertTrue(await first.claim("demand-1"))
+        await asyncio.sleep(0.1)
+        self.assertTrue(await second.claim("demand-1"))
+        self.assertEqual(await first.heartbeat(), ["demand-1"])
+        first.close()
+        second.close()
+
+    async def test_lost_lease_stops_the_running_pipeline(self):
+        first = LeaseManager(self.path, owner="node-a", ttl=0.05)
+        second = LeaseManager(self.path, owner="node-b", ttl=30)
+        started, finished = asyncio.Event(), []
+
+        async def pipeline(demand):
+            started.set()
+            await asyncio.sleep(1)
+            finished.append(demand["id"])
+
+        executor = DemandExecutor(pipeline, workers=1)
+        await executor.start()
+        self.assertTrue(await first.claim("demand-1"))
+        executor.submit({"id": "demand-1"})
+        await started.wait()
+
+        # node-a misses its renewals and node-b takes the demand over
+        await asyncio.sleep(0.1)
+        self.assertTrue(await second.claim("demand-1"))
+        for key in await first.heartbeat():
+            self.assertTrue(executor.abandon(key))
+        await asyncio.wait_for(executor.slot_freed.wait(), timeout=0.5)
+        self.assertEqual(executor.stats()["in_flight"], 0)
+        self.assertFalse(first.holds("demand-1"))
+        self.assertEqual(finished, [])
+
+        await executor.stop()
+        first.close()
+        second.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import unittest
+
+from storage.records import ContentRef, ContentStore, MessageRecord
+
+
+def message(**fields):
+    return {
+        "id": "m1",
+        "sender": "director",
+        "content": "quero contratar o bryan soares",
+        "type": "demand",
+        "timestamp": "2026-01-02T03:04:05.123456",
+        "task_id": "task-1",
+        **fields,
+    }
+
+
+class MessageRecordTest(unittest.TestCase):
+    def test_behaves_like_the_message_dict(self):
+        original = message(priority="high", tasks=[{"number": 1}])
+        record = MessageRecord(original)
+
+        self.assertEqual(record, original)
+        self.assertEqual(list(record), list(original))
+        self.assertEqual(json.dumps(record.to_dict()), json.dumps(original))
+        self.assertEqual(record["priority"], "high")
+        self.assertEqual(record.get("missing", "default"), "default")
+        with self.assertRaises(KeyError):
+            record["missing"]
+
+    def test_fields_can_be_missing_or_none(self):
+        record = MessageRecord({"id": "m1", "task_id": None, "timestamp": None})
+
+        self.assertEqual(
+            record.to_dict(), {"id": "m1", "task_id": None, "timestamp": None}
+        )
+        self.assertNotIn("sender", record)
+        self.assertIsNone(record.get("sender"))
+        with self.assertRaises(KeyError):
+            record["content"]
+
+    def test_update_and_delete(self):
+        record = MessageRecord(message())
+        record.update({"type": "demand_processed", "response": "ok"})
+        del record["task_id"]
+        del record["response"]
+
+        self.assertEqual(record["type"], "demand_processed")
+        self.assertNotIn("task_id", record)
+        self.assertEqual(len(record), 5)
+        with self.assertRaises(KeyError):
+            del record["task_id"]
+
+    def test_repeated_values_are_shared(self):
+        first = MessageRecord(message(sender="".join(["direc", "tor"])))
+        second = MessageRecord(message(sender="".join(["dire", "ctor"])))
+        self.assertIs(first["sender"], second["sender"])
+
+    def test_timestamps_keep_their_text(self):
+        for timestamp in (
+            "2026-01-02T03:04:05",
+            "2026-01-02T03:04:05.123456",
+            "2026-01-02T03:04:05+00:00",
+            "2026-01-02",
+        ):
+            record = MessageRecord(message(timestamp=timestamp))
+            self.assertEqual(record["timestamp"], timestamp)
+
+        record = MessageRecord(message(timestamp="yesterday"))
+        self.assertEqual((record["timestamp"], record.epoch), ("yesterday", 0.0))
+        # Epochs order like the timestamps they come from
+        earlier = MessageRecord(message(timestamp="2026-01-02T03:04:04.999999"))
+        self.assertLess(earlier.epoch, MessageRecord(message()).epoch)
+
+
+class ContentStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ContentStore(threshold=64)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_only_large_bodies_leave_memory(self):
+        small = MessageRecord(message(), self.store)
+        body = {"markdown": "página " * 20, "pages": 3}
+        large = MessageRecord(message(content=body), self.store)
+
+        self.assertIs(type(small._content), str)
+        self.assertIs(type(large._content), ContentRef)
+        self.assertEqual(large["content"], body)
+        self.assertEqual(large.to_dict()["content"], body)
+        self.assertEqual(self.store.stats()["entries"], 1)
+
+    def test_updated_body_goes_to_the_same_store(self):
+        record = MessageRecord(message(content="a" * 100), self.store)
+        record["content"] = "b" * 100
+
+        self.assertIs(type(record._content), ContentRef)
+        self.assertEqual(record["content"], "b" * 100)
+        self.assertEqual(self.store.stats()["entries"], 2)
+
+    def test_copy_shares_the_stored_body(self):
+        record = MessageRecord(message(content="a" * 100, extra="x"), self.store)
+        copy = record.copy()
+        copy["extra"] = "y"
+
+        self.assertIs(copy._content, record._content)
+        self.assertEqual(copy["content"], "a" * 100)
+        self.assertEqual(record["extra"], "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from blackboard import Blackboard
+from core.retention import RetentionCompactor, RetentionPolicy
+from storage import MemoryStorage, MessageArchive
+
+NOW = datetime(2026, 1, 10, 12, 0, 0)
+
+
+def message(message_id, task_id, hours_ago):
+    return {
+        "id": message_id,
+        "type": "partial_output",
+        "task_id": task_id,
+        "timestamp": (NOW - timedelta(hours=hours_ago)).isoformat(),
+    }
+
+
+def ids(messages):
+    return [message["id"] for message in messages]
+
+
+class RetentionPolicyTest(unittest.TestCase):
+    def setUp(self):
+        # Oldest first, as read from the board
+        self.messages = [
+            message("a1", "task-a", 5),
+            message("b1", "task-b", 4),
+            message("a2", "task-a", 3),
+            message("n1", None, 2),
+            message("a3", "task-a", 1),
+        ]
+
+    def expired(self, **limits):
+        policy = RetentionPolicy("partial_output", **limits)
+        return ids(policy.expired(self.messages, now=NOW))
+
+    def test_no_limits_keep_everything(self):
+        self.assertEqual(self.expired(), [])
+
+    def test_each_limit(self):
+        self.assertEqual(self.expired(max_age=3 * 3600 + 1), ["a1", "b1"])
+        self.assertEqual(self.expired(max_count=2), ["a1", "b1", "a2"])
+        self.assertEqual(self.expired(keep_last_per_task=1), ["a1", "a2"])
+
+    def test_any_limit_expires_a_message(self):
+        self.assertEqual(self.expired(max_age=4.5 * 3600, keep_last_per_task=2), ["a1"])
+        self.assertEqual(
+            self.expired(max_age=3.5 * 3600, keep_last_per_task=1),
+            ["a1", "b1", "a2"],
+        )
+
+    def test_from_config(self):
+        policies = RetentionPolicy.from_config(
+            {
+                "partial_output": {"max_age": 86400, "keep_last_per_task": "1"},
+                "system_log": {"max_count": 10000},
+            }
+        )
+        self.assertEqual(
+            [(p.type_, p.max_age, p.max_count, p.keep_last_per_task) for p in policies],
+            [("partial_output", 86400, None, 1), ("system_log", None, 10000, None)],
+        )
+        with self.assertRaises(ValueError):
+            RetentionPolicy.from_config({"system_log": {"max_size": 1}})
+
+
+class RetentionCompactorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.blackboard = Blackboard(
+            storage=MemoryStorage(), archive=MessageArchive(self.directory.name)
+        )
+        self.compactor = RetentionCompactor(
+            self.blackboard,
+            [RetentionPolicy("partial_output", keep_last_per_task=1)],
+            batch_size=2,
+        )
+
+    async def asyncTearDown(self):
+        self.blackboard.close()
+        self.directory.cleanup()
+
+    async def post(self, type_, task_id):
+        return await self.blackboard.post(
+            "worker", f"{type_} of {task_id}", type_=type_, task_id=task_id
+        )
+
+    async def test_expired_messages_move_to_the_archive(self):
+        old = [await self.post("partial_output", "task-a") for _ in range(4)]
+        latest = await self.post("partial_output", "task-a")
+        other = await self.post("partial_output", "task-b")
+        demand = await self.post("demand", "task-a")
+
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(await self.compactor.run_once(), 4)
+
+        live = await self.blackboard.get_page(limit=10)
+        self.assertEqual(ids(live["messages"]), [latest, other, demand])
+        archived = await self.blackboard.get_archived(filters={"task_id": "task-a"})
+        self.assertEqual(ids(archived), old)
+        self.assertEqual(archived[0]["content"], "partial_output of task-a")
+
+        self.assertEqual(await self.compactor.run_once(), 0)
+        stats = self.compactor.stats()
+        self.assertEqual((stats["passes"], stats["archived"]), (2, 4))
+        self.assertEqual(stats["archive"]["messages"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
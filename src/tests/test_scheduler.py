@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from core.demand_executor import DemandExecutor
+from core.scheduler import DemandScheduler
+
+NOW = 1_000_000.0
+
+
+def demand(demand_id, priority="normal", deadline=None):
+    return {"id": demand_id, "priority": priority, "deadline": deadline}
+
+
+class DemandSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = DemandScheduler(
+            aging_interval=60, deadline_horizon=300, max_backlog=3
+        )
+
+    def push(self, demand, at=NOW):
+        with mock.patch("core.scheduler.time.time", return_value=at):
+            self.scheduler.push(demand)
+
+    def order(self):
+        ids = []
+        while (next_demand := self.scheduler.pop()) is not None:
+            ids.append(next_demand["id"])
+        return ids
+
+    def test_higher_priority_first_then_fifo(self):
+        for demand_id, priority in [
+            ("n1", "normal"),
+            ("low", "low"),
+            ("urgent", "urgent"),
+            ("n2", None),
+            ("odd", "unknown"),
+        ]:
+            self.push(demand(demand_id, priority))
+        self.assertEqual(self.order(), ["urgent", "n1", "n2", "odd", "low"])
+
+    def test_waiting_demands_age_past_newer_high_priority(self):
+        # Three levels below urgent, but waiting longer than 3 aging intervals
+        self.push(demand("low", "low"), at=NOW - 181)
+        self.push(demand("urgent", "urgent"))
+        self.push(demand("high", "high"))
+        self.assertEqual(self.order(), ["low", "urgent", "high"])
+
+    def test_close_deadline_goes_first(self):
+        # Within the deadline horizon, ahead of everything else
+        soon = datetime.fromtimestamp(NOW + 200).isoformat()
+        later = datetime.fromtimestamp(NOW + 10_000).isoformat()
+        self.push(demand("urgent", "urgent"))
+        self.push(demand("later", "low", deadline=later))
+        self.push(demand("soon", "low", deadline=soon))
+        self.assertEqual(self.order(), ["soon", "urgent", "later"])
+
+    def test_pop_skips_ineligible_demands_without_losing_them(self):
+        self.push(demand("rh", "urgent") | {"department": "RH"})
+        self.push(demand("ti") | {"department": "TI"})
+
+        picked = self.scheduler.pop(lambda d: d["department"] != "RH")
+        self.assertEqual(picked["id"], "ti")
+        self.assertIsNone(self.scheduler.pop(lambda d: False))
+        self.assertEqual(self.order(), ["rh"])
+
+    def test_remove_and_backlog_limit(self):
+        for demand_id in ("a", "b", "c"):
+            self.push(demand(demand_id) | {"task_id": demand_id})
+        self.assertTrue(self.scheduler.full)
+
+        self.assertEqual(self.scheduler.remove(lambda d: d["task_id"] == "b"), 1)
+        self.assertFalse(self.scheduler.full)
+        self.assertEqual(self.scheduler.stats()["depth_by_priority"], {"normal": 2})
+        self.assertEqual(self.order(), ["a", "c"])
+
+
+class AdmissionTest(unittest.TestCase):
+    async def handler(self, demand):
+        pass
+
+    def test_full_backlog_is_rejected_with_retry_estimate(self):
+        executor = DemandExecutor(
+            self.handler, workers=2, scheduler=DemandScheduler(max_backlog=4)
+        )
+        for i in range(3):
+            executor.submit(demand(f"d{i}"))
+        self.assertFalse(executor.saturated)
+
+        executor.submit(demand("d3"))
+        self.assertTrue(executor.saturated)
+        # 4 queued demands, 30s each by default, over 2 workers
+        self.assertEqual(executor.retry_after(), 60)
+        executor._record_duration(5.0)
+        self.assertEqual(executor.retry_after(), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from storage import JsonlStorage, MemoryStorage, SqliteStorage
+from storage.migrate import migrate
+
+
+def message(message_id, type_="demand"):
+    return {
+        "id": message_id,
+        "sender": "director",
+        "content": f"content of {message_id}",
+        "type": type_,
+        "timestamp": datetime.now().isoformat(),
+        "task_id": "task-1",
+    }
+
+
+class StorageEngineTests:
+    """Behaviour every storage engine must share; mixed into a TestCase."""
+
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.storage = self.make_storage()
+        self.storage.load()
+
+    def tearDown(self):
+        self.storage.close()
+
+    def page_ids(self, filters, limit=1):
+        ids, cursor = [], None
+        while True:
+            page = self.storage.query(filters=filters, after=cursor, limit=limit)
+            if not page:
+                return ids
+            ids.extend(m["id"] for m in page)
+            cursor = page[-1]["id"]
+
+    def test_type_change_keeps_index_in_posting_order(self):
+        for message_id in ("d0", "d1", "d2"):
+            self.storage.append(message(message_id))
+        self.storage.update("d2", {"type": "demand_processed"})
+        self.storage.update("d0", {"type": "demand_processed"})
+
+        filters = {"type": "demand_processed"}
+        self.assertEqual(
+            [m["id"] for m in self.storage.find("type", "demand_processed")],
+            ["d0", "d2"],
+        )
+        self.assertEqual(self.page_ids(filters), ["d0", "d2"])
+
+    def test_bucket_pages_start_after_cursor_and_since(self):
+        for i in range(10):
+            self.storage.append(message(f"m{i}", "demand" if i % 2 else "log"))
+        self.storage.delete(["m3"])
+        self.storage.update("m4", {"type": "demand"})
+        self.storage.update("m7", {"type": "log"})
+
+        filters = {"type": "demand"}
+        self.assertEqual(self.page_ids(filters, limit=2), ["m1", "m4", "m5", "m9"])
+        since = self.storage.get("m5")["timestamp"]
+        self.assertEqual(
+            [m["id"] for m in self.storage.query(filters=filters, since=since)],
+            ["m5", "m9"],
+        )
+        self.assertEqual(
+            [m["id"] for m in self.storage.query(filters=filters, after="m4")],
+            ["m5", "m9"],
+        )
+
+    def test_cursor_seq_survives_deleted_message(self):
+        for message_id in ("d0", "d1", "d2", "d3"):
+            self.storage.append(message(message_id))
+        first = self.storage.query(limit=2)
+        cursor = self.storage.seq(first[-1]["id"])
+        # e.g. retention archiving the last message of the page
+        self.storage.delete(["d1"])
+
+        self.assertIsNone(self.storage.seq("d1"))
+        with self.assertRaises(ValueError):
+            self.storage.query(after="d1")
+        self.assertEqual(
+            [m["id"] for m in self.storage.query(after=cursor)], ["d2", "d3"]
+        )
+
+
+class MemoryStorageTest(StorageEngineTests, unittest.TestCase):
+    def make_storage(self):
+        return MemoryStorage()
+
+
+class JsonlStorageTest(StorageEngineTests, unittest.TestCase):
+    def make_storage(self):
+        self.directory = tempfile.TemporaryDirectory()
+        return JsonlStorage(
+            os.path.join(self.directory.name, "blackboard.json"), content_threshold=64
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_second_reader_leaves_live_bodies_alone(self):
+        body = "large body " * 100
+        self.storage.append({**message("d0"), "content": body})
+        self.assertEqual(self.storage.get("d0")["content"], body)
+        # e.g. `python -m storage.migrate` run next to a live board
+        reader = JsonlStorage(self.storage.snapshot_path, content_threshold=64)
+        self.assertEqual(self.storage.get("d0")["content"], body)
+        reader.load()
+        reader.close()
+        self.assertEqual(self.storage.get("d0")["content"], body)
+
+    def test_migration_leaves_interrupted_compaction_alone(self):
+        self.storage.append(message("d0"))
+        self.storage.compact(wait=True)
+        self.storage.append(message("d1"))
+        self.storage.update("d0", {"type": "demand_processed"})
+        self.storage.close()
+        # As left by a crash between rotating the log and writing the snapshot
+        os.replace(self.storage.log_path, self.storage._rotated_path)
+        with open(self.storage.log_path, "w") as f:
+            f.write(json.dumps({"op": "append", "message": message("d2")}) + "\n")
+        before = {
+            path: path.read_bytes()
+            for path in (
+                self.storage.snapshot_path,
+                self.storage._rotated_path,
+                self.storage.log_path,
+            )
+        }
+
+        target = os.path.join(self.directory.name, "blackboard.db")
+        self.assertEqual(migrate(self.storage.snapshot_path, target), 3)
+
+        self.assertEqual({path: path.read_bytes() for path in before}, before)
+        migrated = SqliteStorage(target)
+        self.assertEqual(
+            [(m["id"], m["type"]) for m in migrated.query()],
+            [("d0", "demand_processed"), ("d1", "demand"), ("d2", "demand")],
+        )
+        migrated.close()
+
+
+class SqliteStorageTest(StorageEngineTests, unittest.TestCase):
+    def make_storage(self):
+        self.directory = tempfile.TemporaryDirectory()
+        return SqliteStorage(os.path.join(self.directory.name, "blackboard.db"))
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+
+from core.task_graph import TaskGraph
+
+
+def task(number, dependencies=(), priority="Medium"):
+    return {"number": number, "priority": priority, "dependencies": list(dependencies)}
+
+
+class TaskGraphTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    async def run_task(self, task, dependency_outputs):
+        self.started.append((task["number"], sorted(dependency_outputs)))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if task.get("fail"):
+            raise RuntimeError(f"task {task['number']} broke")
+        return f"output {task['number']}"
+
+    async def test_dependencies_finish_first_and_pass_their_outputs(self):
+        graph = TaskGraph([task(1), task(2, [1]), task(3, [1]), task(4, [2, 3])])
+        results = await graph.run(self.run_task, max_concurrency=4)
+
+        self.assertEqual(self.started, [(1, []), (2, [1]), (3, [1]), (4, [2, 3])])
+        self.assertEqual(results[4], {"status": "completed", "output": "output 4"})
+        self.assertEqual(graph.critical_path_length, 3)
+        self.assertEqual(self.max_running, 2)
+
+    async def test_ready_tasks_respect_concurrency_and_priority(self):
+        graph = TaskGraph(
+            [
+                task(1, priority="Low"),
+                task(2, priority="High"),
+                task(3),
+                task(4, [3], priority="Low"),
+            ]
+        )
+        await graph.run(self.run_task, max_concurrency=1)
+
+        # High first, then the task with the longest chain behind it
+        self.assertEqual([number for number, _ in self.started], [2, 3, 1, 4])
+        self.assertEqual(self.max_running, 1)
+
+    async def test_failure_skips_only_its_dependents(self):
+        graph = TaskGraph(
+            [{**task(1), "fail": True}, task(2, [1]), task(3, [2]), task(4)]
+        )
+        with self.assertLogs(level="ERROR"):
+            results = await graph.run(self.run_task)
+
+        self.assertEqual(results[1]["status"], "failed")
+        self.assertEqual(results[2]["status"], "skipped")
+        self.assertEqual(results[3]["status"], "skipped")
+        self.assertEqual(results[4]["status"], "completed")
+        self.assertNotIn(2, [number for number, _ in self.started])
+
+    async def test_cycle_is_broken_but_its_dependents_still_wait(self):
+        with self.assertLogs(level="WARNING"):
+            graph = TaskGraph([task(1, [2]), task(2, [1]), task(3, [1])])
+        results = await graph.run(self.run_task)
+
+        self.assertEqual(graph.dependencies, {1: set(), 2: set(), 3: {1}})
+        self.assertEqual(self.started[-1], (3, [1]))
+        self.assertTrue(all(r["status"] == "completed" for r in results.values()))
+
+    async def test_unknown_and_self_dependencies_are_ignored(self):
+        with self.assertLogs(level="WARNING"):
+            graph = TaskGraph([task(1, [1, 9])])
+        results = await graph.run(self.run_task)
+
+        self.assertEqual(graph.dependencies, {1: set()})
+        self.assertEqual(results[1]["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
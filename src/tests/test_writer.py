@@ -0,0 +1,95 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from blackboard import Blackboard
+from storage import JsonlStorage, SqliteStorage
+
+THREADS, PER_THREAD = 4, 250
+TASKS, PER_TASK = 100, 10
+
+
+class ConcurrentPostTests:
+    """Posts from threads and coroutines at once; mixed into a TestCase."""
+
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.blackboard = Blackboard(storage=self.make_storage())
+
+    def tearDown(self):
+        if self.blackboard is not None:
+            self.blackboard.close()
+        self.directory.cleanup()
+
+    def reload(self):
+        """Close the board and return the contents stored on disk."""
+        self.blackboard.close()
+        self.blackboard = None
+        storage = self.make_storage()
+        storage.load()
+        contents = {message["content"] for message in storage.all()}
+        storage.close()
+        return contents
+
+    def test_concurrent_posts_are_not_lost(self):
+        def post_from_thread(i):
+            for j in range(PER_THREAD):
+                self.blackboard.post_sync("thread", f"t{i}-{j}")
+
+        async def post_from_task(i):
+            for j in range(PER_TASK):
+                await self.blackboard.post("task", f"a{i}-{j}")
+
+        async def run():
+            async with self.blackboard.subscribe() as updates:
+                threads = [
+                    threading.Thread(target=post_from_thread, args=(i,))
+                    for i in range(THREADS)
+                ]
+                for thread in threads:
+                    thread.start()
+                await asyncio.gather(*(post_from_task(i) for i in range(TASKS)))
+                await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+                return [(await updates.get(timeout=5))["content"] for _ in expected]
+
+        expected = {f"t{i}-{j}" for i in range(THREADS) for j in range(PER_THREAD)}
+        expected |= {f"a{i}-{j}" for i in range(TASKS) for j in range(PER_TASK)}
+
+        notified = asyncio.run(run())
+        self.assertEqual(set(notified), expected)
+        self.assertEqual(len(self.blackboard.storage), len(expected))
+        self.assertEqual(self.reload(), expected)
+
+    def test_unserializable_post_fails_alone(self):
+        async def run():
+            return await asyncio.gather(
+                self.blackboard.post("task", "before"),
+                self.blackboard.post("task", "failed", stage=object()),
+                self.blackboard.post("task", "after"),
+            )
+
+        # `post` logs the error; the message is simply not stored
+        with self.assertLogs(level="ERROR"):
+            before, failed, after = asyncio.run(run())
+        self.assertIsNone(self.blackboard.storage.get(failed))
+        self.assertEqual(len(self.blackboard.storage), 2)
+        self.assertEqual(self.reload(), {"before", "after"})
+
+
+class JsonlConcurrentPostTest(ConcurrentPostTests, unittest.TestCase):
+    def make_storage(self):
+        return JsonlStorage(os.path.join(self.directory.name, "blackboard.json"))
+
+
+class SqliteConcurrentPostTest(ConcurrentPostTests, unittest.TestCase):
+    def make_storage(self):
+        return SqliteStorage(os.path.join(self.directory.name, "blackboard.db"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,19 @@
 from agents import function_tool
-from blackboard import Blackboard
+from core.context import demand_context
 import logging
 import uuid
 
-blackboard = Blackboard()
+# Set by main.py: the blackboard shared by the whole process
+blackboard = None
 
 
-@function_tool
-def post_demand_to_blackboard(demand: str) -> str:
-    """Post a demand to the blackboard using the synchronous post method."""
+# Posting errors are reported to the agent below; anything else (the board not
+# being wired) fails the run instead of reaching the model as a tool result
+@function_tool(failure_error_function=None)
+async def post_demand_to_blackboard(demand: str) -> str:
+    """Post a demand to the blackboard."""
+    if blackboard is None:
+        raise RuntimeError("tools.blackboard.blackboard was not set by main.py")
     demand_id = str(uuid.uuid4())[:8]
 
     logging.info(
@@ -17,7 +22,9 @@ def post_demand_to_blackboard(demand: str) -> str:
     logging.info(f"[DEMAND_CONTENT] [DemandID: {demand_id}] Content: {demand}")
 
     try:
-        message_id = blackboard.post_sync("director", demand, type_="demand")
+        message_id = await blackboard.post(
+            "director", demand, type_="demand", **demand_context.get()
+        )
         logging.info(
             f"[DEMAND_POSTED] [DemandID: {demand_id}] [MessageID: {message_id}] Successfully posted to blackboard"
         )
@@ -1,6 +1,14 @@
+import asyncio
 from agents import function_tool
-import random
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from candidates import (
+    CandidateIndex,
+    HttpCandidateSource,
+    LocalCandidateSource,
+    rank_candidates,
+)
+from config.settings import settings
 
 # Mock data for Python developers
 MOCK_PROFILES = [
@@ -12,6 +20,7 @@ MOCK_PROFILES = [
         "current_company": "Tech Solutions Inc.",
         "location": "São Paulo, Brazil",
         "education": "Computer Science - USP",
+        "availability": "Open to work",
     },
     {
         "name": "Pedro Santos",
@@ -21,6 +30,7 @@ MOCK_PROFILES = [
         "current_company": "Digital Innovations",
         "location": "Rio de Janeiro, Brazil",
         "education": "Software Engineering - PUC-Rio",
+        "availability": "Open to opportunities",
     },
     {
         "name": "Mariana Costa",
@@ -30,6 +40,7 @@ MOCK_PROFILES = [
         "current_company": "Startup XYZ",
         "location": "Florianópolis, Brazil",
         "education": "Computer Engineering - UFSC",
+        "availability": "Not looking",
     },
     {
         "name": "Lucas Oliveira",
@@ -39,6 +50,7 @@ MOCK_PROFILES = [
         "current_company": "Data Corp",
         "location": "Belo Horizonte, Brazil",
         "education": "Data Science - UFMG",
+        "availability": "Open to opportunities",
     },
     {
         "name": "Julia Mendes",
@@ -48,37 +60,73 @@ MOCK_PROFILES = [
         "current_company": "Cloud Systems",
         "location": "Curitiba, Brazil",
         "education": "Systems Engineering - UTFPR",
+        "availability": "Open to work",
     },
 ]
 
 
+# Exported candidate dataset (saved index directory, CSV or JSONL) when
+# configured, the mock profiles otherwise
+candidate_index = (
+    CandidateIndex.open(settings.candidate_index_path)
+    if settings.candidate_index_path
+    else CandidateIndex.build(MOCK_PROFILES)
+)
+
+# Where search, profile and availability lookups go. Ranking always scores
+# the local index, since it needs every candidate at once.
+candidate_source = (
+    HttpCandidateSource(
+        settings.candidate_api_url,
+        api_key=settings.candidate_api_key,
+        rate=settings.candidate_api_rate,
+        burst=settings.candidate_api_burst,
+        max_connections=settings.candidate_api_max_connections,
+        max_retries=settings.candidate_api_retries,
+        cache_ttl=settings.candidate_cache_ttl,
+    )
+    if settings.candidate_source == "http"
+    else LocalCandidateSource(candidate_index)
+)
+
+
 @function_tool
-def search_profiles(
-    role: str = "Python Developer", experience_years: int = 0
-) -> List[Dict]:
+async def search_profiles(
+    role: str = "Python Developer",
+    experience_years: int = 0,
+    skills: Optional[List[str]] = None,
+    location: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 10,
+) -> Dict:
     """
-    Search for professional profiles on LinkedIn (mock).
+    Search the candidate profiles by role, skills, experience and location.
 
     Args:
         role: The job role to search for
         experience_years: Minimum years of experience required
+        skills: Skills the candidates should have
+        location: City, state or country the candidates should be in
+        page: Page of results to return, starting at 1
+        page_size: Number of profiles per page
 
     Returns:
-        List of matching professional profiles
+        Total number of matching profiles and one page of them, best matches first
     """
-    # In a real implementation, this would actually search LinkedIn
-    filtered_profiles = [
-        profile
-        for profile in MOCK_PROFILES
-        if int(profile["experience"].split()[0]) >= experience_years
-    ]
-    return filtered_profiles
+    return await candidate_source.search(
+        role=role,
+        experience_years=experience_years,
+        skills=skills,
+        location=location,
+        page=max(page, 1),
+        page_size=max(1, min(page_size, 50)),
+    )
 
 
 @function_tool
-def get_profile_details(profile_name: str) -> Dict:
+async def get_profile_details(profile_name: str) -> Dict:
     """
-    Get detailed information about a specific profile (mock).
+    Get detailed information about a specific candidate profile.
 
     Args:
         profile_name: Name of the professional to look up
@@ -86,29 +134,53 @@ def get_profile_details(profile_name: str) -> Dict:
     Returns:
         Detailed profile information
     """
-    # In a real implementation, this would fetch actual LinkedIn profile details
-    for profile in MOCK_PROFILES:
-        if profile["name"] == profile_name:
-            return profile
-    return {"error": "Profile not found"}
+    profile = await candidate_source.get_profile(profile_name)
+    if profile is None:
+        return {"error": "Profile not found"}
+    return profile
+
+
+@function_tool
+async def rank_candidates_for_role(
+    role_description: str, min_experience: int = 0, top_k: int = 10
+) -> Dict:
+    """
+    Score every candidate against a role description and return a shortlist.
+
+    Candidates are scored locally on skill overlap, title match, experience,
+    location and availability, so the whole pool is evaluated in one call.
+
+    Args:
+        role_description: Description of the role: title, skills, location, seniority
+        min_experience: Minimum years of experience required
+        top_k: Number of best candidates to return (at most 50)
+
+    Returns:
+        The criteria found in the description and the top candidates, each with
+        its score and per-feature breakdown
+    """
+    # Scoring the whole pool is CPU-bound: keep it off the event loop
+    return await asyncio.to_thread(
+        rank_candidates,
+        candidate_index,
+        role_description,
+        min_experience=max(min_experience, 0),
+        top_k=max(1, min(top_k, 50)),
+    )
 
 
 @function_tool
-def check_profile_availability(profile_name: str) -> Dict:
+async def check_profile_availability(profile_name: str) -> Dict:
     """
-    Check if a profile is open to work opportunities (mock).
+    Check if a profile is open to work opportunities.
 
     Args:
         profile_name: Name of the professional to check
 
     Returns:
-        Availability status and additional information
+        Availability status of the profile
     """
-    # In a real implementation, this would check actual LinkedIn profile status
-    statuses = ["Open to work", "Not looking", "Open to opportunities"]
-    return {
-        "name": profile_name,
-        "status": random.choice(statuses),
-        "response_rate": f"{random.randint(70, 99)}%",
-        "last_active": "Recently active",
-    }
+    availability = await candidate_source.get_availability(profile_name)
+    if availability is None:
+        return {"error": "Profile not found"}
+    return availability
@@ -1,10 +1,11 @@
-from docling.document_converter import DocumentConverter
-import tempfile
-import os
 from agents import function_tool
 
+# Set by main.py: the shared pool of warm docling converters
+converter_pool = None
+
+
 @function_tool
-def convert_pdf_to_markdown(pdf_bytes):
+async def convert_pdf_to_markdown(pdf_bytes):
     """Converte um arquivo PDF em bytes para texto no formato Markdown.
 
     Args:
@@ -16,21 +17,16 @@ def convert_pdf_to_markdown(pdf_bytes):
     Raises:
         Exception: Se houver erro na conversão do documento.
     """
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-        temp_file.write(pdf_bytes)
-        temp_path = temp_file.name
+    result = await converter_pool.convert(pdf_bytes)
+    return result["markdown"]
 
-    try:
-        converter = DocumentConverter()
-        result = converter.convert(temp_path)
-        return result.document.export_to_markdown()
-    finally:
-        os.unlink(temp_path)
 
-
-#? Trecho pra testar a funcao
+# ? Trecho pra testar a conversao (fora de um agente)
+# import asyncio
+# from core.document_converter import DocumentConverterPool
+#
 # with open("src/tools/pdfTeste.pdf", "rb") as f:
 #     pdf_bytes = f.read()
-
-# markdown = convert_pdf_to_markdown(pdf_bytes)
-# print(markdown)
\ No newline at end of file
+#
+# result = asyncio.run(DocumentConverterPool(workers=1).convert(pdf_bytes))
+# print(result["pages"], result["markdown"])